@@ -285,10 +285,11 @@ class Bitbucket(BitbucketBase):
         url = self._url_announcement_banner()
         return self.delete(url)
 
-    def upload_plugin(self, plugin_path):
+    def upload_plugin(self, plugin_path, progress_callback=None):
         """
         Provide plugin path for upload into BitBucket e.g. useful for auto deploy
         :param plugin_path:
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` called during the upload
         :return:
         """
         upm_token = self.request(
@@ -298,8 +299,10 @@ class Bitbucket(BitbucketBase):
             trailing=True,
         ).headers["upm-token"]
         url = f"rest/plugins/1.0/?token={upm_token}"
-        files = {"plugin": open(plugin_path, "rb")}
-        return self.post(url, files=files, headers=self.no_check_headers)
+        with open(plugin_path, "rb") as plugin:
+            return self.post(
+                url, files={"plugin": plugin}, headers=self.no_check_headers, progress_callback=progress_callback
+            )
 
     ################################################################################################
     # Hook scripts (Bitbucket Data Center 8+)
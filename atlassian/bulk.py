@@ -0,0 +1,228 @@
+# coding=utf-8
+"""Chunked, concurrent bulk writes with partial-failure reporting.
+
+Every Atlassian bulk endpoint accepts a bounded number of items per request
+(for example 50 issues for Jira ``issue/bulk``, 1000 ids for ``worklog/list``
+and 100 entities for the Jira Software builds API). :class:`BulkWriter`
+accepts an unbounded iterable, splits it into chunks of the endpoint's
+maximum size, sends the chunks concurrently and collects a
+:class:`BulkReport` describing which items succeeded, which failed and which
+failed for transient reasons and can be submitted again.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+from requests import ConnectionError, HTTPError, Timeout
+
+from atlassian.concurrency import DEFAULT_MAX_WORKERS, RateLimiter, chunked, map_concurrently
+from atlassian.request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+# Documented maximum number of items per request.
+JIRA_ISSUE_BULK_LIMIT = 50
+JIRA_BULK_FETCH_LIMIT = 100
+JIRA_ID_SEARCH_LIMIT = 5000
+JIRA_WORKLOG_LIST_LIMIT = 1000
+JIRA_CHANGELOG_BULK_LIMIT = 1000
+JIRA_SOFTWARE_ENTITY_LIMIT = 100
+JIRA_USER_BULK_LIMIT = 90
+JIRA_USER_SEARCH_LIMIT = 1000
+
+RETRIABLE_STATUS_CODES = (413, 429, 500, 502, 503, 504)
+
+
+@dataclass
+class BulkItemError:
+    """A single item that could not be written.
+
+    ``error`` is the exception raised for the whole chunk or the error payload
+    Jira returned for this particular item. ``retriable`` marks failures caused
+    by throttling, server errors or connection problems.
+    """
+
+    item: Any
+    error: Any
+    retriable: bool = False
+
+
+@dataclass
+class BulkReport:
+    """Merged outcome of a bulk write."""
+
+    successes: List[Tuple[Any, Any]] = field(default_factory=list)
+    errors: List[BulkItemError] = field(default_factory=list)
+    responses: List[Any] = field(default_factory=list)
+    chunks: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def results(self) -> List[Any]:
+        """Per-item results of every successful item, in completion order."""
+        return [result for _, result in self.successes]
+
+    @property
+    def failed(self) -> List[BulkItemError]:
+        """Errors that will fail again if the same items are resubmitted."""
+        return [error for error in self.errors if not error.retriable]
+
+    @property
+    def retriable(self) -> List[Any]:
+        """Items whose chunk failed transiently and can be submitted again."""
+        return [error.item for error in self.errors if error.retriable]
+
+    def merge(self, other: "BulkReport") -> "BulkReport":
+        self.successes.extend(other.successes)
+        self.errors.extend(other.errors)
+        self.responses.extend(other.responses)
+        self.chunks += other.chunks
+        return self
+
+
+T_split = Callable[[Sequence[Any], Any], Tuple[List[Tuple[Any, Any]], List[BulkItemError]]]
+
+
+def _split_all_succeeded(chunk: Sequence[Any], response: Any) -> Tuple[List[Tuple[Any, Any]], List[BulkItemError]]:
+    return [(item, response) for item in chunk], []
+
+
+def is_retriable_error(error: BaseException, retry_status_codes: Iterable[int] = RETRIABLE_STATUS_CODES) -> bool:
+    """Return True when ``error`` is a throttling, server-side or connection failure."""
+    if isinstance(error, (ConnectionError, Timeout)):
+        return True
+    if isinstance(error, HTTPError):
+        response = getattr(error, "response", None)
+        return response is not None and response.status_code in retry_status_codes
+    return False
+
+
+class BulkWriter(object):
+    """Send an unbounded iterable of items through a bulk endpoint.
+
+    :param send: Callable receiving one chunk (a list of items) and returning
+        the endpoint response. Exceptions fail every item of the chunk.
+    :param chunk_size: Maximum number of items per request.
+    :param split: Optional callable ``split(chunk, response)`` returning
+        ``(successes, errors)`` where ``successes`` is a list of
+        ``(item, result)`` pairs and ``errors`` a list of :class:`BulkItemError`.
+        By default every item of a successful chunk is reported as succeeded
+        with the whole response as its result.
+    :param max_workers: Number of chunks sent concurrently.
+    :param rate_limiter: Optional :class:`atlassian.concurrency.RateLimiter`
+        acquired before each chunk is sent.
+    :param retry_status_codes: HTTP status codes reported as retriable.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[List[Any]], Any],
+        chunk_size: int,
+        split: Optional[T_split] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_status_codes: Iterable[int] = RETRIABLE_STATUS_CODES,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        self.send = send
+        self.chunk_size = chunk_size
+        self.split = split or _split_all_succeeded
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.retry_status_codes = tuple(retry_status_codes)
+
+    def write(self, items: Iterable[Any]) -> BulkReport:
+        """Send ``items`` in chunks and return the merged :class:`BulkReport`."""
+        report = BulkReport()
+        for chunk, future in map_concurrently(
+            self.send,
+            chunked(items, self.chunk_size),
+            max_workers=self.max_workers,
+            ordered=False,
+            rate_limiter=self.rate_limiter,
+        ):
+            report.chunks += 1
+            try:
+                response = future.result()
+            except Exception as e:
+                retriable = is_retriable_error(e, self.retry_status_codes)
+                log.warning("Bulk chunk of %d items failed (retriable=%s): %s", len(chunk), retriable, e)
+                report.errors.extend(BulkItemError(item, e, retriable) for item in chunk)
+                continue
+            report.responses.append(response)
+            successes, errors = self.split(chunk, response)
+            report.successes.extend(successes)
+            report.errors.extend(errors)
+        return report
+
+
+def split_issue_bulk_response(chunk: Sequence[Any], response: Any) -> Tuple[List[Tuple[Any, Any]], List[BulkItemError]]:
+    """Split a Jira ``issue/bulk`` response into created issues and per-issue errors.
+
+    Jira lists the created issues in request order without the failed ones,
+    and identifies failures by their zero-based ``failedElementNumber``.
+    """
+    response = response or {}
+    errors = {}
+    for error in response.get("errors", []):
+        index = error.get("failedElementNumber")
+        if index is not None and 0 <= index < len(chunk):
+            errors[index] = BulkItemError(chunk[index], error, error.get("status") in RETRIABLE_STATUS_CODES)
+    created = iter(response.get("issues", []))
+    successes = [(item, next(created, None)) for index, item in enumerate(chunk) if index not in errors]
+    return successes, list(errors.values())
+
+
+def split_worklog_list_response(
+    chunk: Sequence[Any], response: Any
+) -> Tuple[List[Tuple[Any, Any]], List[BulkItemError]]:
+    """Match ``worklog/list`` results to the requested ids; missing ids are reported as errors."""
+    found = {str(worklog.get("id")): worklog for worklog in response or []}
+    successes = []
+    errors = []
+    for worklog_id in chunk:
+        worklog = found.get(str(worklog_id))
+        if worklog is None:
+            errors.append(BulkItemError(worklog_id, "Worklog not found or not visible"))
+        else:
+            successes.append((worklog_id, worklog))
+    return successes, errors
+
+
+def split_builds_response(chunk: Sequence[Any], response: Any) -> Tuple[List[Tuple[Any, Any]], List[BulkItemError]]:
+    """Split a Jira Software ``builds/0.1/bulk`` response into accepted and rejected builds."""
+    response = response or {}
+
+    def build_key(build):
+        return str(build.get("pipelineId")), str(build.get("buildNumber"))
+
+    rejected = {build_key(rejection.get("key", {})): rejection for rejection in response.get("rejectedBuilds", [])}
+    successes = []
+    errors = []
+    for build in chunk:
+        rejection = rejected.get(build_key(build))
+        if rejection is None:
+            successes.append((build, response))
+        else:
+            errors.append(BulkItemError(build, rejection.get("errors", rejection)))
+    return successes, errors
+
+
+def post_issue_bulk(client: Any, path: str, chunk: Sequence[Any]) -> Any:
+    """Post one chunk to Jira ``issue/bulk`` and return the decoded response.
+
+    Jira answers ``400`` when every issue of the chunk failed, with the same
+    per-issue ``errors`` payload as a partial success. That payload is
+    returned so :func:`split_issue_bulk_response` can attribute the errors.
+    """
+    response = client.post(path, data={"issueUpdates": list(chunk)}, advanced_mode=True)
+    if response.status_code == 400:
+        body = client._response_handler(response)
+        if isinstance(body, dict) and isinstance(body.get("errors"), list) and body["errors"]:
+            return body
+    client.raise_for_status(response)
+    return client._response_handler(response)
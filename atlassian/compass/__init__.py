@@ -90,12 +90,12 @@ class Compass(AtlassianRestAPI):
         )
         return self.delete(path)
 
-    def upload_component_api_spec(self, component_id, filename=None, files=None):
+    def upload_component_api_spec(self, component_id, filename=None, files=None, progress_callback=None):
         """Upload an OpenAPI specification for a Compass component."""
         multipart, handle = self._multipart_file(filename, files)
         try:
             path = self.url_joiner(self.api_root, f"compass/v1/component/{component_id}/api_specs")
-            return self.put(path, files=multipart)
+            return self.put(path, files=multipart, progress_callback=progress_callback)
         finally:
             if handle:
                 handle.close()
@@ -0,0 +1,240 @@
+# coding=utf-8
+"""Helpers for issuing many REST calls concurrently.
+
+Atlassian products limit the number of items per bulk request and throttle
+clients that send too many requests. The helpers here split unbounded
+iterables into bounded chunks, run calls on a small thread pool without
+materialising the whole input, and pace calls through a shared
+:class:`RateLimiter`. ``requests`` sessions are safe to share between the
+worker threads, so a single client instance can be used by every task.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Yield lists of at most ``size`` items from ``iterable``.
+
+    >>> list(chunked(range(5), 2))
+    [[0, 1], [2, 3], [4]]
+    """
+    if size < 1:
+        raise ValueError("Chunk size must be a positive integer")
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class RateLimiter(object):
+    """Thread-safe token bucket limiting calls to ``rate`` per second.
+
+    :param rate: Sustained number of calls per second.
+    :param burst: Number of calls that may be made back to back before the
+        limiter starts spacing them out. Defaults to ``max(1, rate)``.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("Rate must be greater than zero")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a call is allowed and return the time spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def _call(func: Callable[[T], R], rate_limiter: Optional[RateLimiter]) -> Callable[[T], R]:
+    if rate_limiter is None:
+        return func
+
+    def limited(item: T) -> R:
+        rate_limiter.acquire()
+        return func(item)
+
+    return limited
+
+
+def map_concurrently(
+    func: Callable[[T], R],
+    iterable: Iterable[T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    ordered: bool = True,
+    rate_limiter: Optional[RateLimiter] = None,
+    max_pending: Optional[int] = None,
+) -> Iterator[Tuple[T, "Future[R]"]]:
+    """Apply ``func`` to every item on a thread pool and yield ``(item, future)`` pairs.
+
+    Only ``max_pending`` calls (twice ``max_workers`` by default) are queued
+    at a time, so ``iterable`` may be an unbounded generator. Every yielded
+    future is already done; call ``future.result()`` to get the value or
+    re-raise the exception of that call.
+
+    :param func: Callable invoked with one item.
+    :param iterable: Items to process.
+    :param max_workers: Number of worker threads.
+    :param ordered: Yield results in input order (True) or as soon as they complete.
+    :param rate_limiter: Optional limiter acquired before every call.
+    :param max_pending: Maximum number of submitted but not yet yielded calls.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+    call = _call(func, rate_limiter)
+    limit = max_pending or max_workers * 2
+    items = iter(iterable)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        if ordered:
+            pending: Deque[Tuple[T, Future]] = deque()
+            for item in items:
+                pending.append((item, executor.submit(call, item)))
+                if len(pending) >= limit:
+                    done_item, future = pending.popleft()
+                    wait([future])
+                    yield done_item, future
+            while pending:
+                done_item, future = pending.popleft()
+                wait([future])
+                yield done_item, future
+            return
+
+        running: Set[Future] = set()
+        submitted = {}
+        exhausted = False
+        while True:
+            while not exhausted and len(running) < limit:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                future = executor.submit(call, item)
+                submitted[future] = item
+                running.add(future)
+            if not running:
+                return
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield submitted.pop(future), future
+
+    finally:
+        # Stop queued calls when the caller abandons the iteration early.
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_prefetched(iterable: Iterable[T], depth: int = 1) -> Iterator[T]:
+    """Yield the items of ``iterable`` while a background thread produces the next ones.
+
+    Wrapping a page generator with this helper requests the next page while
+    the caller is still processing the current one. At most ``depth`` produced
+    items wait in the buffer. Exceptions raised by ``iterable`` are re-raised
+    in the consuming thread, and abandoning the iteration stops the producer
+    once its current item is done.
+    """
+    if depth < 1:
+        raise ValueError("depth must be a positive integer")
+    buffer: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(entry: Tuple[str, Any]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put(("item", item)):
+                    return
+        except BaseException as e:
+            put(("error", e))
+            return
+        put(("done", None))
+
+    threading.Thread(target=produce, name="atlassian-prefetch", daemon=True).start()
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == "error":
+                raise value
+            if kind == "done":
+                return
+            yield value
+    finally:
+        stop.set()
+
+
+def iter_cursor_pages(
+    fetch_page: Callable[[Optional[str]], Any],
+    items: str = "issues",
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Iterator[List[Any]]:
+    """Yield the ``items`` lists of a search paged with ``nextPageToken``.
+
+    ``fetch_page`` is called with the token of the page to request, None for
+    the first one, and returns the decoded response. Paging stops at a page
+    marked ``isLast``, at a page without a token, or at an empty response.
+
+    :param fetch_page: Callable returning one page of results.
+    :param items: Response entry holding the results of a page.
+    :param rate_limiter: Optional limiter acquired before every page request.
+    """
+    next_page_token = None
+    while True:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        response = fetch_page(next_page_token)
+        if not response:
+            return
+        yield response.get(items, [])
+        next_page_token = response.get("nextPageToken")
+        if response.get("isLast", False) or not next_page_token:
+            return
+
+
+def run_concurrently(
+    func: Callable[[T], Any],
+    iterable: Iterable[T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> List[Any]:
+    """Return ``[func(item) for item in iterable]`` computed on a thread pool.
+
+    The first exception raised by ``func`` is re-raised.
+    """
+    return [
+        future.result()
+        for _, future in map_concurrently(func, iterable, max_workers=max_workers, rate_limiter=rate_limiter)
+    ]
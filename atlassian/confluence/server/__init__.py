@@ -114,6 +114,7 @@ class Server(ConfluenceServerBase):
         absolute=False,
         advanced_mode=False,
         allow_redirects=True,
+        progress_callback=None,
     ):
         if not absolute:
             path = self._server_api_path(path)
@@ -130,6 +131,7 @@ class Server(ConfluenceServerBase):
             absolute=absolute,
             advanced_mode=advanced_mode,
             allow_redirects=allow_redirects,
+            progress_callback=progress_callback,
         )
 
     @staticmethod
@@ -1106,6 +1108,7 @@ class Server(ConfluenceServerBase):
         title=None,
         space=None,
         comment=None,
+        progress_callback=None,
     ):
         """
         Attach (upload) a file to a page, if it exists it will update automatically the
@@ -1125,6 +1128,7 @@ class Server(ConfluenceServerBase):
         :type  content_type: ``str``
         :param comment: A comment describing this upload/file
         :type  comment: ``str``
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` called during the upload
         :return: The attachment response.
         :raises ApiNotFoundError: If no page ID is supplied and the title cannot
             be resolved in the requested space.
@@ -1162,6 +1166,7 @@ class Server(ConfluenceServerBase):
                     data=data,
                     headers=headers,
                     files={"file": (name, content, content_type)},
+                    progress_callback=progress_callback,
                 )
             except HTTPError as e:
                 if e.response.status_code == 403:
@@ -1195,6 +1200,7 @@ class Server(ConfluenceServerBase):
         title=None,
         space=None,
         comment=None,
+        progress_callback=None,
     ):
         """
         Attach (upload) a file to a page, if it exists it will update automatically the
@@ -1215,6 +1221,7 @@ class Server(ConfluenceServerBase):
         :type  content_type: ``str``
         :param comment: A comment describing this upload/file
         :type  comment: ``str``
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` called during the upload
         """
         # get base name of the file to get the attachment from confluence.
         if name is None:
@@ -1232,6 +1239,7 @@ class Server(ConfluenceServerBase):
                 title=title,
                 space=space,
                 comment=comment,
+                progress_callback=progress_callback,
             )
 
     def download_attachments_from_page(
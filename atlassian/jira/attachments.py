@@ -0,0 +1,247 @@
+# coding=utf-8
+"""Concurrent, streaming attachment archiver.
+
+:class:`AttachmentArchiver` downloads the attachments of many issues, or of
+every issue matched by a JQL query, into a zip file or a directory. Downloads
+run concurrently and their bodies are streamed in blocks. For a directory
+they go straight into the target files, so memory use is bounded by the block
+size times the number of concurrent downloads. A zip can only be written one
+entry at a time, so each download goes into a spooled temporary file first,
+kept in memory up to ``spool_size`` bytes and moved to disk beyond that, and
+is then copied into ``ZipFile.open(..., "w")``; memory use is bounded by
+``spool_size`` times the number of concurrent downloads.
+Attachments already present with the same ID and size are skipped, which
+makes an interrupted run resumable.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass, field
+from typing import IO, Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..bulk import JIRA_BULK_FETCH_LIMIT, BulkItemError, is_retriable_error
+from ..concurrency import DEFAULT_MAX_WORKERS, RateLimiter, chunked, map_concurrently
+from ..request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+# Downloads up to this size are buffered in memory before entering the zip, larger ones on disk
+DEFAULT_SPOOL_SIZE = 8 * 1024 * 1024
+ZIP64_THRESHOLD = (1 << 31) - 1
+
+
+def download_attachment(client: Any, meta: dict, out: IO[bytes], block_size: int = DEFAULT_BLOCK_SIZE) -> int:
+    """Stream the content of an attachment into ``out``.
+
+    The download goes through ``client.request``, so the client's retries of
+    throttled and unavailable responses apply to it.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param meta: Attachment metadata as in the ``attachment`` issue field.
+    :param out: Binary file object the content is written to.
+    :param block_size: Size of the streamed body blocks in bytes.
+    :return: Number of bytes written.
+    """
+    response = client.request(
+        "GET", meta["content"], headers={"Accept": "*/*"}, absolute=True, advanced_mode=True, stream=True
+    )
+    with response:
+        client.raise_for_status(response)
+        written = 0
+        for block in response.iter_content(block_size):
+            out.write(block)
+            written += len(block)
+    return written
+
+
+@dataclass
+class ArchiveReport:
+    """Outcome of :meth:`AttachmentArchiver.archive`.
+
+    ``errors`` holds the attachment metadata of failed downloads; retriable
+    ones succeed on the next run, which skips everything already archived.
+    """
+
+    target: str
+    downloaded: int = 0
+    skipped: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    errors: List[BulkItemError] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Downloaded bytes per second."""
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+class AttachmentArchiver(object):
+    """Download issue attachments concurrently into a zip file or a directory.
+
+    Entries are named by ``name_template``, formatted with ``issue`` (the
+    issue key), ``id`` and ``filename`` of the attachment. An existing zip is
+    appended to and an existing directory is filled up; entries whose name
+    and size already match are not downloaded again.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param target: Path of a ``.zip`` file, or of a directory for any other name.
+    :param max_workers: Number of concurrent downloads.
+    :param block_size: Size of the streamed body blocks in bytes.
+    :param compression: ``zipfile`` compression method of zip entries.
+    :param name_template: Entry name of an attachment.
+    :param spool_size: Size up to which a download for a zip is kept in memory
+        before it is moved to a temporary file.
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing all requests.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        target: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        compression: int = zipfile.ZIP_STORED,
+        name_template: str = "{issue}/{id}_{filename}",
+        spool_size: int = DEFAULT_SPOOL_SIZE,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.client = client
+        self.target = target
+        self.zip = target.lower().endswith(".zip")
+        self.max_workers = max_workers
+        self.block_size = block_size
+        self.compression = compression
+        self.name_template = name_template
+        self.spool_size = spool_size
+        self.rate_limiter = rate_limiter
+
+    def archive(self, issues: Optional[Iterable[Union[str, dict]]] = None, jql: Optional[str] = None) -> ArchiveReport:
+        """Download the attachments of ``issues`` and of the issues matching ``jql``.
+
+        :param issues: Issue keys, or issues already fetched with their ``attachment`` field.
+        :param jql: OPTIONAL: JQL query selecting further issues.
+        :return: :class:`ArchiveReport`
+        """
+        report = ArchiveReport(self.target)
+        started = time.monotonic()
+        attachments = self._attachments(self._issues(issues or (), jql))
+        if self.zip:
+            self._archive_zip(attachments, report)
+        else:
+            os.makedirs(self.target, exist_ok=True)
+            self._archive_directory(attachments, report)
+        report.seconds = time.monotonic() - started
+        log.info(
+            "Archived %d attachments (%d skipped, %d failed) to %s at %.1f MiB/s",
+            report.downloaded,
+            report.skipped,
+            len(report.errors),
+            self.target,
+            report.throughput / 1024 / 1024,
+        )
+        return report
+
+    def _issues(self, issues: Iterable[Union[str, dict]], jql: Optional[str]) -> Iterator[dict]:
+        keys = []
+        for issue in issues:
+            if isinstance(issue, dict):
+                yield issue
+            else:
+                keys.append(str(issue))
+        fields = ["attachment"]
+        for chunk in chunked(keys, JIRA_BULK_FETCH_LIMIT):
+            if hasattr(self.client, "bulk_fetch_issues"):
+                response = self.client.bulk_fetch_issues(data={"issueIdsOrKeys": chunk, "fields": fields})
+            else:
+                response, _ = self.client.bulk_issue(chunk, fields=fields)
+            yield from (response or {}).get("issues", [])
+        if jql:
+            if hasattr(self.client, "iter_enhanced_jql"):
+                yield from self.client.iter_enhanced_jql(jql, fields=fields)
+            else:
+                yield from self.client.iter_jql(jql, fields=fields, rate_limiter=self.rate_limiter)
+
+    def _attachments(self, issues: Iterable[dict]) -> Iterator[Tuple[str, dict]]:
+        for issue in issues:
+            for meta in (issue.get("fields") or {}).get("attachment") or ():
+                name = self.name_template.format(issue=issue.get("key"), id=meta["id"], filename=meta["filename"])
+                yield name, meta
+
+    def _archive_directory(self, attachments: Iterable[Tuple[str, dict]], report: ArchiveReport) -> None:
+        def download(item: Tuple[str, dict]) -> int:
+            name, meta = item
+            path = os.path.join(self.target, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = path + ".part"
+            with open(partial, "wb") as out:
+                written = download_attachment(self.client, meta, out, self.block_size)
+            os.replace(partial, path)
+            return written
+
+        def pending() -> Iterator[Tuple[str, dict]]:
+            for name, meta in attachments:
+                path = os.path.join(self.target, name)
+                if os.path.isfile(path) and os.path.getsize(path) == meta.get("size"):
+                    report.skipped += 1
+                else:
+                    yield name, meta
+
+        self._collect(map_concurrently(download, pending(), **self._pool()), report)
+
+    def _archive_zip(self, attachments: Iterable[Tuple[str, dict]], report: ArchiveReport) -> None:
+        def download(item: Tuple[str, dict]) -> IO[bytes]:
+            spool = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+            try:
+                download_attachment(self.client, item[1], spool, self.block_size)
+            except BaseException:
+                spool.close()
+                raise
+            spool.seek(0)
+            return spool
+
+        with zipfile.ZipFile(self.target, "a", compression=self.compression) as archive:
+            existing = {info.filename: info.file_size for info in archive.infolist()}
+
+            def pending() -> Iterator[Tuple[str, dict]]:
+                for name, meta in attachments:
+                    if existing.get(name) == meta.get("size"):
+                        report.skipped += 1
+                    else:
+                        existing[name] = meta.get("size")
+                        yield name, meta
+
+            for (name, meta), future in map_concurrently(download, pending(), **self._pool()):
+                try:
+                    spool = future.result()
+                except Exception as e:
+                    self._failed(report, name, meta, e)
+                    continue
+                with spool:
+                    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+                    info.compress_type = self.compression
+                    size = meta.get("size") or 0
+                    with archive.open(info, "w", force_zip64=size > ZIP64_THRESHOLD) as entry:
+                        shutil.copyfileobj(spool, entry, self.block_size)
+                    report.downloaded += 1
+                    report.bytes += info.file_size
+
+    def _collect(self, results: Iterator[Tuple[Tuple[str, dict], Any]], report: ArchiveReport) -> None:
+        for (name, meta), future in results:
+            try:
+                report.bytes += future.result()
+            except Exception as e:
+                self._failed(report, name, meta, e)
+            else:
+                report.downloaded += 1
+
+    @staticmethod
+    def _failed(report: ArchiveReport, name: str, meta: dict, error: Exception) -> None:
+        log.warning("Could not download attachment %s: %s", name, error)
+        report.errors.append(BulkItemError(meta, error, is_retriable_error(error)))
+
+    def _pool(self) -> dict:
+        return {"max_workers": self.max_workers, "ordered": False, "rate_limiter": self.rate_limiter}
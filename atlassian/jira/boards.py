@@ -0,0 +1,282 @@
+# coding=utf-8
+"""Snapshots of Agile boards, their sprints and sprint issues.
+
+:func:`collect_board_snapshots` replaces the usual sequence of
+``get_all_agile_boards``, ``get_all_sprints_from_board`` per board and
+``get_all_issues_for_sprint_in_board`` per sprint. The sprints of all boards
+are listed concurrently and every sprint's issues are fetched concurrently as
+soon as its board's sprints are known, each with a small set of fields. Every
+listing is paged to its end: ``isLast`` for boards and sprints, ``total`` for
+sprint issues. Each board is yielded as a :class:`BoardSnapshot` once its
+last sprint is complete; the snapshots are plain dataclasses, so
+``dataclasses.asdict`` turns them into JSON-ready dicts for caching.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from requests import HTTPError
+
+from ..concurrency import DEFAULT_MAX_WORKERS, RateLimiter, map_concurrently
+from ..request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+AGILE_PAGE_SIZE = 50
+SPRINT_ISSUE_PAGE_SIZE = 100
+SPRINT_STATES = ("active", "closed", "future")
+SPRINT_ISSUE_FIELDS = ("summary", "status", "issuetype", "assignee", "resolutiondate")
+ESTIMATE_FIELD_NAMES = ("Story Points", "Story point estimate")
+
+
+@dataclass
+class SprintIssue:
+    """Issue of a sprint, reduced to what sprint reports and velocity charts need.
+
+    ``assignee`` is the account ID on Jira Cloud and the username on
+    Server/Data Center; ``extra`` holds the further requested fields as returned.
+    """
+
+    key: str
+    id: str
+    summary: Optional[str] = None
+    status: Optional[str] = None
+    status_category: Optional[str] = None
+    issue_type: Optional[str] = None
+    assignee: Optional[str] = None
+    estimate: Optional[float] = None
+    resolved: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def done(self) -> bool:
+        return self.status_category == "done"
+
+
+@dataclass
+class SprintSnapshot:
+    """Sprint with its issues; dates are the ISO 8601 strings Jira returns."""
+
+    id: int
+    name: str
+    state: str
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    complete_date: Optional[str] = None
+    goal: Optional[str] = None
+    issues: List[SprintIssue] = field(default_factory=list)
+
+    @property
+    def committed(self) -> float:
+        """Sum of the estimates of all issues."""
+        return sum(issue.estimate or 0 for issue in self.issues)
+
+    @property
+    def completed(self) -> float:
+        """Sum of the estimates of the issues in a done status."""
+        return sum(issue.estimate or 0 for issue in self.issues if issue.done)
+
+
+@dataclass
+class BoardSnapshot:
+    """Board with its sprints, in the order Jira lists them (oldest first)."""
+
+    id: int
+    name: str
+    type: str
+    project: Optional[str] = None
+    sprints: List[SprintSnapshot] = field(default_factory=list)
+
+
+def collect_board_snapshots(
+    client: Any,
+    board_ids: Optional[Iterable[int]] = None,
+    states: Sequence[str] = SPRINT_STATES,
+    fields: Sequence[str] = (),
+    estimate_field: Optional[str] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Iterator[BoardSnapshot]:
+    """Yield a snapshot of every board, with its sprints and their issues.
+
+    Boards are yielded as they complete, not in listing order. Boards without
+    sprints, e.g. Kanban boards, are yielded with no sprints. When a board or
+    sprint fails, the first error is raised after the other boards have been yielded.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraSoftware`` client.
+    :param board_ids: OPTIONAL: boards to snapshot; all boards visible to the user by default.
+    :param states: Sprint states to include.
+    :param fields: OPTIONAL: issue fields fetched in addition to :data:`SPRINT_ISSUE_FIELDS`,
+        returned in :attr:`SprintIssue.extra`.
+    :param estimate_field: OPTIONAL: field ID of the estimate, e.g. ``customfield_10016``;
+        looked up by the names ``Story Points`` and ``Story point estimate`` by default.
+    :param max_workers: Number of concurrent requests per stage (sprint listings, sprint issues).
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing all requests.
+    :return: iterator of :class:`BoardSnapshot`
+    """
+    collector = _Collector(client, states, fields, estimate_field, rate_limiter)
+    pool: Dict[str, Any] = {"max_workers": max_workers, "rate_limiter": rate_limiter, "ordered": False}
+    if board_ids is None:
+        boards = list(collector.boards())
+    else:
+        boards = [future.result() for _, future in map_concurrently(collector.board, list(board_ids), **pool)]
+    log.info("Collecting sprints of %d boards", len(boards))
+
+    snapshots: Dict[int, BoardSnapshot] = {}
+    pending: Dict[int, int] = {}
+    errors: List[BaseException] = []
+
+    def sprints() -> Iterator[Tuple[BoardSnapshot, Optional[SprintSnapshot]]]:
+        for board, future in map_concurrently(collector.sprints, boards, **pool):
+            snapshot = collector.board_snapshot(board)
+            snapshots[snapshot.id] = snapshot
+            try:
+                snapshot.sprints = future.result()
+            except Exception as e:
+                log.warning("Listing the sprints of board %s failed: %s", snapshot.id, e)
+                errors.append(e)
+            pending[snapshot.id] = len(snapshot.sprints)
+            if not snapshot.sprints:
+                yield snapshot, None
+            for sprint in snapshot.sprints:
+                yield snapshot, sprint
+
+    for (snapshot, sprint), future in map_concurrently(lambda job: collector.issues(*job), sprints(), **pool):
+        if sprint is not None:
+            try:
+                sprint.issues = future.result()
+            except Exception as e:
+                log.warning("Fetching the issues of sprint %s failed: %s", sprint.id, e)
+                errors.append(e)
+            pending[snapshot.id] -= 1
+        if pending[snapshot.id] <= 0:
+            yield snapshots.pop(snapshot.id)
+    if errors:
+        raise errors[0]
+
+
+class _Collector(object):
+    """Agile API requests of one snapshot run."""
+
+    def __init__(
+        self,
+        client: Any,
+        states: Sequence[str],
+        fields: Sequence[str],
+        estimate_field: Optional[str],
+        rate_limiter: Optional[RateLimiter],
+    ):
+        if not hasattr(client, "get_agile_resource_url") and "agile" not in getattr(client, "API_VERSIONS", {}):
+            raise ValueError("Board snapshots need a Jira or JiraSoftware client")
+        self.client = client
+        self.states = ",".join(states)
+        self.extra = [name for name in fields if name not in SPRINT_ISSUE_FIELDS]
+        self.estimate_field = estimate_field or _estimate_field(client)
+        self.fields = list(SPRINT_ISSUE_FIELDS) + self.extra
+        if self.estimate_field:
+            self.fields.append(self.estimate_field)
+        self.rate_limiter = rate_limiter
+
+    def _url(self, resource: str) -> str:
+        if hasattr(self.client, "get_agile_resource_url"):
+            return self.client.get_agile_resource_url(resource)
+        return self.client.endpoint("agile", resource)
+
+    def _values(self, resource: str, params: Optional[dict] = None) -> Iterator[dict]:
+        """Page through an Agile listing until ``isLast``."""
+        start = 0
+        while True:
+            response = self.client.get(
+                self._url(resource), params={**(params or {}), "startAt": start, "maxResults": AGILE_PAGE_SIZE}
+            )
+            values = (response or {}).get("values") or []
+            yield from values
+            start += len(values)
+            if not values or (response or {}).get("isLast", True):
+                return
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+    def boards(self) -> Iterator[dict]:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return self._values("board")
+
+    def board(self, board_id: int) -> dict:
+        return self.client.get(self._url(f"board/{board_id}"))
+
+    @staticmethod
+    def board_snapshot(board: dict) -> BoardSnapshot:
+        location = board.get("location") or {}
+        return BoardSnapshot(
+            id=board["id"], name=board.get("name", ""), type=board.get("type", ""), project=location.get("projectKey")
+        )
+
+    def sprints(self, board: dict) -> List[SprintSnapshot]:
+        if board.get("type") == "kanban":
+            return []
+        try:
+            sprints = list(self._values(f"board/{board['id']}/sprint", {"state": self.states}))
+        except HTTPError as e:
+            # Boards of other types answer "The board does not support sprints"
+            if e.response is not None and e.response.status_code == 400:
+                return []
+            raise
+        return [
+            SprintSnapshot(
+                id=sprint["id"],
+                name=sprint.get("name", ""),
+                state=sprint.get("state", ""),
+                start_date=sprint.get("startDate"),
+                end_date=sprint.get("endDate"),
+                complete_date=sprint.get("completeDate"),
+                goal=sprint.get("goal") or None,
+            )
+            for sprint in sprints
+        ]
+
+    def issues(self, board: BoardSnapshot, sprint: Optional[SprintSnapshot]) -> List[SprintIssue]:
+        """Fetch the issues of a sprint, paging until ``total``."""
+        if sprint is None:
+            return []
+        issues: List[SprintIssue] = []
+        params = {"fields": ",".join(self.fields), "maxResults": SPRINT_ISSUE_PAGE_SIZE}
+        while True:
+            response = self.client.get(
+                self._url(f"board/{board.id}/sprint/{sprint.id}/issue"), params={**params, "startAt": len(issues)}
+            )
+            page = (response or {}).get("issues") or []
+            issues.extend(self.issue(issue) for issue in page)
+            if not page or len(issues) >= int((response or {}).get("total") or 0):
+                return issues
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+    def issue(self, issue: dict) -> SprintIssue:
+        fields = issue.get("fields") or {}
+        status = fields.get("status") or {}
+        assignee = fields.get("assignee") or {}
+        estimate = fields.get(self.estimate_field) if self.estimate_field else None
+        return SprintIssue(
+            key=issue["key"],
+            id=issue.get("id", ""),
+            summary=fields.get("summary"),
+            status=status.get("name"),
+            status_category=(status.get("statusCategory") or {}).get("key"),
+            issue_type=(fields.get("issuetype") or {}).get("name"),
+            assignee=assignee.get("accountId") or assignee.get("name"),
+            estimate=float(estimate) if isinstance(estimate, (int, float)) else None,
+            resolved=fields.get("resolutiondate"),
+            extra={name: fields.get(name) for name in self.extra},
+        )
+
+
+def _estimate_field(client: Any) -> Optional[str]:
+    """Find the estimate field through the client's metadata registry, if it has one."""
+    registry = getattr(client, "metadata", None)
+    for name in ESTIMATE_FIELD_NAMES if registry is not None else ():
+        try:
+            return registry.field_id(name)
+        except (KeyError, ValueError):
+            continue
+    return None
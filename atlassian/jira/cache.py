@@ -0,0 +1,337 @@
+# coding=utf-8
+"""Local, queryable Jira issue cache.
+
+:class:`IssueCache` keeps issue JSON in a sqlite database together with
+indexed columns for the project, status, assignee, ``updated`` timestamp,
+parent and labels, so lookups such as "open issues assigned to me" or "the
+children of an epic" are answered without a REST request.
+
+The cache is filled from the JQL iterators (assign it to
+``Jira.issue_cache`` or wrap any issue iterable in :meth:`IssueCache.populate`),
+kept fresh by :class:`atlassian.jira.sync.DeltaSync`, for which it is a
+sink, and consulted by ``Jira.get_issue``/``Jira.issue`` before the server.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..concurrency import chunked
+from .sync import SyncSink
+
+ALL_FIELDS = "*all"
+NAVIGABLE_FIELDS = "*navigable"
+_ISSUE_PATH = re.compile(r"(?:^|/)issue/([^/?]+)")
+
+T_filter = Union[str, Iterable[str], None]
+
+
+def _field_set(fields: Union[str, Iterable[str], None]) -> Optional[frozenset]:
+    """Return the requested field names, ``None`` meaning every field.
+
+    ``*navigable`` is kept as a name of its own: it leaves out fields such as
+    ``comment``, ``worklog`` and ``attachment``, so it is not every field.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    names = frozenset(name.strip() for name in fields if name.strip())
+    if not names or ALL_FIELDS in names:
+        return None
+    return names
+
+
+class IssueCache(SyncSink):
+    """sqlite store of Jira issues with secondary indexes.
+
+    :param path: Database file, ``":memory:"`` for a process-local cache.
+    :param max_age: OPTIONAL: seconds after which a cached issue is no longer
+        served by :meth:`get`. Issues kept current by ``DeltaSync`` do not
+        need an expiry.
+    :param sync_fields: Fields the ``DeltaSync`` feeding this cache requests.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        max_age: Optional[float] = None,
+        sync_fields: Union[str, Iterable[str], None] = ALL_FIELDS,
+    ):
+        self.path = path
+        self.max_age = max_age
+        self.sync_fields = sync_fields
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self.connection:
+            self.connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS issue (
+                    id TEXT PRIMARY KEY,
+                    key TEXT NOT NULL UNIQUE,
+                    project TEXT,
+                    status TEXT,
+                    assignee TEXT,
+                    updated TEXT,
+                    parent TEXT,
+                    fields TEXT,
+                    data TEXT NOT NULL,
+                    cached_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS issue_project ON issue (project);
+                CREATE INDEX IF NOT EXISTS issue_status ON issue (status);
+                CREATE INDEX IF NOT EXISTS issue_assignee ON issue (assignee);
+                CREATE INDEX IF NOT EXISTS issue_updated ON issue (updated);
+                CREATE INDEX IF NOT EXISTS issue_parent ON issue (parent);
+                CREATE TABLE IF NOT EXISTS issue_label (
+                    issue_id TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    PRIMARY KEY (issue_id, label)
+                );
+                CREATE INDEX IF NOT EXISTS issue_label_label ON issue_label (label);
+                CREATE TABLE IF NOT EXISTS issue_link (
+                    issue_id TEXT NOT NULL,
+                    link_type TEXT,
+                    direction TEXT NOT NULL,
+                    linked_key TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS issue_link_issue ON issue_link (issue_id);
+                CREATE INDEX IF NOT EXISTS issue_link_linked ON issue_link (linked_key);
+                """
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM issue").fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
+
+    # Writing
+
+    @staticmethod
+    def _columns(issue: dict) -> Tuple[Optional[str], ...]:
+        fields = issue.get("fields") or {}
+        project = (fields.get("project") or {}).get("key") or issue["key"].rsplit("-", 1)[0]
+        status = (fields.get("status") or {}).get("name")
+        assignee = fields.get("assignee") or {}
+        assignee_id = assignee.get("accountId") or assignee.get("name") or assignee.get("key")
+        parent = (fields.get("parent") or {}).get("key")
+        return project, status, assignee_id, fields.get("updated"), parent
+
+    @staticmethod
+    def _links(issue: dict) -> List[Tuple[str, Optional[str], str, str]]:
+        links = []
+        for link in (issue.get("fields") or {}).get("issuelinks") or []:
+            link_type = (link.get("type") or {}).get("name")
+            for direction in ("outward", "inward"):
+                linked = link.get(f"{direction}Issue")
+                if linked:
+                    links.append((str(issue["id"]), link_type, direction, linked["key"]))
+        return links
+
+    def put(self, issue: dict, fields: Union[str, Iterable[str], None] = ALL_FIELDS) -> None:
+        """Store one issue as returned by the REST API; see :meth:`put_many`."""
+        self.put_many([issue], fields)
+
+    def put_many(self, issues: Iterable[dict], fields: Union[str, Iterable[str], None] = ALL_FIELDS) -> int:
+        """Store issues as returned by the REST API.
+
+        :param issues: Issue JSON objects with ``id``, ``key`` and ``fields``.
+        :param fields: Fields that were requested for ``issues``. An issue
+            fetched with a subset of fields never replaces a complete copy of
+            the same version.
+        :return: number of issues written
+        """
+        requested = _field_set(fields)
+        stored_fields = None if requested is None else ",".join(sorted(requested))
+        now = time.time()
+        rows, labels, links, ids = [], [], [], []
+        for issue in issues:
+            issue_id = str(issue["id"])
+            if requested is not None and self._has_complete_copy(issue_id, issue):
+                continue
+            ids.append(issue_id)
+            rows.append((issue_id, issue["key"], *self._columns(issue), stored_fields, json.dumps(issue), now))
+            labels.extend((issue_id, label) for label in (issue.get("fields") or {}).get("labels") or [])
+            links.extend(self._links(issue))
+        if not rows:
+            return 0
+        with self._lock, self.connection:
+            self._remove(ids)
+            self.connection.executemany("INSERT OR REPLACE INTO issue VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.connection.executemany("INSERT OR IGNORE INTO issue_label VALUES (?, ?)", labels)
+            self.connection.executemany("INSERT INTO issue_link VALUES (?, ?, ?, ?)", links)
+        return len(rows)
+
+    def _has_complete_copy(self, issue_id: str, issue: dict) -> bool:
+        with self._lock:
+            row = self.connection.execute("SELECT fields, updated FROM issue WHERE id = ?", (issue_id,)).fetchone()
+        if row is None or row[0] is not None:
+            return False
+        updated = (issue.get("fields") or {}).get("updated")
+        return updated is None or row[1] == updated
+
+    def populate(self, issues: Iterable[dict], fields: Union[str, Iterable[str], None] = ALL_FIELDS) -> Iterator[dict]:
+        """Yield ``issues`` unchanged while storing them in the cache, 100 per transaction."""
+        for batch in chunked(issues, 100):
+            self.put_many(batch, fields)
+            yield from batch
+
+    def _remove(self, ids: List[str]) -> None:
+        params = [(issue_id,) for issue_id in ids]
+        self.connection.executemany("DELETE FROM issue WHERE id = ?", params)
+        self.connection.executemany("DELETE FROM issue_label WHERE issue_id = ?", params)
+        self.connection.executemany("DELETE FROM issue_link WHERE issue_id = ?", params)
+
+    def invalidate(self, *id_or_keys: str) -> None:
+        """Drop issues, given by ID or key, so the next read goes to the server."""
+        with self._lock, self.connection:
+            placeholders = ", ".join("?" * len(id_or_keys))
+            rows = self.connection.execute(
+                f"SELECT id FROM issue WHERE id IN ({placeholders}) OR key IN ({placeholders})",
+                [str(value) for value in id_or_keys] * 2,
+            )
+            self._remove([row[0] for row in rows.fetchall()])
+
+    def invalidate_path(self, path: str) -> None:
+        """Drop the issue addressed by a REST path such as ``rest/api/2/issue/KEY-1/transitions``."""
+        match = _ISSUE_PATH.search(path)
+        if match:
+            self.invalidate(match.group(1))
+
+    def clear(self) -> None:
+        with self._lock, self.connection:
+            self.connection.executescript("DELETE FROM issue; DELETE FROM issue_label; DELETE FROM issue_link;")
+
+    # SyncSink
+
+    def upsert_issues(self, project: str, issues: List[dict], changelogs: Dict[str, List[dict]]) -> None:
+        self.put_many(issues, self.sync_fields)
+
+    def delete_issues(self, project: str, issues: Dict[str, str]) -> None:
+        with self._lock, self.connection:
+            self._remove(list(issues))
+
+    # Reading
+
+    def get(self, id_or_key: Any, fields: Union[str, Iterable[str], None] = None) -> Optional[dict]:
+        """Return a cached issue or ``None``.
+
+        :param id_or_key: Issue ID or key.
+        :param fields: OPTIONAL: fields the caller needs. The issue is only
+            returned when all of them were cached; it then contains only those
+            fields, like a REST response for the same request.
+        """
+        requested = _field_set(fields)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT fields, data, cached_at FROM issue WHERE id = ? OR key = ?", (str(id_or_key), str(id_or_key))
+            ).fetchone()
+        if row is None or (self.max_age is not None and time.time() - row[2] > self.max_age):
+            self.misses += 1
+            return None
+        stored, data, _ = row
+        issue = json.loads(data)
+        if stored is not None:
+            available = set(stored.split(","))
+            if NAVIGABLE_FIELDS in available:
+                available.update(issue.get("fields") or ())
+            if requested is None or not requested <= available:
+                self.misses += 1
+                return None
+        self.hits += 1
+        if requested is not None and NAVIGABLE_FIELDS not in requested:
+            issue["fields"] = {name: value for name, value in issue.get("fields", {}).items() if name in requested}
+        return issue
+
+    def _where(self, **filters: Any) -> Tuple[str, list]:
+        clauses, params = [], []
+        for column in ("project", "status", "assignee", "parent"):
+            value = filters.get(column)
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        label = filters.get("label")
+        if label is not None:
+            clauses.append("id IN (SELECT issue_id FROM issue_label WHERE label = ?)")
+            params.append(label)
+        if filters.get("updated_since") is not None:
+            clauses.append("updated >= ?")
+            params.append(filters["updated_since"])
+        if filters.get("keys") is not None:
+            keys = list(filters["keys"])
+            clauses.append(f"key IN ({', '.join('?' * len(keys))})")
+            params.extend(keys)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(
+        self,
+        project: T_filter = None,
+        status: T_filter = None,
+        assignee: T_filter = None,
+        parent: T_filter = None,
+        label: Optional[str] = None,
+        updated_since: Optional[str] = None,
+        keys: Optional[Iterable[str]] = None,
+        order_by: str = "updated",
+        descending: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """Return cached issues matching all given filters.
+
+        :param project: Project key or keys.
+        :param status: Status name or names.
+        :param assignee: Account ID (Cloud) or user name (Server/Data Center), or several.
+        :param parent: Parent issue key or keys, e.g. the epic of the wanted issues.
+        :param label: Label the issues must carry.
+        :param updated_since: Jira timestamp string, compared as text.
+        :param keys: Restrict to these issue keys.
+        :param order_by: One of ``updated``, ``key``, ``status``, ``assignee``.
+        :param descending: Sort order. Default: newest first.
+        :param limit: OPTIONAL: maximum number of issues.
+        """
+        if order_by not in ("updated", "key", "status", "assignee", "project"):
+            raise ValueError(f"Cannot order cached issues by [{order_by}]")
+        where, params = self._where(
+            project=project,
+            status=status,
+            assignee=assignee,
+            parent=parent,
+            label=label,
+            updated_since=updated_since,
+            keys=keys,
+        )
+        sql = f"SELECT data FROM issue{where} ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            return [json.loads(row[0]) for row in self.connection.execute(sql, params).fetchall()]
+
+    def count(self, **filters: Any) -> int:
+        """Count cached issues; accepts the filters of :meth:`query`."""
+        where, params = self._where(**filters)
+        with self._lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM issue{where}", params).fetchone()[0]
+
+    def children(self, parent_key: str) -> List[dict]:
+        """Return the cached issues whose parent is ``parent_key``."""
+        return self.query(parent=parent_key, order_by="key", descending=False)
+
+    def links(self, id_or_key: str) -> List[Tuple[Optional[str], str, str]]:
+        """Return ``(link type, direction, linked key)`` for the links of a cached issue."""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT link_type, direction, linked_key FROM issue_link "
+                "WHERE issue_id IN (SELECT id FROM issue WHERE id = ? OR key = ?)",
+                (str(id_or_key), str(id_or_key)),
+            )
+            return rows.fetchall()
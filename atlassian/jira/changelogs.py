@@ -0,0 +1,134 @@
+# coding=utf-8
+"""Changelog streaming for any number of issues.
+
+:func:`iter_field_changes` turns the changelogs of many issues into compact
+:class:`FieldChange` tuples, e.g. for cycle-time analytics. On Jira Cloud the
+issues are split into chunks of 1000 for ``changelog/bulkfetch``; each chunk
+follows its own ``nextPageToken`` and the chunks are fetched concurrently. On
+Server/Data Center, where there is no bulk changelog endpoint, the chunks are
+``key in (...)`` searches with ``expand=changelog`` instead of one
+``get_issue_changelog`` request per issue.
+"""
+
+import datetime
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Set
+
+from ..bulk import JIRA_BULK_FETCH_LIMIT, JIRA_CHANGELOG_BULK_LIMIT
+from ..concurrency import DEFAULT_MAX_WORKERS, RateLimiter, chunked, map_concurrently
+from ..request_utils import get_default_logger
+from .sync import parse_jira_timestamp
+
+log = get_default_logger(__name__)
+
+# changelog/bulkfetch filters server-side on at most this many field IDs
+CHANGELOG_FIELD_ID_LIMIT = 10
+
+
+class FieldChange(NamedTuple):
+    """One changed field of one changelog entry."""
+
+    issue: str
+    timestamp: datetime.datetime
+    field: str
+    from_value: Optional[str]
+    to_value: Optional[str]
+
+
+def iter_field_changes(
+    client: Any,
+    issues: Iterable[str],
+    fields: Optional[Iterable[str]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Iterator[FieldChange]:
+    """Yield the field changes of ``issues``, chunk by chunk.
+
+    ``issue`` of every :class:`FieldChange` is the issue ID, ``field`` the
+    field ID where Jira reports one (the field name otherwise), and
+    ``from_value``/``to_value`` the display strings (the raw values when Jira
+    has no display string). Changes of one issue are yielded in chronological
+    order.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param issues: Issue IDs or keys; any iterable, consumed lazily.
+    :param fields: OPTIONAL: only yield changes of these field IDs, e.g.
+        ``["status"]``; field names also match. Up to 10 IDs are filtered by
+        Jira Cloud itself. Default: all fields.
+    :param max_workers: Number of chunks fetched concurrently.
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing every page request.
+    """
+    wanted = None if fields is None else {str(name).lower() for name in fields}
+    if hasattr(client, "get_bulk_changelogs") or getattr(client, "cloud", False):
+        chunk_size = JIRA_CHANGELOG_BULK_LIMIT
+
+        def fetch(chunk: List[str]) -> List[FieldChange]:
+            return _bulk_changes(client, chunk, wanted, rate_limiter)
+
+    else:
+        chunk_size = JIRA_BULK_FETCH_LIMIT
+
+        def fetch(chunk: List[str]) -> List[FieldChange]:
+            return _search_changes(client, chunk, wanted, rate_limiter)
+
+    chunks = chunked((str(issue) for issue in issues), chunk_size)
+    for chunk, future in map_concurrently(fetch, chunks, max_workers=max_workers):
+        changes = future.result()
+        log.debug("Read %d field changes of %d issues", len(changes), len(chunk))
+        yield from changes
+
+
+def _changes(issue_id: str, histories: Iterable[dict], wanted: Optional[Set[str]]) -> Iterator[FieldChange]:
+    for history in histories:
+        timestamp = None
+        for item in history.get("items") or ():
+            field = item.get("fieldId") or item.get("field")
+            if wanted is not None and not (str(field).lower() in wanted or str(item.get("field")).lower() in wanted):
+                continue
+            if timestamp is None:
+                timestamp = parse_jira_timestamp(history["created"])
+            from_value = item.get("fromString")
+            to_value = item.get("toString")
+            yield FieldChange(
+                issue_id,
+                timestamp,
+                field,
+                item.get("from") if from_value is None else from_value,
+                item.get("to") if to_value is None else to_value,
+            )
+
+
+def _bulk_changes(
+    client: Any, chunk: List[str], wanted: Optional[Set[str]], rate_limiter: Optional[RateLimiter]
+) -> List[FieldChange]:
+    field_ids = sorted(wanted) if wanted is not None and len(wanted) <= CHANGELOG_FIELD_ID_LIMIT else None
+    changes: List[FieldChange] = []
+    next_page_token = None
+    while True:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        if hasattr(client, "get_bulk_changelogs"):
+            data: dict = {"issueIdsOrKeys": chunk}
+            if field_ids:
+                data["fieldIds"] = field_ids
+            if next_page_token is not None:
+                data["nextPageToken"] = next_page_token
+            response = client.get_bulk_changelogs(data=data)
+        else:
+            response = client.get_changelogs_bulk(chunk, next_page_token=next_page_token, field_ids=field_ids)
+        response = response or {}
+        for changelog in response.get("issueChangeLogs", []):
+            changes.extend(_changes(str(changelog["issueId"]), changelog.get("changeHistories", []), wanted))
+        next_page_token = response.get("nextPageToken")
+        if not next_page_token:
+            return changes
+
+
+def _search_changes(
+    client: Any, chunk: List[str], wanted: Optional[Set[str]], rate_limiter: Optional[RateLimiter]
+) -> List[FieldChange]:
+    jql = "key in ({keys})".format(keys=", ".join(chunk))
+    changes: List[FieldChange] = []
+    for issue in client.iter_jql(jql, fields=["key"], expand="changelog", prefetch=False, rate_limiter=rate_limiter):
+        histories = (issue.get("changelog") or {}).get("histories", [])
+        changes.extend(_changes(str(issue["id"]), histories, wanted))
+    return changes
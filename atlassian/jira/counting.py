@@ -0,0 +1,129 @@
+# coding=utf-8
+"""Issue counts for JQL queries.
+
+:func:`count_jql` asks Jira for the number of issues matching a query without
+downloading any of them: a ``maxResults=0`` search read for its ``total`` on
+Server/Data Center, and ``search/approximate-count`` on Jira Cloud, whose
+enhanced search no longer reports totals. :class:`IssueCounter` counts many
+queries concurrently and can keep the counts for a short time, e.g. for
+dashboards rendering dozens of counters.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from ..concurrency import DEFAULT_MAX_WORKERS, RateLimiter, map_concurrently
+from ..request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+
+def count_jql(client: Any, jql: str) -> int:
+    """Return the number of issues matching ``jql``.
+
+    Jira Cloud counts are approximate: issues changed in the last few seconds
+    may not be counted yet.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param jql: JQL query; an ``ORDER BY`` clause is allowed and ignored.
+    :return: int
+    """
+    if hasattr(client, "bulk_fetch_issues"):
+        response = client.count_issues(data={"jql": jql})
+    elif getattr(client, "cloud", False):
+        response = client.approximate_issue_count(jql)
+    else:
+        response = client.get(
+            client.resource_url("search"), params={"jql": jql, "maxResults": 0, "fields": "*none"}, advanced_mode=True
+        )
+        client.raise_for_status(response)
+        return int(response.json()["total"])
+    if hasattr(response, "json"):
+        client.raise_for_status(response)
+        response = response.json()
+    return int(response["count"])
+
+
+class IssueCounter(object):
+    """Count issues for many JQL queries, optionally caching the counts.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param ttl: OPTIONAL: seconds a count is reused; by default every call asks Jira.
+    :param max_workers: Number of concurrent requests.
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing all requests.
+    :param clock: Monotonic time source, replaceable for tests.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        ttl: Optional[float] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Tuple[int, float]] = {}
+
+    def count(self, jql: str) -> int:
+        """Return the number of issues matching ``jql``."""
+        return self.count_many([jql])[jql]
+
+    def count_many(self, jqls: Iterable[str]) -> Dict[str, int]:
+        """Return the number of issues matching each query, counting the uncached ones concurrently.
+
+        A failed count raises after the other counts have finished; the
+        successful ones are cached all the same.
+        """
+        queries = list(dict.fromkeys(jqls))
+        counts: Dict[str, int] = {}
+        pending = []
+        for jql in queries:
+            cached = self._cached(jql)
+            if cached is None:
+                pending.append(jql)
+            else:
+                counts[jql] = cached
+        log.debug("Counting %d queries, %d from cache", len(pending) + len(counts), len(counts))
+
+        error: Optional[BaseException] = None
+        for jql, future in map_concurrently(
+            lambda jql: count_jql(self.client, jql),
+            pending,
+            max_workers=self.max_workers,
+            rate_limiter=self.rate_limiter,
+        ):
+            try:
+                counts[jql] = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            if self.ttl is not None:
+                with self._lock:
+                    self._counts[jql] = (counts[jql], self.clock())
+        if error is not None:
+            raise error
+        return {jql: counts[jql] for jql in queries}
+
+    def invalidate(self, *jqls: str) -> None:
+        """Forget the cached counts of the given queries, or all of them."""
+        with self._lock:
+            if not jqls:
+                self._counts.clear()
+            for jql in jqls:
+                self._counts.pop(jql, None)
+
+    def _cached(self, jql: str) -> Optional[int]:
+        if self.ttl is None:
+            return None
+        with self._lock:
+            entry = self._counts.get(jql)
+        if entry is None or self.clock() - entry[1] >= self.ttl:
+            return None
+        return entry[0]
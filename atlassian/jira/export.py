@@ -0,0 +1,279 @@
+# coding=utf-8
+"""Issue navigator exports of any size.
+
+The CSV and Excel exports of ``Jira.csv`` and ``Jira.excel`` return at most
+``tempMax`` issues (1000 by default on Server/Data Center). :class:`IssueExporter`
+walks ``pager/start`` in windows of that size, optionally fetching several
+windows at once, and keeps every finished window as a part file so that an
+interrupted export resumes with the windows still missing. The parts are then
+joined into one file, or written to a binary sink, with a single header: CSV
+windows whose columns differ, e.g. because one window has more ``Labels``
+columns, are aligned to the union of their headers.
+"""
+
+import csv
+import io
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import IO, Any, Iterator, List, Optional, Tuple, Union
+
+from ..concurrency import RateLimiter, map_concurrently
+from ..request_utils import get_default_logger
+from .counting import count_jql
+
+log = get_default_logger(__name__)
+
+DEFAULT_WINDOW = 1000
+FORMATS = ("csv", "excel")
+ORDER_BY = re.compile(r"\border\s+by\b", re.IGNORECASE)
+TBODY_START = re.compile(rb"<tbody[^>]*>", re.IGNORECASE)
+TBODY_END = re.compile(rb"</tbody\s*>", re.IGNORECASE)
+TABLE_ROW = re.compile(rb"<tr[\s>]", re.IGNORECASE)
+
+
+@dataclass
+class ExportReport:
+    """Outcome of :meth:`IssueExporter.export`.
+
+    ``resumed`` counts the windows reused from an earlier, interrupted run.
+    """
+
+    target: str
+    issues: int = 0
+    rows: int = 0
+    windows: int = 0
+    resumed: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+
+class IssueExporter(object):
+    """Export all issues matching a JQL query from the issue navigator, a window at a time.
+
+    A JQL query without ``ORDER BY`` is ordered by issue key, so that the
+    windows of a resumed export line up with the ones already written.
+
+    :param client: ``Jira`` client (Server/Data Center).
+    :param jql: JQL query.
+    :param target: File path, or a binary file object the joined export is written to.
+    :param format: ``csv`` or ``excel``.
+    :param all_fields: Export all fields, or the navigator's current columns only.
+    :param window: Issues per request (``tempMax``); Jira caps it with ``jira.search.views.default.max``.
+    :param delimiter: OPTIONAL: CSV delimiter.
+    :param parts_dir: Directory keeping finished windows until the export is joined;
+        ``<target>.parts`` for paths, a temporary directory (no resume) for file objects.
+    :param max_workers: Number of windows fetched concurrently.
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing all requests.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        jql: str,
+        target: Union[str, IO[bytes]],
+        format: str = "csv",
+        all_fields: bool = True,
+        window: int = DEFAULT_WINDOW,
+        delimiter: Optional[str] = None,
+        parts_dir: Optional[str] = None,
+        max_workers: int = 1,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        self.client = client
+        self.jql = jql if ORDER_BY.search(jql) else f"{jql} ORDER BY key ASC"
+        self.target = target
+        self.format = format
+        self.all_fields = all_fields
+        self.window = window
+        self.delimiter = delimiter
+        self.parts_dir = parts_dir
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+
+    def export(self) -> ExportReport:
+        """Download the missing windows, join them into the target and remove the parts.
+
+        When a window fails the error is raised once the other windows are
+        done; the finished windows stay in the parts directory for the next run.
+        A window holding fewer issues than requested fails too, as Jira caps
+        ``window`` with ``jira.search.views.default.max`` without telling.
+        """
+        started = time.monotonic()
+        is_path = isinstance(self.target, str)
+        report = ExportReport(target=self.target if is_path else getattr(self.target, "name", "<stream>"))
+        parts_dir = self.parts_dir or (f"{self.target}.parts" if is_path else tempfile.mkdtemp(prefix="jira-export-"))
+        os.makedirs(parts_dir, exist_ok=True)
+
+        report.issues = count_jql(self.client, self.jql)
+        starts = list(range(0, report.issues, self.window)) or [0]
+        report.windows = len(starts)
+        missing = [start for start in starts if not os.path.exists(self._part(parts_dir, start))]
+        report.resumed = len(starts) - len(missing)
+        log.info("Exporting %d issues in %d windows, %d already done", report.issues, len(starts), report.resumed)
+
+        error: Optional[BaseException] = None
+        for start, future in map_concurrently(
+            lambda start: self._download(parts_dir, start, min(self.window, report.issues - start)),
+            missing,
+            max_workers=self.max_workers,
+            rate_limiter=self.rate_limiter,
+        ):
+            try:
+                future.result()
+            except Exception as e:
+                log.warning("Window at %d of the export failed: %s", start, e)
+                error = error or e
+        if error is not None:
+            raise error
+
+        parts = [self._part(parts_dir, start) for start in starts]
+        if is_path:
+            partial = f"{self.target}.part"
+            with open(partial, "wb") as sink:
+                report.rows = self._join(parts, sink)
+            os.replace(partial, self.target)  # type: ignore[arg-type]
+            report.bytes = os.path.getsize(self.target)  # type: ignore[arg-type]
+        else:
+            counting = _CountingWriter(self.target)  # type: ignore[arg-type]
+            report.rows = self._join(parts, counting)
+            report.bytes = counting.written
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        report.seconds = time.monotonic() - started
+        return report
+
+    def _part(self, parts_dir: str, start: int) -> str:
+        return os.path.join(parts_dir, f"window-{start:09d}.{'csv' if self.format == 'csv' else 'xls'}")
+
+    def _download(self, parts_dir: str, start: int, expected: int) -> None:
+        if self.format == "csv":
+            content = self.client.csv(
+                self.jql, limit=self.window, all_fields=self.all_fields, start=start, delimiter=self.delimiter
+            )
+        else:
+            content = self.client.excel(self.jql, limit=self.window, all_fields=self.all_fields, start=start)
+        if not isinstance(content, bytes):
+            content = content.content if hasattr(content, "content") else str(content).encode("utf-8")
+        path = self._part(parts_dir, start)
+        with open(f"{path}.part", "wb") as part:
+            part.write(content)
+        rows = self._rows(f"{path}.part")
+        if rows < expected:
+            os.remove(f"{path}.part")
+            raise ValueError(
+                f"Export window at {start} holds {rows} of {expected} issues; "
+                "use a window of at most jira.search.views.default.max issues"
+            )
+        os.replace(f"{path}.part", path)
+
+    def _rows(self, path: str) -> int:
+        if self.format == "csv":
+            return sum(1 for _ in _csv_rows(path, self.delimiter or ","))
+        with open(path, "rb") as handle:
+            content = handle.read()
+        start, end = TBODY_START.search(content), TBODY_END.search(content)
+        return len(TABLE_ROW.findall(content[start.end() : end.start()])) if start and end else 0
+
+    def _join(self, parts: List[str], sink: IO[bytes]) -> int:
+        return self._join_csv(parts, sink) if self.format == "csv" else self._join_excel(parts, sink)
+
+    def _join_csv(self, parts: List[str], sink: IO[bytes]) -> int:
+        delimiter = self.delimiter or ","
+        headers = [_csv_header(part, delimiter) for part in parts]
+        columns = union_header(headers)
+        text = io.TextIOWrapper(sink, encoding="utf-8", newline="", write_through=True)  # type: ignore[arg-type]
+        writer = csv.writer(text, delimiter=delimiter)
+        writer.writerow([name for name, _ in columns])
+        rows = 0
+        for part, header in zip(parts, headers):
+            keys = _keyed(header)
+            positions = None if keys == columns else [keys.index(key) if key in keys else None for key in columns]
+            for row in _csv_rows(part, delimiter):
+                if positions is not None:
+                    row = [row[index] if index is not None and index < len(row) else "" for index in positions]
+                writer.writerow(row)
+                rows += 1
+        text.detach()
+        return rows
+
+    @staticmethod
+    def _join_excel(parts: List[str], sink: IO[bytes]) -> int:
+        rows = 0
+        suffix = b""
+        for number, part in enumerate(parts):
+            with open(part, "rb") as handle:
+                content = handle.read()
+            start, end = TBODY_START.search(content), TBODY_END.search(content)
+            if start is None or end is None:
+                raise ValueError(f"Export window {part} holds no issue table")
+            if number == 0:
+                sink.write(content[: start.end()])
+                suffix = content[end.start() :]
+            body = content[start.end() : end.start()]
+            rows += len(TABLE_ROW.findall(body))
+            sink.write(body)
+        sink.write(suffix)
+        return rows
+
+
+def union_header(headers: List[List[str]]) -> List[Tuple[str, int]]:
+    """Merge CSV headers into one list of ``(name, occurrence)`` columns.
+
+    Repeated columns such as ``Labels`` are told apart by their occurrence;
+    an occurrence missing from earlier headers is placed after the previous
+    occurrence of the same name.
+    """
+    columns: List[Tuple[str, int]] = []
+    for header in headers:
+        for key in _keyed(header):
+            if key in columns:
+                continue
+            name, occurrence = key
+            if occurrence and (name, occurrence - 1) in columns:
+                columns.insert(columns.index((name, occurrence - 1)) + 1, key)
+            else:
+                columns.append(key)
+    return columns
+
+
+def _keyed(header: List[str]) -> List[Tuple[str, int]]:
+    seen: dict = {}
+    keys = []
+    for name in header:
+        keys.append((name, seen.get(name, 0)))
+        seen[name] = seen.get(name, 0) + 1
+    return keys
+
+
+def _csv_header(path: str, delimiter: str) -> List[str]:
+    with open(path, encoding="utf-8-sig", newline="") as handle:
+        return next(csv.reader(handle, delimiter=delimiter), [])
+
+
+def _csv_rows(path: str, delimiter: str) -> Iterator[List[str]]:
+    with open(path, encoding="utf-8-sig", newline="") as handle:
+        reader = csv.reader(handle, delimiter=delimiter)
+        next(reader, None)
+        yield from reader
+
+
+class _CountingWriter(io.RawIOBase):
+    """Binary writer passing through to a sink and counting the bytes."""
+
+    def __init__(self, sink: IO[bytes]):
+        super().__init__()
+        self.sink = sink
+        self.written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self.sink.write(data)
+        self.written += len(data)
+        return len(data)
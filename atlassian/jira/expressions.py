@@ -0,0 +1,141 @@
+# coding=utf-8
+"""Per-issue Jira expressions over JQL results.
+
+:func:`evaluate_issues` lets Jira Cloud compute derived values, e.g. the
+sum of sub-task estimates or the number of comments, for every issue a JQL
+query selects, and returns only those values instead of the full issues.
+The expression is evaluated over the query's issues a page at a time,
+following the pagination metadata Jira returns with each page:
+``nextPageToken`` for the ``expression/evaluate`` endpoint, ``startAt`` and
+``totalCount`` for the older ``expression/eval`` endpoint, whose remaining
+pages are then evaluated concurrently.
+"""
+
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from ..concurrency import DEFAULT_MAX_WORKERS, RateLimiter, map_concurrently
+from ..request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+# Documented maximum of ``context.issues.jql.maxResults``
+EXPRESSION_ISSUE_LIMIT = 1000
+
+
+class ExpressionResult(NamedTuple):
+    """Value of the expression for one issue."""
+
+    issue: str
+    value: Any
+
+
+def evaluate_issues(
+    client: Any,
+    jql: str,
+    expression: str,
+    batch_size: int = EXPRESSION_ISSUE_LIMIT,
+    context: Optional[Dict[str, Any]] = None,
+    validation: str = "strict",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Iterator[ExpressionResult]:
+    """Yield the value of ``expression`` for every issue matching ``jql``, in JQL order.
+
+    ``expression`` is evaluated with ``issue`` bound to one issue, e.g.
+    ``"{comments: issue.comments.length, points: issue.subtasks.reduce((sum, s) => sum + (s.storyPoints || 0), 0)}"``.
+    Lower ``batch_size`` when Jira rejects a page for exceeding the expression
+    complexity limits.
+
+    :param client: ``Jira`` (Cloud) or ``JiraCloud`` client; Server/Data Center has no Jira expressions.
+    :param jql: JQL query selecting the issues.
+    :param expression: Jira expression computing the value of ``issue``.
+    :param batch_size: Issues per evaluation request.
+    :param context: OPTIONAL: further expression context, e.g. ``{"user": {"accountId": ...}}``.
+    :param validation: JQL validation of the ``expression/eval`` endpoint: ``strict``, ``warn`` or ``none``.
+    :param max_workers: Number of concurrent requests for the ``expression/eval`` endpoint.
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing all requests.
+    :return: iterator of :class:`ExpressionResult`
+    """
+    if not hasattr(client, "bulk_fetch_issues") and not getattr(client, "cloud", False):
+        raise ValueError("Jira expressions are only available for Jira Cloud platform")
+    evaluation = _Evaluation(client, jql, expression, min(batch_size, EXPRESSION_ISSUE_LIMIT), context, validation)
+    if hasattr(client, "evaluate_jsisjira_expression"):
+        pages = evaluation.token_pages(rate_limiter)
+    else:
+        pages = evaluation.offset_pages(max_workers, rate_limiter)
+    for page in pages:
+        for key, value in page:
+            yield ExpressionResult(key, value)
+
+
+class _Evaluation(object):
+    """Requests evaluating one expression over the pages of one JQL query."""
+
+    def __init__(
+        self,
+        client: Any,
+        jql: str,
+        expression: str,
+        batch_size: int,
+        context: Optional[Dict[str, Any]],
+        validation: str,
+    ):
+        self.client = client
+        self.jql = jql
+        self.expression = f"issues.map(issue => [issue.key, ({expression})])"
+        self.batch_size = batch_size
+        self.context = context or {}
+        self.validation = validation
+
+    def _body(self, **page: Any) -> dict:
+        query = {"query": self.jql, "maxResults": self.batch_size, **page}
+        return {"expression": self.expression, "context": {**self.context, "issues": {"jql": query}}}
+
+    def token_pages(self, rate_limiter: Optional[RateLimiter]) -> Iterator[List[list]]:
+        """Evaluate page by page on ``expression/evaluate``, following ``nextPageToken``."""
+        token = None
+        while True:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            page = {} if token is None else {"nextPageToken": token}
+            response = self.client.evaluate_jsisjira_expression(data=self._body(**page)) or {}
+            yield response.get("value") or []
+            meta = _jql_meta(response)
+            token = meta.get("nextPageToken")
+            if not token or meta.get("isLast"):
+                return
+
+    def offset_pages(self, max_workers: int, rate_limiter: Optional[RateLimiter]) -> Iterator[List[list]]:
+        """Evaluate the first page on ``expression/eval``, then the remaining pages concurrently."""
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        first = self._eval(0)
+        yield first.get("value") or []
+        meta = _jql_meta(first)
+        count, total = int(meta.get("count") or 0), int(meta.get("totalCount") or 0)
+        if not count or count >= total:
+            return
+        log.debug("Evaluating expression over %d issues in pages of %d", total, count)
+        starts = range(count, total, count)
+        pages = map_concurrently(
+            lambda start: self._eval(start).get("value") or [],
+            starts,
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+            ordered=True,
+        )
+        for _, future in pages:
+            yield future.result()
+
+    def _eval(self, start: int) -> dict:
+        data = self._body(startAt=start, validation=self.validation)
+        if hasattr(self.client, "evaluate_jira_expression"):
+            return self.client.evaluate_jira_expression(data=data) or {}
+        return self.client.post(self.client.resource_url("expression/eval"), data=data) or {}
+
+
+def _jql_meta(response: dict) -> dict:
+    meta = ((response.get("meta") or {}).get("issues") or {}).get("jql") or {}
+    for warning in meta.get("validationWarnings") or ():
+        log.warning("JQL validation warning: %s", warning)
+    return meta
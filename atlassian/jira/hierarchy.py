@@ -0,0 +1,225 @@
+# coding=utf-8
+"""Breadth-first traversal of issue hierarchies and link graphs.
+
+:func:`traverse_issues` expands a whole frontier of issues per round: the
+frontier is loaded in chunks of 100 (``issue/bulkfetch`` on ``JiraCloud``,
+a ``key in (...)`` search on ``Jira``), its links, sub-tasks and parent are
+read from the returned fields, and children are found with one
+``parent in (...)`` search per chunk. Children returned by that search
+already carry their fields, so they are not fetched again. Visited keys live
+in a set, and the result is a plain adjacency map, so graphs of hundreds of
+thousands of issues stay cheap to build and to walk.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..bulk import JIRA_BULK_FETCH_LIMIT
+from ..concurrency import DEFAULT_MAX_WORKERS, chunked, map_concurrently
+from ..request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+TRAVERSAL_FIELDS = ("issuelinks", "subtasks", "parent")
+INWARD = "inward"
+OUTWARD = "outward"
+SUBTASK = "subtask"
+CHILD = "child"
+PARENT = "parent"
+
+
+@dataclass
+class IssueGraph:
+    """Adjacency structure produced by :func:`traverse_issues`.
+
+    ``edges[key]`` lists ``(target key, relation, direction)`` tuples where
+    ``relation`` is the link type name, ``"subtask"``, ``"child"`` or
+    ``"parent"`` and ``direction`` is ``"outward"`` or ``"inward"``.
+    ``depth[key]`` is the number of hops from the nearest root.
+    """
+
+    roots: List[str]
+    edges: Dict[str, List[Tuple[str, str, str]]] = field(default_factory=dict)
+    depth: Dict[str, int] = field(default_factory=dict)
+    issues: Dict[str, dict] = field(default_factory=dict)
+    missing: Set[str] = field(default_factory=set)
+    truncated: bool = False
+
+    def __len__(self) -> int:
+        return len(self.depth)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.depth
+
+    def neighbors(self, key: str, relation: Optional[str] = None) -> List[str]:
+        """Return the keys adjacent to ``key``, optionally for one relation."""
+        return [target for target, kind, _ in self.edges.get(key, ()) if relation is None or kind == relation]
+
+    def edge_list(self) -> List[Tuple[str, str, str, str]]:
+        """Return every edge as ``(source, target, relation, direction)``."""
+        return [(source, *edge) for source, edges in self.edges.items() for edge in edges]
+
+    def levels(self) -> List[List[str]]:
+        """Return the keys grouped by depth, roots first."""
+        levels: List[List[str]] = []
+        for key, depth in self.depth.items():
+            while len(levels) <= depth:
+                levels.append([])
+            levels[depth].append(key)
+        return levels
+
+
+def _accepts_link(link: dict, direction: str, link_types: Optional[Set[str]], directions: Collection[str]) -> bool:
+    if direction not in directions:
+        return False
+    if link_types is None:
+        return True
+    link_type = link.get("type") or {}
+    names = (link_type.get("name"), link_type.get(direction), link_type.get("id"))
+    return any(name is not None and str(name).lower() in link_types for name in names)
+
+
+def traverse_issues(
+    client: Any,
+    roots: Iterable[str],
+    link_types: Optional[Iterable[str]] = None,
+    directions: Collection[str] = (INWARD, OUTWARD),
+    subtasks: bool = True,
+    children: bool = True,
+    parents: bool = False,
+    max_depth: Optional[int] = None,
+    max_issues: Optional[int] = None,
+    fields: Iterable[str] = (),
+    keep_issues: bool = False,
+    children_jql: str = "parent in ({keys})",
+    children_field: str = "parent",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> IssueGraph:
+    """Walk the issues reachable from ``roots`` breadth first.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param roots: Keys of the start issues.
+    :param link_types: OPTIONAL: follow only these link types, given by name,
+        inward/outward description or ID. ``[]`` follows no links. Default: all.
+    :param directions: Link directions to follow, ``"inward"`` and/or ``"outward"``.
+    :param subtasks: Follow the ``subtasks`` field.
+    :param children: Search ``children_jql`` for the children of every frontier.
+    :param parents: Follow the ``parent`` field upwards.
+    :param max_depth: OPTIONAL: stop after this many hops from the roots.
+    :param max_issues: OPTIONAL: stop expanding once this many issues are known;
+        ``IssueGraph.truncated`` is then set.
+    :param fields: Additional fields to load, kept when ``keep_issues`` is set.
+    :param keep_issues: Store the fetched issue JSON in ``IssueGraph.issues``.
+    :param children_jql: Template for the children search. Use
+        ``'"Epic Link" in ({keys})'`` for company-managed epics on Server/Data Center.
+    :param children_field: Field of a child holding its parent, e.g. the
+        ``customfield_...`` ID of Epic Link together with the template above.
+    :param max_workers: Number of concurrent requests per frontier.
+    :return: :class:`IssueGraph`
+    """
+    graph = IssueGraph(roots=list(dict.fromkeys(roots)))
+    wanted_types = None if link_types is None else {str(name).lower() for name in link_types}
+    request_fields = list(dict.fromkeys([*TRAVERSAL_FIELDS, children_field, *fields]))
+    fetched: Dict[str, dict] = {}
+    queue = deque(graph.roots)
+    for key in graph.roots:
+        graph.depth[key] = 0
+
+    while queue:
+        frontier = list(queue)
+        queue.clear()
+        depth = graph.depth[frontier[0]]
+        last_level = max_depth is not None and depth >= max_depth
+        if last_level and not keep_issues:
+            break
+        missing = [key for key in frontier if key not in fetched]
+        for issue in _fetch_issues(client, missing, request_fields, max_workers):
+            fetched[issue["key"]] = issue
+        graph.missing.update(key for key in missing if key not in fetched)
+        frontier = [key for key in frontier if key in fetched]
+        if last_level:
+            break
+
+        found_children: Dict[str, List[str]] = {}
+        frontier_keys = set(frontier)
+        if children:
+            for issue in _search_children(client, frontier, children_jql, request_fields, max_workers):
+                parent_key = (issue.get("fields") or {}).get(children_field)
+                if isinstance(parent_key, dict):
+                    parent_key = parent_key.get("key")
+                if parent_key in frontier_keys:
+                    fetched.setdefault(issue["key"], issue)
+                    found_children.setdefault(parent_key, []).append(issue["key"])
+
+        for key in frontier:
+            issue_fields = fetched[key].get("fields") or {}
+            edges = graph.edges.setdefault(key, [])
+            targets: List[Tuple[str, str, str]] = []
+            for link in issue_fields.get("issuelinks") or []:
+                for direction in (INWARD, OUTWARD):
+                    linked = link.get(f"{direction}Issue")
+                    if linked and _accepts_link(link, direction, wanted_types, directions):
+                        targets.append((linked["key"], (link.get("type") or {}).get("name"), direction))
+            if subtasks:
+                targets.extend((subtask["key"], SUBTASK, OUTWARD) for subtask in issue_fields.get("subtasks") or [])
+            subtask_keys = {target for target, relation, _ in targets if relation == SUBTASK}
+            targets.extend(
+                (child, CHILD, OUTWARD) for child in found_children.get(key, ()) if child not in subtask_keys
+            )
+            if parents and issue_fields.get("parent"):
+                targets.append((issue_fields["parent"]["key"], PARENT, INWARD))
+
+            seen_targets = set()
+            for target, relation, direction in targets:
+                if (target, relation, direction) in seen_targets:
+                    continue
+                seen_targets.add((target, relation, direction))
+                edges.append((target, relation, direction))
+                if target in graph.depth:
+                    continue
+                if max_issues is not None and len(graph.depth) >= max_issues:
+                    graph.truncated = True
+                    continue
+                graph.depth[target] = depth + 1
+                queue.append(target)
+        log.debug("Expanded %d issues at depth %d, %d queued", len(frontier), depth, len(queue))
+
+    if keep_issues:
+        graph.issues = {key: fetched[key] for key in graph.depth if key in fetched}
+    return graph
+
+
+def _fetch_issues(client: Any, keys: List[str], fields: List[str], max_workers: int) -> List[dict]:
+    if not keys:
+        return []
+
+    def fetch(chunk: List[str]) -> List[dict]:
+        if hasattr(client, "bulk_fetch_issues"):
+            response = client.bulk_fetch_issues(data={"issueIdsOrKeys": chunk, "fields": fields})
+            return (response or {}).get("issues", [])
+        response, _ = client.bulk_issue(chunk, fields=fields)
+        return (response or {}).get("issues", [])
+
+    issues: List[dict] = []
+    for _, future in map_concurrently(fetch, chunked(keys, JIRA_BULK_FETCH_LIMIT), max_workers=max_workers):
+        issues.extend(future.result())
+    return issues
+
+
+def _search_children(
+    client: Any, keys: List[str], children_jql: str, fields: List[str], max_workers: int
+) -> List[dict]:
+    if not keys:
+        return []
+
+    def search(chunk: List[str]) -> List[dict]:
+        jql = children_jql.format(keys=", ".join(chunk))
+        if hasattr(client, "iter_enhanced_jql"):
+            return list(client.iter_enhanced_jql(jql, fields=fields))
+        return list(client.iter_jql(jql, fields=fields, prefetch=False))
+
+    issues: List[dict] = []
+    for _, future in map_concurrently(search, chunked(keys, JIRA_BULK_FETCH_LIMIT), max_workers=max_workers):
+        issues.extend(future.result())
+    return issues
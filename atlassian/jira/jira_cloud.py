@@ -5,13 +5,37 @@ These clients are deliberately additive. ``Jira`` and ``ServiceDesk`` remain
 the compatibility clients for Server, Data Center, and existing Cloud users.
 """
 
-from typing import Any, Dict, List, Optional, Union
-
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from ..bulk import (
+    JIRA_BULK_FETCH_LIMIT,
+    JIRA_ID_SEARCH_LIMIT,
+    JIRA_ISSUE_BULK_LIMIT,
+    JIRA_SOFTWARE_ENTITY_LIMIT,
+    BulkReport,
+    BulkWriter,
+    post_issue_bulk,
+    split_builds_response,
+    split_issue_bulk_response,
+)
+from ..concurrency import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    chunked,
+    iter_cursor_pages,
+    iter_prefetched,
+    map_concurrently,
+)
+from ..request_utils import get_default_logger
 from ..rest_client import AtlassianRestAPI
 from .core_methods import JiraCloudCoreMethods
+from .metadata import MetadataRegistry
 from .service_management_methods import JiraServiceManagementMethods
 from .software_methods import JiraSoftwareMethods
 
+log = get_default_logger(__name__)
+
 
 class JiraCloud(JiraCloudCoreMethods, AtlassianRestAPI):
     """Jira Cloud platform (Core) REST API client for version 2 or 3.
@@ -22,6 +46,7 @@ class JiraCloud(JiraCloudCoreMethods, AtlassianRestAPI):
     """
 
     SUPPORTED_API_VERSIONS = (2, 3)
+    _metadata: Optional[MetadataRegistry] = None
 
     def __init__(self, url: str, *args: Any, api_version: Union[str, int] = 3, **kwargs: Any):
         api_version = int(api_version)
@@ -31,6 +56,13 @@ class JiraCloud(JiraCloudCoreMethods, AtlassianRestAPI):
         kwargs["cloud"] = True
         super(JiraCloud, self).__init__(url, *args, **kwargs)
 
+    @property
+    def metadata(self) -> MetadataRegistry:
+        """Fields, statuses, priorities, resolutions and issue types, loaded on first use and cached."""
+        if self._metadata is None:
+            self._metadata = MetadataRegistry(self)
+        return self._metadata
+
     def endpoint(self, resource: str, api_version: Optional[Union[str, int]] = None) -> str:
         """Return a Core REST endpoint path without issuing a request."""
         version = self.api_version if api_version is None else int(api_version)
@@ -68,12 +100,21 @@ class JiraCloud(JiraCloudCoreMethods, AtlassianRestAPI):
         fields: Union[str, List[str]] = "*all",
         limit: Optional[int] = None,
         expand: Optional[str] = None,
+        hydrate: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
     ) -> list:
         """Return all cursor-paginated enhanced JQL issues up to ``limit``.
 
         When ``limit`` is omitted, iteration continues until Jira marks the
-        result set as final.
+        result set as final. ``hydrate=True`` uses the two-phase search of
+        :meth:`iter_enhanced_jql`.
         """
+        if hydrate:
+            return list(
+                self.iter_enhanced_jql(
+                    jql, fields=fields, expand=expand, limit=limit, hydrate=True, max_workers=max_workers
+                )
+            )
         results = []
         next_page_token = None
         while True:
@@ -94,6 +135,90 @@ class JiraCloud(JiraCloudCoreMethods, AtlassianRestAPI):
                 break
         return results
 
+    def iter_enhanced_jql(
+        self,
+        jql: str,
+        fields: Union[str, List[str]] = "*all",
+        expand: Optional[str] = None,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+        hydrate: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> Iterator[dict]:
+        """Yield enhanced JQL issues lazily, requesting the next cursor page in the background.
+
+        With ``hydrate=True`` the search runs in two overlapping phases. A
+        background thread follows the cursor asking only for issue IDs, which
+        allows pages of up to 5000 issues, while ``max_workers`` threads load
+        ``fields`` and ``expand`` for every batch of 100 IDs through
+        ``issue/bulkfetch``. The total time is then bounded by the hydration
+        pool rather than by the sequential cursor chain. Issues are yielded in
+        search order; issues deleted or hidden between the two phases are
+        skipped.
+        """
+        if not hydrate:
+            pages = iter_prefetched(self._iter_enhanced_jql_pages(jql, fields, expand, page_size, rate_limiter))
+            yield from islice(chain.from_iterable(pages), limit)
+            return
+
+        id_pages = self._iter_enhanced_jql_pages(jql, "id", None, page_size or JIRA_ID_SEARCH_LIMIT, rate_limiter)
+        ids = (issue["id"] for issue in islice(chain.from_iterable(iter_prefetched(id_pages, depth=2)), limit))
+        field_list = fields.split(",") if isinstance(fields, str) else list(fields)
+
+        def hydrate_chunk(chunk: List[str]) -> List[dict]:
+            data: Dict[str, Any] = {"issueIdsOrKeys": chunk, "fields": field_list}
+            if expand is not None:
+                data["expand"] = expand.split(",")
+            response = self.bulk_fetch_issues(data=data) or {}
+            if response.get("issueErrors"):
+                log.debug("Skipped %d issues missing from bulkfetch", len(response["issueErrors"]))
+            found = {str(issue.get("id")): issue for issue in response.get("issues", [])}
+            return [found[issue_id] for issue_id in chunk if issue_id in found]
+
+        for _, future in map_concurrently(
+            hydrate_chunk,
+            chunked(ids, JIRA_BULK_FETCH_LIMIT),
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+        ):
+            yield from future.result()
+
+    def _iter_enhanced_jql_pages(
+        self,
+        jql: str,
+        fields: Union[str, List[str]],
+        expand: Optional[str],
+        page_size: Optional[int],
+        rate_limiter: Optional[RateLimiter],
+    ) -> Iterator[List[dict]]:
+        return iter_cursor_pages(
+            lambda token: self.enhanced_jql(jql, fields=fields, nextPageToken=token, limit=page_size, expand=expand),
+            rate_limiter=rate_limiter,
+        )
+
+    def bulk_create_issues(
+        self,
+        issues: Iterable[dict],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> BulkReport:
+        """Create any number of issues through ``issue/bulk``, 50 per request.
+
+        Chunks are sent concurrently and the returned
+        :class:`atlassian.bulk.BulkReport` pairs every payload with the
+        created issue or with the error Jira reported for it.
+        """
+        writer = BulkWriter(
+            lambda chunk: post_issue_bulk(self, self.endpoint("issue/bulk"), chunk),
+            JIRA_ISSUE_BULK_LIMIT,
+            split=split_issue_bulk_response,
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+            retry_status_codes=self.retry_status_codes,
+        )
+        return writer.write(issues)
+
     def get_project_workflow_scheme_associations(self, project_ids):
         """Return workflow-scheme associations for one or more project IDs.
 
@@ -191,6 +316,39 @@ class JiraSoftware(JiraSoftwareMethods, AtlassianRestAPI):
         version = api_version or self.API_VERSIONS[api]
         return self.resource_url(resource, api_root=f"rest/{api}", api_version=version)
 
+    def bulk_submit_builds(
+        self,
+        builds: Iterable[dict],
+        properties: Optional[dict] = None,
+        provider_metadata: Optional[dict] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> BulkReport:
+        """Submit any number of builds, 100 per request.
+
+        Builds rejected by Jira are reported per build in the returned
+        :class:`atlassian.bulk.BulkReport`; ``properties`` and
+        ``provider_metadata`` are sent with every chunk.
+        """
+
+        def send(chunk):
+            data: Dict[str, Any] = {"builds": chunk}
+            if properties is not None:
+                data["properties"] = properties
+            if provider_metadata is not None:
+                data["providerMetadata"] = provider_metadata
+            return self.submit_builds(data=data)
+
+        writer = BulkWriter(
+            send,
+            JIRA_SOFTWARE_ENTITY_LIMIT,
+            split=split_builds_response,
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+            retry_status_codes=self.retry_status_codes,
+        )
+        return writer.write(builds)
+
 
 class JiraServiceManagement(JiraServiceManagementMethods, AtlassianRestAPI):
     """Jira Service Management Cloud public REST API client.
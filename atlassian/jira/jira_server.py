@@ -5,7 +5,7 @@ import os
 import re
 import zipfile
 from json import dumps
-from typing import Any, BinaryIO, Dict, List, Optional, Union, cast
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Union, cast
 from warnings import warn
 
 from deprecated import deprecated
@@ -16,9 +16,24 @@ if sys.version_info >= (3, 8):
     from typing import Literal  # Python 3.8+
 else:
     from typing_extensions import Literal  # Python <=3.7
+from ..bulk import (
+    JIRA_ISSUE_BULK_LIMIT,
+    JIRA_WORKLOG_LIST_LIMIT,
+    BulkReport,
+    BulkWriter,
+    post_issue_bulk,
+    split_issue_bulk_response,
+    split_worklog_list_response,
+)
+from ..concurrency import DEFAULT_MAX_WORKERS, RateLimiter, iter_cursor_pages, iter_prefetched, map_concurrently
 from ..errors import ApiNotFoundError, ApiPermissionError
 from ..rest_client import AtlassianRestAPI
 from ..typehints import T_id, T_resp_json, copy_type
+from .attachments import AttachmentArchiver
+from .cache import IssueCache
+from .counting import count_jql
+from .metadata import MetadataRegistry
+from .transitions import TransitionCache
 
 log = logging.getLogger(__name__)
 
@@ -29,6 +44,12 @@ class Jira(AtlassianRestAPI):
     Reference: https://docs.atlassian.com/software/jira/docs/api/REST/8.5.0/#api/2
     """
 
+    # Optional ``atlassian.jira.cache.IssueCache`` consulted by ``issue``/``get_issue``,
+    # filled by ``iter_jql`` and invalidated by every write to an ``issue/<key>`` path.
+    issue_cache: Optional[IssueCache] = None
+    _metadata: Optional[MetadataRegistry] = None
+    _transition_cache: Optional[TransitionCache] = None
+
     @copy_type(AtlassianRestAPI.__init__)
     def __init__(self, url: str, *args: Any, **kwargs: Any):
         if "api_version" not in kwargs:
@@ -36,6 +57,36 @@ class Jira(AtlassianRestAPI):
 
         super(Jira, self).__init__(url, *args, **kwargs)
 
+    @copy_type(AtlassianRestAPI.request)
+    def request(self, method: str = "GET", path: str = "/", *args: Any, **kwargs: Any):
+        try:
+            return super(Jira, self).request(method, path, *args, **kwargs)
+        finally:
+            if self.issue_cache is not None and method != "GET":
+                self.issue_cache.invalidate_path(path)
+
+    @property
+    def metadata(self) -> MetadataRegistry:
+        """
+        Fields, statuses, priorities, resolutions and issue types of this instance,
+        loaded on first use and cached, see ``atlassian.jira.metadata.MetadataRegistry``
+        :return: MetadataRegistry
+        """
+        if self._metadata is None:
+            self._metadata = MetadataRegistry(self)
+        return self._metadata
+
+    @property
+    def transition_cache(self) -> TransitionCache:
+        """
+        Transitions per project, issue type and status used by ``set_issue_status``
+        and ``set_issue_status_by_transition_name``, see ``atlassian.jira.transitions.TransitionCache``
+        :return: TransitionCache
+        """
+        if self._transition_cache is None:
+            self._transition_cache = TransitionCache()
+        return self._transition_cache
+
     def _get_paged(
         self,
         url: str,
@@ -414,17 +465,21 @@ class Jira(AtlassianRestAPI):
         path: Optional[str] = None,
         overwrite: bool = False,
         compression: int = zipfile.ZIP_STORED,
+        max_workers: int = DEFAULT_MAX_WORKERS,
     ) -> Optional[str]:
         """
         Downloads all attachments from a Jira issue by downloading individual files and creating zip file.
         This method is useful when total attachment size is too large for Jira server to compress as single file.
         If total attachment size is small enough, using `download_issue_attachments()` may be more efficient.
+        Attachments are downloaded concurrently and streamed into the zip file; use
+        ``atlassian.jira.attachments.AttachmentArchiver`` for many issues or a JQL query.
         :param issue: The issue-key of the Jira issue
         :param path: Path to directory where attachments will be saved. If None, current working directory will be used.
         :param overwrite: If True, always download and create new zip file.
                           If False (default), download will be skipped when zip file already exists in path.
         :param compression: Compression method for zipfile. Should be one of the constants listed in documentation page.
                             https://docs.python.org/3/library/zipfile.html#zipfile.ZipFile
+        :param max_workers: Number of concurrent downloads.
         :return: File path of the zip file if file is existing or download is successful. None if attachment does not exist.
         """
         try:
@@ -441,16 +496,14 @@ class Jira(AtlassianRestAPI):
             if not attachments_metadata:
                 return None
 
-            with zipfile.ZipFile(file_path, "w", compression=compression) as file:
-                for meta in attachments_metadata:
-                    # stream download should not be used, as writestr expects full content with filename.
-                    content = self.get(
-                        meta["content"],
-                        not_json_response=True,
-                        absolute=True,
-                        headers={"Accept": "*/*"},
-                    )
-                    file.writestr(meta["filename"], content)
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+            archiver = AttachmentArchiver(
+                self, file_path, max_workers=max_workers, compression=compression, name_template="{filename}"
+            )
+            report = archiver.archive([issue_data])
+            if report.errors:
+                raise report.errors[0].error
 
             return file_path
 
@@ -1425,12 +1478,20 @@ class Jira(AtlassianRestAPI):
         Returns:
             Decoded Jira REST response.
         """
+        cache = self.issue_cache if not expand and not self.advanced_mode else None
+        if cache is not None:
+            cached = cache.get(key, fields)
+            if cached is not None:
+                return cached
         base_url = self.resource_url("issue")
         url = f"{base_url}/{key}?fields={fields}"
         params: dict = {}
         if expand:
             params["expand"] = expand
-        return self.get(url, params=params)
+        response = self.get(url, params=params)
+        if cache is not None and isinstance(response, dict):
+            cache.put(response, fields)
+        return response
 
     def get_issue(
         self,
@@ -1442,7 +1503,9 @@ class Jira(AtlassianRestAPI):
     ):
         """
         Returns a full representation of the issue for the given issue key
-        By default, all fields are returned in this get-issue resource
+        By default, all fields are returned in this get-issue resource.
+        With an ``issue_cache`` the cached copy is returned when it holds the requested fields
+        and neither properties nor expand are requested; cache hits do not update the view history.
 
         :param issue_id_or_key: str
         :param fields: str
@@ -1464,7 +1527,15 @@ class Jira(AtlassianRestAPI):
         if expand:
             params["expand"] = expand
         params["updateHistory"] = str(update_history).lower()
-        return self.get(url, params=params)
+        cache = self.issue_cache if properties is None and not expand and not self.advanced_mode else None
+        if cache is not None:
+            cached = cache.get(issue_id_or_key, fields)
+            if cached is not None:
+                return cached
+        response = self.get(url, params=params)
+        if cache is not None and isinstance(response, dict):
+            cache.put(response, fields)
+        return response
 
     def epic_issues(self, epic: str, fields: Union[str, list] = "*all", expand: Optional[str] = None):
         """
@@ -1492,6 +1563,7 @@ class Jira(AtlassianRestAPI):
         start: int = 0,
         limit: Optional[int] = None,
         fetch_all: bool = True,
+        validate_query: Optional[str] = None,
     ):
         """Return issues matching the supplied issue keys.
 
@@ -1505,6 +1577,8 @@ class Jira(AtlassianRestAPI):
         :param start: First Server/Data Center result offset.
         :param limit: Requested page size; Jira may apply a lower system limit.
         :param fetch_all: Whether to collect all available result pages.
+        :param validate_query: OPTIONAL: Server/Data Center JQL validation; ``"warn"``
+            reports keys that do not exist in ``warningMessages`` instead of failing with 400.
         :return: A tuple of the Jira search response and issue keys reported
             as invalid by Jira.
         """
@@ -1515,12 +1589,13 @@ class Jira(AtlassianRestAPI):
             if re.match(jira_issue_regex, key):
                 matched_issue_keys.append(key)
         jql = f"key in ({', '.join(dict.fromkeys(matched_issue_keys))})"
+        validation = {} if validate_query is None else {"validate_query": validate_query}
         if self.cloud:
             if start:
                 raise ValueError("Jira Cloud does not support offset pagination; use enhanced_jql instead.")
             query_result = self.enhanced_jql(jql, fields=fields, limit=limit)
         else:
-            query_result = self.jql(jql, fields=fields, start=start, limit=limit)
+            query_result = self.jql(jql, fields=fields, start=start, limit=limit, **validation)
 
         if query_result and "errorMessages" in list(query_result.keys()):
             for message in query_result["errorMessages"]:
@@ -1530,7 +1605,12 @@ class Jira(AtlassianRestAPI):
             remaining_issues = [key for key in issue_list if key not in missing_issues]
             if remaining_issues != issue_list:
                 query_result, nested_missing_issues = self.bulk_issue(
-                    remaining_issues, fields, start=start, limit=limit, fetch_all=fetch_all
+                    remaining_issues,
+                    fields,
+                    start=start,
+                    limit=limit,
+                    fetch_all=fetch_all,
+                    validate_query=validate_query,
                 )
                 missing_issues.extend(nested_missing_issues)
             return query_result, missing_issues
@@ -1549,7 +1629,7 @@ class Jira(AtlassianRestAPI):
             next_start = start + len(issues)
             total = query_result.get("total")
             while issues and (total is None or next_start < total):
-                page = self.jql(jql, fields=fields, start=next_start, limit=limit)
+                page = self.jql(jql, fields=fields, start=next_start, limit=limit, **validation)
                 if not page:
                     break
                 page_issues = page.get("issues", [])
@@ -1661,6 +1741,7 @@ class Jira(AtlassianRestAPI):
         fields_by: Optional[str] = None,
         next_page_token: Optional[str] = None,
         max_results: Optional[int] = None,
+        field_ids: Optional[List[str]] = None,
     ) -> T_resp_json:
         """
         Returns changelogs for multiple issues in bulk.
@@ -1673,7 +1754,9 @@ class Jira(AtlassianRestAPI):
                           Valid values: "id", "name".
         :param next_page_token: OPTIONAL: Token for the next page of results (pagination).
         :param max_results: OPTIONAL: Maximum number of results to return.
+        :param field_ids: OPTIONAL: Only return changelog entries of these fields (at most 10).
         :return: Paginated list of changelogs for the given issues.
+        See ``atlassian.jira.changelogs.iter_field_changes`` for any number of issues.
         """
         if not self.cloud:
             raise ValueError("``get_changelogs_bulk`` method is only available for Jira Cloud platform")
@@ -1687,6 +1770,8 @@ class Jira(AtlassianRestAPI):
             data["nextPageToken"] = next_page_token
         if max_results is not None:
             data["maxResults"] = int(max_results)
+        if field_ids:
+            data["fieldIds"] = list(field_ids)
         return self.post(url, data=data)
 
     def issue_add_json_worklog(self, key: str, worklog: Union[dict, str]):
@@ -1880,20 +1965,22 @@ class Jira(AtlassianRestAPI):
         labels = [{"remove": label} for label in labels]
         return self.update_issue(issue_key, {"update": {"labels": labels}})
 
-    def add_attachment(self, issue_key: str, filename: str):
+    def add_attachment(self, issue_key: str, filename: str, progress_callback: Optional[Callable] = None):
         """
         Add attachment to Issue
         :param issue_key: str
         :param filename: str, name, if file in current directory or full path to file
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` called during the upload
         """
         with open(filename, "rb") as attachment:
-            return self.add_attachment_object(issue_key, attachment)
+            return self.add_attachment_object(issue_key, attachment, progress_callback=progress_callback)
 
-    def add_attachment_object(self, issue_key: str, attachment: BinaryIO):
+    def add_attachment_object(self, issue_key: str, attachment: BinaryIO, progress_callback: Optional[Callable] = None):
         """
         Add attachment to Issue
         :param issue_key: str
-        :param attachment: IO Object
+        :param attachment: IO Object, streamed to Jira without being read into memory
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` called during the upload
         """
         log.info("Adding attachment:  %s", attachment)
         base_url = self.resource_url("issue")
@@ -1903,7 +1990,7 @@ class Jira(AtlassianRestAPI):
         else:
             log.error("Empty attachment")
             return None
-        return self.post(url, headers=self.no_check_headers, files=files)
+        return self.post(url, headers=self.no_check_headers, files=files, progress_callback=progress_callback)
 
     def issue_exists(self, issue_key: str) -> Optional[bool]:
         """Perform the Jira issue exists operation.
@@ -1914,18 +2001,15 @@ class Jira(AtlassianRestAPI):
         Returns:
             Decoded Jira REST response.
         """
-        original_value = self.advanced_mode
-        self.advanced_mode = True
-        try:
-            resp = cast("Response", self.issue(issue_key, fields="*none"))
-            if resp.status_code == 404:
-                log.info('Issue "%s" does not exists', issue_key)
-                return False
-            resp.raise_for_status()
-            log.info('Issue "%s" exists', issue_key)
-            return True
-        finally:
-            self.advanced_mode = original_value
+        # advanced_mode per request: flipping the client-wide flag is not thread safe
+        url = self.resource_url("issue")
+        resp = self.get(f"{url}/{issue_key}", params={"fields": "*none"}, advanced_mode=True)
+        if resp.status_code == 404:
+            log.info('Issue "%s" does not exists', issue_key)
+            return False
+        resp.raise_for_status()
+        log.info('Issue "%s" exists', issue_key)
+        return True
 
     def issue_deleted(self, issue_key: str) -> bool:
         """Perform the Jira issue deleted operation.
@@ -2139,6 +2223,31 @@ class Jira(AtlassianRestAPI):
         data = {"issueUpdates": list_of_issues_data}
         return self.post(url, data=data)
 
+    def bulk_create_issues(
+        self,
+        issues: Iterable[dict],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> BulkReport:
+        """
+        Create any number of issues through ``issue/bulk``, 50 issues per request.
+        Chunks are sent concurrently; a failing issue does not fail the rest of its chunk.
+        :param issues: iterable of issue payloads, as accepted by ``create_issues``
+        :param max_workers: number of chunks sent at the same time
+        :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing the requests
+        :return: ``atlassian.bulk.BulkReport`` pairing each payload with its created issue or error
+        """
+        url = self.resource_url("issue/bulk")
+        writer = BulkWriter(
+            lambda chunk: post_issue_bulk(self, url, chunk),
+            JIRA_ISSUE_BULK_LIMIT,
+            split=split_issue_bulk_response,
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+            retry_status_codes=self.retry_status_codes,
+        )
+        return writer.write(issues)
+
     # @todo refactor and merge with create_issue method
     def issue_create(self, fields: dict):
         """Perform the Jira issue create operation.
@@ -2156,6 +2265,9 @@ class Jira(AtlassianRestAPI):
     def issue_create_or_update(self, fields: dict):
         """Perform the Jira issue create or update operation.
 
+        For many records use ``atlassian.jira.upsert.upsert_issues``, which resolves
+        a whole batch with one search and skips updates that would change nothing.
+
         Args:
             See the method signature for API request parameters.
 
@@ -2169,10 +2281,6 @@ class Jira(AtlassianRestAPI):
             fields.pop("issuekey", None)
             return self.issue_create(fields)
 
-        if self.issue_deleted(issue_key):
-            log.warning('Issue "%s" deleted, skipping', issue_key)
-            return None
-
         log.info('Issue "%s" exists, will update', issue_key)
         fields.pop("issuekey", None)
         return self.issue_update(issue_key, fields)
@@ -2242,6 +2350,7 @@ class Jira(AtlassianRestAPI):
     def scrap_regex_from_issue(self, issue: str, regex: str):
         """
         This function scrapes the output of the given regex matches from the issue's description and comments.
+        To scan all issues of a JQL query, see ``atlassian.jira.scanning.ContentScanner``.
 
         Parameters:
         issue (str): jira issue ide.
@@ -2254,18 +2363,14 @@ class Jira(AtlassianRestAPI):
         issue_output = self.get_issue(issue, fields="description,comment")
         description = issue_output["fields"]["description"]
         comments = issue_output["fields"]["comment"]["comments"]
+        pattern = re.compile(regex)
 
         try:
             if description is not None:
-                description_matches = [x.group(0) for x in re.finditer(regex, description)]
-                if description_matches:
-                    regex_output.extend(description_matches)
+                regex_output.extend(x.group(0) for x in pattern.finditer(description))
 
-                for comment in comments:
-                    comment_html = comment["body"]
-                    comment_matches = [x.group(0) for x in re.finditer(regex, comment_html)]
-                    if comment_matches:
-                        regex_output.extend(comment_matches)
+            for comment in comments:
+                regex_output.extend(x.group(0) for x in pattern.finditer(comment["body"]))
 
             return regex_output
         except HTTPError as e:
@@ -2313,6 +2418,9 @@ class Jira(AtlassianRestAPI):
         :param tree: list to store the tree structure for recursion. Do not change it.
         :param depth: current depth of the tree for recursion. Do not change it.
         :return: list of dictionaries containing the tree structure. Dictionary element contains a key (parent issue) and value (child issue).
+
+        This makes one request per issue; ``atlassian.jira.hierarchy.traverse_issues`` loads
+        a whole level of a large hierarchy per round trip.
         """
         if tree is None:
             tree = []
@@ -2471,7 +2579,12 @@ class Jira(AtlassianRestAPI):
         return self.set_issue_status(issue_key, status)
 
     def set_issue_status(
-        self, issue_key: str, status_name: str, fields: Union[str, dict, None] = None, update: Optional[dict] = None
+        self,
+        issue_key: str,
+        status_name: str,
+        fields: Union[str, dict, None] = None,
+        update: Optional[dict] = None,
+        issue: Optional[dict] = None,
     ):
         """
         Setting status by status_name. Field defaults to None for transitions without mandatory fields.
@@ -2481,20 +2594,32 @@ class Jira(AtlassianRestAPI):
         Example:
             jira.set_issue_status('MY-123','Resolved',{'myfield': 'myvalue'},
             {"comment": [{"add": { "body": "Issue Comments"}}]})
+        The transition is looked up in ``transition_cache``, so issues sharing
+        a workflow step and status only need the transition request.
         :param issue_key: str
         :param status_name: str
         :param fields: dict, optional
         :param update: dict, optional
+        :param issue: dict, optional: the issue with its project, issuetype and status fields,
+            e.g. a search result, so that its workflow step is known without a request
         """
         base_url = self.resource_url("issue")
         url = f"{base_url}/{issue_key}/transitions"
-        transition_id = self.get_transition_id_to_status_name(issue_key, status_name)
-        data: dict = {"transition": {"id": transition_id}}
-        if fields is not None:
-            data["fields"] = fields
-        if update is not None:
-            data["update"] = update
-        return self.post(url, data=data)
+
+        def post(transition: Optional[dict]):
+            data: dict = {"transition": {"id": str(transition["id"]) if transition else None}}
+            if fields is not None:
+                data["fields"] = fields
+            if update is not None:
+                data["update"] = update
+            return self.post(url, data=data)
+
+        if self.advanced_mode:
+            transition_id = self.get_transition_id_to_status_name(issue_key, status_name)
+            return post(None if transition_id is None else {"id": transition_id})
+        return self.transition_cache.transition(
+            self, issue_key, lambda transition: str(transition["to"]).lower() == status_name.lower(), post, issue
+        )
 
     def get_issue_status_changelog(self, issue_id: T_id):
         # Get the issue details with changelog
@@ -2536,7 +2661,10 @@ class Jira(AtlassianRestAPI):
         """
         base_url = self.resource_url("issue")
         url = f"{base_url}/{issue_key}/transitions"
-        return self.post(url, data={"transition": {"name": transition_name}})
+        response = self.post(url, data={"transition": {"name": transition_name}})
+        # The issue left the workflow step ``transition_cache`` may remember for it
+        self.transition_cache.invalidate(issue_key=issue_key)
+        return response
 
     def get_issue_status(self, issue_key: str):
         """Perform the Jira get issue status operation.
@@ -2682,6 +2810,31 @@ class Jira(AtlassianRestAPI):
         data = {"ids": ids}
         return self.post(url, params=params, data=data)
 
+    def bulk_get_worklogs(
+        self,
+        ids: Iterable[T_id],
+        expand: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> BulkReport:
+        """
+        Returns worklog details for any number of worklog IDs, 1000 IDs per request.
+        :param ids: iterable of worklog IDs
+        :param expand: OPTIONAL: passed to ``get_worklogs``
+        :param max_workers: number of requests sent at the same time
+        :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing the requests
+        :return: ``atlassian.bulk.BulkReport`` pairing each ID with its worklog
+        """
+        writer = BulkWriter(
+            lambda chunk: self.get_worklogs(chunk, expand=expand),
+            JIRA_WORKLOG_LIST_LIMIT,
+            split=split_worklog_list_response,
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+            retry_status_codes=self.retry_status_codes,
+        )
+        return writer.write(ids)
+
     """
     User
     Reference: https://docs.atlassian.com/software/jira/docs/api/REST/8.5.0/#api/2/user
@@ -3761,17 +3914,18 @@ class Jira(AtlassianRestAPI):
     def get_project_issues_count(self, project: str):
         """Perform the Jira get project issues count operation.
 
+        Counts without fetching issues, see ``atlassian.jira.counting.count_jql``.
+
         Args:
             See the method signature for API request parameters.
 
         Returns:
-            Decoded Jira REST response.
+            Number of issues in the project.
         """
         jql = f'project = "{project}" '
-        response = self.jql(jql, fields="*none")
         if self.advanced_mode:
-            return cast("Response", response)
-        return len(cast("dict", response)["issues"])
+            return cast("Response", self.jql(jql, fields="*none", limit=0))
+        return count_jql(self, jql)
 
     def get_all_project_issues(
         self, project: str, fields: Union[str, List[str]] = "*all", start: int = 0, limit: Optional[int] = None
@@ -4335,6 +4489,128 @@ class Jira(AtlassianRestAPI):
             start += len(issues)
         return results
 
+    def iter_jql(
+        self,
+        jql: str,
+        fields: Union[str, List[str]] = "*all",
+        expand: Optional[str] = None,
+        start: int = 0,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+        validate_query: Optional[str] = None,
+        prefetch: bool = True,
+        max_workers: int = 1,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> Iterator[dict]:
+        """
+        Iterate over every issue matching a JQL query without holding the whole result in memory.
+        Server/Data Center pages are walked with ``startAt``/``total``; on Jira Cloud the
+        ``nextPageToken`` cursor of ``search/jql`` is followed instead.
+        While the caller processes one page, the next one is already requested in the background.
+        With ``max_workers`` > 1 the remaining Server/Data Center pages are fetched in parallel
+        as soon as the first response reveals the total; issues are still yielded in result order
+        and only about ``2 * max_workers`` pages are held at a time.
+        :param jql: The JQL search string
+        :param fields: list of fields, for example: ['priority', 'summary', 'customfield_10007']
+        :param expand: OPTIONAL: expand the search result
+        :param start: OPTIONAL: index of the first issue to return (Server/Data Center only). Default: 0
+        :param limit: OPTIONAL: maximum number of issues to yield. Default: all matching issues
+        :param page_size: OPTIONAL: issues requested per page, capped by the server. Default: server default
+        :param validate_query: OPTIONAL: Whether to validate the JQL query (Server/Data Center only)
+        :param prefetch: request the next page while the current one is consumed. Default: True
+        :param max_workers: number of pages fetched in parallel (Server/Data Center only). Default: 1
+        :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing the page requests
+        :return: generator of issues
+        """
+        if self.cloud and start:
+            raise ValueError("``start`` is not supported by the Jira Cloud search cursor")
+        params: dict = {"jql": jql}
+        if fields is not None:
+            if isinstance(fields, (list, tuple, set)):
+                fields = ",".join(fields)
+            params["fields"] = fields
+        if expand is not None:
+            params["expand"] = expand
+        if page_size is not None:
+            params["maxResults"] = int(page_size)
+        if limit is not None and page_size is None:
+            params["maxResults"] = int(limit)
+
+        if self.cloud:
+            pages = self._iter_search_jql_pages(params, rate_limiter)
+        else:
+            if validate_query is not None:
+                params["validateQuery"] = validate_query
+            pages = self._iter_jql_pages(params, int(start), limit, max_workers, rate_limiter)
+        if prefetch and (self.cloud or max_workers <= 1):
+            pages = iter_prefetched(pages)
+
+        remaining = limit
+        for issues in pages:
+            if self.issue_cache is not None and not expand:
+                # Without ``fields`` the search returns the navigable fields only
+                self.issue_cache.put_many(issues, params.get("fields", "*navigable"))
+            for issue in issues:
+                if remaining is not None:
+                    if remaining <= 0:
+                        return
+                    remaining -= 1
+                yield issue
+            if remaining is not None and remaining <= 0:
+                return
+
+    def _iter_jql_pages(
+        self,
+        params: dict,
+        start: int,
+        limit: Optional[int],
+        max_workers: int,
+        rate_limiter: Optional[RateLimiter],
+    ) -> Iterator[List[dict]]:
+        url = self.resource_url("search")
+
+        def fetch(start_at: int) -> dict:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            return self.get(url, params=dict(params, startAt=start_at)) or {}
+
+        def end_of(response: dict) -> int:
+            total = int(response.get("total", 0))
+            return total if limit is None else min(total, start + limit)
+
+        response = fetch(start)
+        issues = response.get("issues", [])
+        if not issues:
+            return
+        yield issues
+        step = int(response.get("maxResults") or len(issues))
+        end = end_of(response)
+
+        if max_workers > 1:
+            # The total is known now, so every remaining page can be requested at once.
+            offsets = range(start + step, end, step)
+            for _, future in map_concurrently(fetch, offsets, max_workers=max_workers):
+                yield future.result().get("issues", [])
+            return
+
+        start_at = start + len(issues)
+        while start_at < end:
+            response = fetch(start_at)
+            issues = response.get("issues", [])
+            if not issues:
+                return
+            yield issues
+            start_at += len(issues)
+            end = end_of(response)
+
+    def _iter_search_jql_pages(self, params: dict, rate_limiter: Optional[RateLimiter]) -> Iterator[List[dict]]:
+        url = self.resource_url("search/jql", api_version=3)
+
+        def fetch_page(token: Optional[str]) -> T_resp_json:
+            return self.get(url, params=params if token is None else {**params, "nextPageToken": token})
+
+        return iter_cursor_pages(fetch_page, rate_limiter=rate_limiter)
+
     def enhanced_jql_get_list_of_tickets(
         self,
         jql: str,
@@ -4678,13 +4954,13 @@ api-group-workflows/#api-rest-api-2-workflow-search-get)
         url = f"rest/plugins/1.0/{plugin_key}-key/license"
         return self.get(url, headers=self.no_check_headers, trailing=True)
 
-    def upload_plugin(self, plugin_path: str) -> T_resp_json:
+    def upload_plugin(self, plugin_path: str, progress_callback: Optional[Callable] = None) -> T_resp_json:
         """
         Provide plugin path for upload into Jira e.g. useful for auto deploy
         :param plugin_path:
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` called during the upload
         :return:
         """
-        files = {"plugin": open(plugin_path, "rb")}
         upm_token = self.request(
             method="GET",
             path="rest/plugins/1.0/",
@@ -4692,7 +4968,10 @@ api-group-workflows/#api-rest-api-2-workflow-search-get)
             trailing=True,
         ).headers["upm-token"]
         url = f"rest/plugins/1.0/?token={upm_token}"
-        return self.post(url, files=files, headers=self.no_check_headers)
+        with open(plugin_path, "rb") as plugin:
+            return self.post(
+                url, files={"plugin": plugin}, headers=self.no_check_headers, progress_callback=progress_callback
+            )
 
     def delete_plugin(self, plugin_key: str) -> T_resp_json:
         """
@@ -0,0 +1,769 @@
+# coding=utf-8
+"""Client-side JQL evaluation.
+
+:func:`parse_jql` compiles the commonly used subset of JQL into a
+:class:`JqlQuery` that filters and sorts issue dicts as returned by the REST
+API (``Jira.iter_jql``, ``JiraCloud.iter_enhanced_jql`` or the
+:class:`atlassian.jira.cache.IssueCache`) without a request per check:
+
+* comparisons ``=``, ``!=``, ``>``, ``>=``, ``<``, ``<=``, ``~`` and ``!~``
+* ``IN``/``NOT IN`` lists, ``IS [NOT] EMPTY``/``NULL``
+* ``AND``/``OR``/``NOT`` and parentheses, ``ORDER BY``
+* relative dates (``-7d``, ``"-1w 2d"``), ``now()``, ``startOf*``/``endOf*``
+  and ``currentUser()`` resolved from a :class:`JqlContext`
+
+Other functions and history predicates (``WAS``, ``CHANGED``) are parsed but
+cannot be evaluated locally; :func:`match_issues` then falls back to the
+server ``jql/match`` endpoint. Text search (``~``) approximates Jira's index:
+all words of the term must occur, a trailing ``*`` matches a prefix.
+"""
+
+import calendar
+import datetime
+import functools
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..concurrency import chunked
+
+JQL_MATCH_LIMIT = 1000
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>!=|>=|<=|!~|=|~|>|<|!)
+      | (?P<punct>[(),])
+      | (?P<word>[^\s"'(),=!~<>]+)
+    )""",
+    re.VERBOSE,
+)
+_DURATION = re.compile(r"^([+-]?)\s*((?:\d+\s*[wdhm]\s*)+)$")
+_DURATION_PART = re.compile(r"(\d+)\s*([wdhm])")
+_INCREMENT = re.compile(r"^([+-]?\d+)([yMwdhm]?)$")
+_DATE_LITERAL = re.compile(r"^(\d{4})[/-](\d{1,2})[/-](\d{1,2})(?:\s+(\d{1,2}):(\d{2}))?$")
+_WORD = re.compile(r"\w+")
+_CUSTOM_FIELD = re.compile(r"^cf\[(\d+)\]$", re.IGNORECASE)
+
+# JQL field names that differ from the REST ``fields`` keys.
+FIELD_ALIASES = {
+    "type": "issuetype",
+    "component": "components",
+    "fixversion": "fixVersions",
+    "affectedversion": "versions",
+    "resolutiondate": "resolutiondate",
+    "resolved": "resolutiondate",
+    "due": "duedate",
+    "createddate": "created",
+    "updateddate": "updated",
+    "statuscategory": "status.statusCategory",
+    "issuekey": "key",
+    "timeoriginalestimate": "timeoriginalestimate",
+    "originalestimate": "timeoriginalestimate",
+    "remainingestimate": "timeestimate",
+    "timespent": "timespent",
+}
+TEXT_FIELDS = ("summary", "description", "environment", "comment")
+DATE_FUNCTIONS = ("startOfDay", "endOfDay", "startOfWeek", "endOfWeek", "startOfMonth", "endOfMonth")
+DATE_FUNCTIONS += ("startOfYear", "endOfYear")
+_VALUE_KEYS = ("key", "name", "value", "accountId", "id", "displayName", "emailAddress")
+_EMPTY = object()
+
+
+class JqlSyntaxError(ValueError):
+    """The JQL cannot be parsed."""
+
+
+class JqlUnsupportedError(ValueError):
+    """The JQL uses a construct that can only be evaluated by the server."""
+
+
+@dataclass
+class JqlContext:
+    """Values JQL functions depend on.
+
+    :param current_user: Account ID (Cloud) or user name (Server/Data Center)
+        returned by ``currentUser()``.
+    :param now: Reference time for relative dates; the current time by default.
+    :param timezone: Time zone of date literals and ``startOfDay()`` & co.
+    :param field_ids: Lower case custom field names mapped to their IDs,
+        e.g. ``{"story points": "customfield_10016"}``.
+    :param first_day_of_week: ``0`` for Monday, ``6`` for Sunday.
+    """
+
+    current_user: Optional[str] = None
+    now: Optional[datetime.datetime] = None
+    timezone: datetime.tzinfo = datetime.timezone.utc
+    field_ids: Dict[str, str] = field(default_factory=dict)
+    first_day_of_week: int = 0
+
+    def current_time(self) -> datetime.datetime:
+        now = self.now or datetime.datetime.now(self.timezone)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=self.timezone)
+        return now.astimezone(self.timezone)
+
+
+# Parsing
+
+
+@dataclass
+class Function:
+    name: str
+    args: List[str]
+
+
+@dataclass
+class Clause:
+    field: str
+    operator: str
+    value: Any
+
+    @property
+    def supported(self) -> bool:
+        values = self.value if isinstance(self.value, list) else [self.value]
+        return all(not isinstance(value, Function) or _function_supported(value) for value in values)
+
+
+@dataclass
+class Unsupported:
+    text: str
+    supported = False
+
+
+@dataclass
+class BoolOp:
+    operator: str
+    operands: List[Any]
+
+    @property
+    def supported(self) -> bool:
+        return all(operand.supported for operand in self.operands)
+
+
+def _function_supported(function: Function) -> bool:
+    return function.name.lower() in ("currentuser", "now") or function.name in DATE_FUNCTIONS
+
+
+def _tokenize(jql: str) -> List[Tuple[str, str, int]]:
+    tokens = []
+    position = 0
+    jql = jql.rstrip()
+    while position < len(jql):
+        match = _TOKEN.match(jql, position)
+        if match is None or match.end() == position:
+            raise JqlSyntaxError(f"Unexpected character at position {position}: {jql[position:position + 10]!r}")
+        kind = match.lastgroup or ""
+        text = match.group(kind)
+        if kind == "string":
+            text = re.sub(r"\\(.)", r"\1", text[1:-1])
+        tokens.append((kind, text, match.start(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser(object):
+    def __init__(self, jql: str):
+        self.jql = jql
+        self.tokens = _tokenize(jql)
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> Tuple[str, str, int]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else ("end", "", len(self.jql))
+
+    def keyword(self, *words: str) -> bool:
+        kind, text, _ = self.peek()
+        return kind == "word" and text.upper() in words
+
+    def take(self) -> Tuple[str, str, int]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def expect(self, kind: str, text: Optional[str] = None) -> str:
+        token_kind, token_text, at = self.take()
+        if token_kind != kind or (text is not None and token_text.upper() != text):
+            raise JqlSyntaxError(f"Expected {text or kind} at position {at} of {self.jql!r}")
+        return token_text
+
+    def parse(self) -> Tuple[Any, List[Tuple[str, bool]]]:
+        where = None
+        if self.peek()[0] != "end" and not self.keyword("ORDER"):
+            where = self.or_expression()
+        order_by = []
+        if self.keyword("ORDER"):
+            self.take()
+            self.expect("word", "BY")
+            while True:
+                name = self.field_name()
+                descending = False
+                if self.keyword("ASC", "DESC"):
+                    descending = self.take()[1].upper() == "DESC"
+                order_by.append((name, descending))
+                if self.peek()[:2] != ("punct", ","):
+                    break
+                self.take()
+        kind, text, at = self.peek()
+        if kind != "end":
+            raise JqlSyntaxError(f"Unexpected {text!r} at position {at} of {self.jql!r}")
+        return where, order_by
+
+    def or_expression(self) -> Any:
+        operands = [self.and_expression()]
+        while self.keyword("OR", "||"):
+            self.take()
+            operands.append(self.and_expression())
+        return operands[0] if len(operands) == 1 else BoolOp("OR", operands)
+
+    def and_expression(self) -> Any:
+        operands = [self.not_expression()]
+        while self.keyword("AND", "&&"):
+            self.take()
+            operands.append(self.not_expression())
+        return operands[0] if len(operands) == 1 else BoolOp("AND", operands)
+
+    def not_expression(self) -> Any:
+        if self.keyword("NOT") or self.peek()[:2] == ("op", "!"):
+            self.take()
+            return BoolOp("NOT", [self.not_expression()])
+        if self.peek()[:2] == ("punct", "("):
+            self.take()
+            expression = self.or_expression()
+            self.expect("punct")
+            return expression
+        return self.clause()
+
+    def field_name(self) -> str:
+        kind, text, at = self.take()
+        if kind not in ("word", "string"):
+            raise JqlSyntaxError(f"Expected a field name at position {at} of {self.jql!r}")
+        return text
+
+    def clause(self) -> Any:
+        start = self.peek()[2]
+        name = self.field_name()
+        kind, text, at = self.take()
+        operator = text.upper()
+        if kind == "op" and operator in ("=", "!=", ">", ">=", "<", "<=", "~", "!~"):
+            return Clause(name, operator, self.operand())
+        if operator == "IN":
+            return Clause(name, "IN", self.operand_list())
+        if operator == "NOT" and self.keyword("IN"):
+            self.take()
+            return Clause(name, "NOT IN", self.operand_list())
+        if operator == "IS":
+            negated = self.keyword("NOT")
+            if negated:
+                self.take()
+            if not self.keyword("EMPTY", "NULL"):
+                raise JqlSyntaxError(f"Expected EMPTY after IS at position {self.peek()[2]} of {self.jql!r}")
+            self.take()
+            return Clause(name, "IS NOT" if negated else "IS", _EMPTY)
+        if operator in ("WAS", "CHANGED"):
+            self.skip_history_predicates()
+            return Unsupported(self.jql[start : self.peek()[2]].strip())
+        raise JqlSyntaxError(f"Unknown operator {text!r} at position {at} of {self.jql!r}")
+
+    def skip_history_predicates(self) -> None:
+        depth = 0
+        while True:
+            kind, text, _ = self.peek()
+            if kind == "end" or (depth == 0 and (self.keyword("AND", "OR", "ORDER", "&&", "||") or text == ")")):
+                return
+            if text == "(":
+                depth += 1
+            elif text == ")":
+                depth -= 1
+            self.take()
+
+    def operand(self) -> Any:
+        kind, text, at = self.take()
+        if kind == "string":
+            return text
+        if kind != "word":
+            raise JqlSyntaxError(f"Expected a value at position {at} of {self.jql!r}")
+        if text.upper() in ("EMPTY", "NULL"):
+            return _EMPTY
+        if self.peek()[:2] == ("punct", "("):
+            self.take()
+            args = []
+            while self.peek()[:2] != ("punct", ")"):
+                kind, arg, at = self.take()
+                if kind not in ("word", "string"):
+                    raise JqlSyntaxError(f"Expected a function argument at position {at} of {self.jql!r}")
+                args.append(arg)
+                if self.peek()[:2] == ("punct", ","):
+                    self.take()
+            self.take()
+            return Function(text, args)
+        return text
+
+    def operand_list(self) -> Any:
+        if self.peek()[:2] != ("punct", "("):
+            value = self.operand()
+            if isinstance(value, Function):
+                return value
+            raise JqlSyntaxError(f"Expected a list after IN in {self.jql!r}")
+        self.take()
+        values = [self.operand()]
+        while self.peek()[:2] == ("punct", ","):
+            self.take()
+            values.append(self.operand())
+        self.expect("punct")
+        return values
+
+
+# Evaluation
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _plain_text(value: Any) -> str:
+    """Flatten strings, Atlassian Document Format and comment containers into text."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return " ".join(_plain_text(item) for item in value)
+    if isinstance(value, dict):
+        parts = [value["text"]] if isinstance(value.get("text"), str) else []
+        for key in ("content", "comments", "body"):
+            if key in value:
+                parts.append(_plain_text(value[key]))
+        return " ".join(parts)
+    return str(value)
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _candidates(value: Any) -> List[str]:
+    """Return the lower case strings a JQL literal may be compared with."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value.lower()] if value else []
+    if isinstance(value, list):
+        return [candidate for item in value for candidate in _candidates(item)]
+    if isinstance(value, dict):
+        candidates = []
+        for key in _VALUE_KEYS:
+            item = value.get(key)
+            if item is not None:
+                candidates.append(item.lower() if isinstance(item, str) else str(_scalar(item)).lower())
+        return candidates
+    return [str(_scalar(value)).lower()]
+
+
+def _has_candidate(value: Any, names: frozenset) -> bool:
+    """Short-circuiting ``not names.isdisjoint(_candidates(value))``."""
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return value.lower() in names
+    if isinstance(value, list):
+        return any(_has_candidate(item, names) for item in value)
+    if isinstance(value, dict):
+        for key in _VALUE_KEYS:
+            item = value.get(key)
+            if item is not None and (item.lower() if isinstance(item, str) else str(_scalar(item)).lower()) in names:
+                return True
+        return False
+    return str(_scalar(value)).lower() in names
+
+
+def _parse_datetime(value: Any, timezone: datetime.tzinfo) -> Optional[datetime.datetime]:
+    if isinstance(value, datetime.datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone)
+    if not isinstance(value, str):
+        return None
+    match = _DATE_LITERAL.match(value.strip())
+    if match:
+        year, month, day, hour, minute = (int(part) if part else 0 for part in match.groups())
+        return datetime.datetime(year, month, day, hour, minute, tzinfo=timezone)
+    try:
+        parsed = datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        try:
+            parsed = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone)
+
+
+def _add_months(moment: datetime.datetime, months: int) -> datetime.datetime:
+    month_index = moment.month - 1 + months
+    year, month = moment.year + month_index // 12, month_index % 12 + 1
+    return moment.replace(year=year, month=month, day=min(moment.day, calendar.monthrange(year, month)[1]))
+
+
+def _shift(moment: datetime.datetime, amount: int, unit: str) -> datetime.datetime:
+    if unit == "y":
+        return _add_months(moment, 12 * amount)
+    if unit == "M":
+        return _add_months(moment, amount)
+    seconds = {"w": 604800, "d": 86400, "h": 3600, "m": 60}[unit]
+    return moment + datetime.timedelta(seconds=seconds * amount)
+
+
+def _relative(value: str, context: JqlContext) -> Optional[datetime.datetime]:
+    match = _DURATION.match(value.strip())
+    if not match:
+        return None
+    sign = -1 if match.group(1) == "-" else 1
+    moment = context.current_time()
+    for amount, unit in _DURATION_PART.findall(match.group(2)):
+        moment = _shift(moment, sign * int(amount), unit)
+    return moment
+
+
+def _date_function(function: Function, context: JqlContext) -> datetime.datetime:
+    name = function.name
+    period = name[5:] if name.startswith("start") else name[3:]
+    now = context.current_time()
+    unit = {"OfDay": "d", "OfWeek": "w", "OfMonth": "M", "OfYear": "y"}[period]
+    if function.args:
+        match = _INCREMENT.match(function.args[0].replace(" ", ""))
+        if not match:
+            raise JqlUnsupportedError(f"Cannot evaluate {name}({function.args[0]}) locally")
+        now = _shift(now, int(match.group(1)), match.group(2) or unit)
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "OfWeek":
+        start -= datetime.timedelta(days=(start.weekday() - context.first_day_of_week) % 7)
+        end = start + datetime.timedelta(days=7)
+    elif period == "OfMonth":
+        start = start.replace(day=1)
+        end = _add_months(start, 1)
+    elif period == "OfYear":
+        start = start.replace(month=1, day=1)
+        end = start.replace(year=start.year + 1)
+    else:
+        end = start + datetime.timedelta(days=1)
+    if name.startswith("start"):
+        return start
+    return end - datetime.timedelta(milliseconds=1)
+
+
+def _resolve(value: Any, context: JqlContext) -> Any:
+    if isinstance(value, Function):
+        lower = value.name.lower()
+        if lower == "currentuser":
+            if context.current_user is None:
+                raise JqlUnsupportedError("currentUser() needs JqlContext.current_user")
+            return context.current_user
+        if lower == "now":
+            return context.current_time()
+        if value.name in DATE_FUNCTIONS:
+            return _date_function(value, context)
+        raise JqlUnsupportedError(f"Cannot evaluate {value.name}() locally")
+    return value
+
+
+def _as_date(value: Any, context: JqlContext) -> Optional[datetime.datetime]:
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, str):
+        return _relative(value, context) or _parse_datetime(value, context.timezone)
+    return None
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _key_order(key: str) -> Tuple[str, int]:
+    project, _, number = key.rpartition("-")
+    return project.upper(), int(number) if number.isdigit() else 0
+
+
+def _field_path(name: str, context: JqlContext) -> str:
+    lower = name.lower()
+    custom = _CUSTOM_FIELD.match(name)
+    if custom:
+        return f"customfield_{custom.group(1)}"
+    if lower in context.field_ids:
+        return context.field_ids[lower]
+    return FIELD_ALIASES.get(lower, name)
+
+
+def _getter(name: str, context: JqlContext) -> Callable[[dict], Any]:
+    path = _field_path(name, context)
+    if path in ("key", "id"):
+        return lambda issue: issue.get(path)
+    if path == "project":
+        return lambda issue: (issue.get("fields") or {}).get("project") or issue.get("key", "").rpartition("-")[0]
+    if path == "text":
+        return lambda issue: " ".join(
+            _plain_text((issue.get("fields") or {}).get(text_field)) for text_field in TEXT_FIELDS
+        )
+    if "." not in path:
+        return lambda issue: (issue.get("fields") or {}).get(path)
+    parts = path.split(".")
+
+    def nested(issue: dict) -> Any:
+        value: Any = issue.get("fields")
+        for part in parts:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+
+    return nested
+
+
+def field_value(issue: dict, name: str, context: Optional[JqlContext] = None) -> Any:
+    """Return the value JQL field ``name`` refers to in a REST issue dict."""
+    return _getter(name, context or JqlContext())(issue)
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_timestamp(value: str, timezone: datetime.tzinfo) -> Optional[datetime.datetime]:
+    return _parse_datetime(value, timezone)
+
+
+def _compare(actual: Any, operator: str, expected: Any, path: str, context: JqlContext) -> bool:
+    if operator in ("~", "!~"):
+        found = _text_contains(_plain_text(actual), str(expected))
+        return found if operator == "~" else not found and not _is_empty(actual)
+    if operator in ("=", "!="):
+        if isinstance(expected, datetime.datetime):
+            equal = isinstance(actual, str) and _parse_timestamp(actual, context.timezone) == expected
+        else:
+            equal = str(_scalar(expected)).lower() in _candidates(actual)
+        return equal if operator == "=" else not equal and not _is_empty(actual)
+    if _is_empty(actual):
+        return False
+    if path == "key":
+        left: Any = _key_order(str(actual))
+        right: Any = _key_order(str(expected))
+    else:
+        left, right = _as_number(actual), _as_number(expected)
+        if left is None or right is None:
+            left = _parse_timestamp(actual, context.timezone) if isinstance(actual, str) else None
+            right = _as_date(expected, context)
+        if left is None or right is None:
+            raise JqlUnsupportedError(f"Cannot compare {path} {operator} {expected!r} locally")
+    return {">": left > right, ">=": left >= right, "<": left < right, "<=": left <= right}[operator]
+
+
+def _text_contains(text: str, term: str) -> bool:
+    text = text.lower()
+    term = term.strip().lower()
+    if term.startswith('"') and term.endswith('"') and len(term) > 1:
+        return term[1:-1] in text
+    words = set(_WORD.findall(text))
+    for word in re.findall(r"\w+\*?", term):
+        if word.endswith("*"):
+            if not any(candidate.startswith(word[:-1]) for candidate in words):
+                return False
+        elif word not in words:
+            return False
+    return True
+
+
+def _literal(value: Any, context: JqlContext) -> Any:
+    """Resolve functions and turn relative or absolute date literals into datetimes."""
+    value = _resolve(value, context)
+    if isinstance(value, str) and (_DURATION.match(value.strip()) or _DATE_LITERAL.match(value.strip())):
+        return _as_date(value, context)
+    return value
+
+
+def _compile(node: Any, context: JqlContext) -> Callable[[dict], bool]:
+    """Turn a parsed expression into a predicate; literals and functions are resolved once."""
+    if isinstance(node, BoolOp):
+        predicates = [_compile(operand, context) for operand in node.operands]
+        if node.operator == "NOT":
+            negated = predicates[0]
+            return lambda issue: not negated(issue)
+        if node.operator == "AND":
+            return lambda issue: all(predicate(issue) for predicate in predicates)
+        return lambda issue: any(predicate(issue) for predicate in predicates)
+    if isinstance(node, Unsupported):
+        raise JqlUnsupportedError(f"Cannot evaluate {node.text!r} locally")
+
+    get = _getter(node.field, context)
+    path = _field_path(node.field, context)
+    operator = node.operator
+    if operator in ("IS", "IS NOT"):
+        wanted = operator == "IS"
+        return lambda issue: _is_empty(get(issue)) is wanted
+    if operator in ("IN", "NOT IN"):
+        if isinstance(node.value, Function):
+            raise JqlUnsupportedError(f"Cannot evaluate {node.value.name}() locally")
+        values = [_literal(value, context) for value in node.value]
+        with_empty = any(value is _EMPTY for value in values)
+        names = frozenset(
+            str(_scalar(v)).lower() for v in values if v is not _EMPTY and not isinstance(v, datetime.datetime)
+        )
+        dates = [value for value in values if isinstance(value, datetime.datetime)]
+
+        def contained(actual: Any) -> bool:
+            if _is_empty(actual):
+                return with_empty
+            if names and _has_candidate(actual, names):
+                return True
+            return any(_compare(actual, "=", value, path, context) for value in dates)
+
+        if operator == "IN":
+            return lambda issue: contained(get(issue))
+        return lambda issue: not contained(get(issue)) and (with_empty or not _is_empty(get(issue)))
+
+    expected = _literal(node.value, context)
+    if expected is _EMPTY:
+        wanted = operator == "="
+        return lambda issue: _is_empty(get(issue)) is wanted
+    if operator in ("=", "!=") and not isinstance(expected, datetime.datetime):
+        name = frozenset([str(_scalar(expected)).lower()])
+        if operator == "=":
+            return lambda issue: _has_candidate(get(issue), name)
+        return lambda issue: not _is_empty(get(issue)) and not _has_candidate(get(issue), name)
+    return lambda issue: _compare(get(issue), operator, expected, path, context)
+
+
+def _sort_key(value: Any, context: JqlContext) -> Any:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = next((value[key] for key in ("name", "value", "displayName", "key") if value.get(key)), None)
+    if _is_empty(value):
+        return None
+    number = _as_number(value)
+    if number is not None:
+        return (0, number)
+    date = _parse_timestamp(value, context.timezone) if isinstance(value, str) else None
+    if date is not None:
+        return (1, date.timestamp())
+    return (2, str(value).lower())
+
+
+class JqlQuery(object):
+    """Compiled JQL; create it with :func:`parse_jql`."""
+
+    def __init__(self, jql: str, where: Any, order_by: List[Tuple[str, bool]]):
+        self.jql = jql
+        self.where = where
+        self.order_by = order_by
+        self._compiled: Optional[Tuple[JqlContext, Callable[[dict], bool]]] = None
+
+    def predicate(self, context: Optional[JqlContext] = None) -> Callable[[dict], bool]:
+        """Return a function testing one issue; relative dates are fixed when it is created.
+
+        :raises JqlUnsupportedError: the query needs the server
+        """
+        context = context or JqlContext()
+        if self._compiled is None or self._compiled[0] is not context:
+            predicate = (lambda issue: True) if self.where is None else _compile(self.where, context)
+            self._compiled = (context, predicate)
+        return self._compiled[1]
+
+    def __repr__(self) -> str:
+        return f"JqlQuery({self.jql!r})"
+
+    @property
+    def supported(self) -> bool:
+        """False when the query contains constructs only the server can evaluate."""
+        return self.where is None or self.where.supported
+
+    def matches(self, issue: dict, context: Optional[JqlContext] = None) -> bool:
+        """Return whether ``issue`` satisfies the query.
+
+        :raises JqlUnsupportedError: the query needs the server
+        """
+        return self.predicate(context)(issue)
+
+    def sort(self, issues: Iterable[dict], context: Optional[JqlContext] = None) -> List[dict]:
+        """Return ``issues`` in ``ORDER BY`` order; issues without a value come last."""
+        context = context or JqlContext()
+        ordered = list(issues)
+        for name, descending in reversed(self.order_by):
+            path = _field_path(name, context)
+            if path == "key":
+                keys: Dict[int, Any] = {id(issue): _key_order(issue.get("key", "")) for issue in ordered}
+            else:
+                get = _getter(name, context)
+                keys = {id(issue): _sort_key(get(issue), context) for issue in ordered}
+            present = [issue for issue in ordered if keys[id(issue)] is not None]
+            missing = [issue for issue in ordered if keys[id(issue)] is None]
+            present.sort(key=lambda issue: keys[id(issue)], reverse=descending)
+            ordered = present + missing
+        return ordered
+
+    def filter(self, issues: Iterable[dict], context: Optional[JqlContext] = None) -> List[dict]:
+        """Return the matching ``issues`` in ``ORDER BY`` order."""
+        context = context or JqlContext()
+        predicate = self.predicate(context)
+        return self.sort(filter(predicate, issues), context)
+
+
+def parse_jql(jql: str) -> JqlQuery:
+    """Compile ``jql``.
+
+    :raises JqlSyntaxError: the query is malformed
+    """
+    where, order_by = _Parser(jql).parse()
+    return JqlQuery(jql, where, order_by)
+
+
+def _server_matches(client: Any, jql: str, issues: List[dict]) -> set:
+    matched: set = set()
+    for batch in chunked([int(issue["id"]) for issue in issues], JQL_MATCH_LIMIT):
+        if hasattr(client, "match_jql"):
+            response = client.match_jql(batch, [jql])
+        else:
+            response = client.match_issues(data={"issueIds": batch, "jqls": [jql]})
+        response = response or {}
+        # Cloud answers with ``matches``; the method documentation of older clients shows ``results``.
+        for result in response.get("matches", response.get("results", [])):
+            for found in result.get("matchedIssues", []):
+                matched.add(str(found))
+    return matched
+
+
+def match_issues(
+    jql: Union[str, JqlQuery],
+    issues: Iterable[dict],
+    context: Optional[JqlContext] = None,
+    client: Any = None,
+    on_fallback: Optional[Callable[[str], None]] = None,
+) -> List[dict]:
+    """Return the ``issues`` matching ``jql``, evaluated locally whenever possible.
+
+    :param jql: JQL string or a :class:`JqlQuery` from :func:`parse_jql`.
+    :param issues: Issue dicts with ``id``, ``key`` and the fields the query uses.
+    :param context: OPTIONAL: :class:`JqlContext` for ``currentUser()`` and dates.
+    :param client: OPTIONAL: ``Jira`` (Cloud) or ``JiraCloud`` client; when the
+        query cannot be evaluated locally the issues are checked with the
+        ``jql/match`` endpoint, 1000 IDs per request.
+    :param on_fallback: OPTIONAL: called with the reason when the server is used.
+    :return: matching issues in ``ORDER BY`` order
+    :raises JqlUnsupportedError: local evaluation is impossible and no ``client`` was given
+    """
+    query = jql if isinstance(jql, JqlQuery) else parse_jql(jql)
+    context = context or JqlContext()
+    issues = list(issues)
+    try:
+        if not query.supported:
+            raise JqlUnsupportedError(f"{query.jql!r} uses functions or history searches")
+        return query.filter(issues, context)
+    except JqlUnsupportedError as error:
+        if client is None:
+            raise
+        if on_fallback is not None:
+            on_fallback(str(error))
+    matched = _server_matches(client, query.jql, issues)
+    return query.sort((issue for issue in issues if str(issue["id"]) in matched), context)
@@ -0,0 +1,217 @@
+# coding=utf-8
+"""Per-client cache of Jira schema metadata.
+
+:class:`MetadataRegistry` loads fields, statuses, priorities, resolutions and
+issue types once, plus create metadata per project and issue type on first
+use, and indexes them so that name to ID lookups are dictionary reads. Each
+category expires after ``ttl`` seconds and can be refreshed on demand. Every
+``Jira`` and ``JiraCloud`` client owns one registry as ``client.metadata``,
+which the ``atlassian.models.jira`` builders accept to resolve fields by their
+display name.
+"""
+
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+DEFAULT_TTL = 3600.0
+CATEGORIES = ("fields", "statuses", "priorities", "resolutions", "issuetypes")
+# Method loading each category on the legacy Jira client and on JiraCloud
+LOADERS = {
+    "fields": ("get_all_fields", "get_fields"),
+    "statuses": ("get_all_statuses", "get_statuses"),
+    "priorities": ("get_all_priorities", "get_priorities"),
+    "resolutions": ("get_all_resolutions", "get_resolutions"),
+    "issuetypes": ("get_issue_types", "get_issue_all_types"),
+}
+CUSTOM_FIELD_CLAUSE = re.compile(r"cf\[(\d+)\]", re.IGNORECASE)
+
+
+class _Index(object):
+    """Loaded entries of one category, indexed by ID and by lower-case name."""
+
+    def __init__(self, entries: Iterable[dict], loaded_at: float):
+        self.loaded_at = loaded_at
+        self.by_id: Dict[str, dict] = {}
+        self.by_name: Dict[str, List[dict]] = {}
+        for entry in entries:
+            self.by_id[str(entry.get("fieldId") or entry.get("id") or entry.get("key"))] = entry
+            if entry.get("name"):
+                self.by_name.setdefault(entry["name"].lower(), []).append(entry)
+
+
+class MetadataRegistry(object):
+    """Lazily loaded, TTL refreshed Jira metadata with O(1) name and ID lookups.
+
+    Lookups accept a name (case-insensitive) or an ID and raise ``KeyError``
+    for unknown values. ``field_id`` raises ``ValueError`` for a display name
+    shared by several fields; pass the ID or a ``cf[10001]`` clause instead.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param ttl: Seconds a loaded category stays valid; ``None`` keeps it until refreshed.
+    :param clock: Monotonic time source, replaceable for tests.
+    """
+
+    def __init__(self, client: Any, ttl: Optional[float] = DEFAULT_TTL, clock: Callable[[], float] = time.monotonic):
+        self.client = client
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._indexes: Dict[Any, _Index] = {}
+
+    def refresh(self, *categories: str) -> None:
+        """Forget the given categories, or everything, so they are loaded again on next use.
+
+        Besides :data:`CATEGORIES` a project key refreshes that project's create metadata.
+        """
+        with self._lock:
+            if not categories:
+                self._indexes.clear()
+                return
+            for key in list(self._indexes):
+                name = key[0] if isinstance(key, tuple) else key
+                project = key[1] if isinstance(key, tuple) else None
+                if name in categories or project in categories:
+                    del self._indexes[key]
+
+    # Fields
+
+    def fields(self) -> List[dict]:
+        """Return every field, system and custom."""
+        return list(self._index("fields").by_id.values())
+
+    def field(self, name_or_id: str) -> dict:
+        """Return the field with this ID, display name or ``cf[...]`` clause name."""
+        return self._index("fields").by_id[self.field_id(name_or_id)]
+
+    def field_id(self, name_or_id: str) -> str:
+        """Return the ID of the field with this ID, display name or ``cf[...]`` clause name."""
+        index = self._index("fields")
+        if name_or_id in index.by_id:
+            return name_or_id
+        clause = CUSTOM_FIELD_CLAUSE.fullmatch(name_or_id.strip())
+        if clause and f"customfield_{clause.group(1)}" in index.by_id:
+            return f"customfield_{clause.group(1)}"
+        matches = index.by_name.get(name_or_id.lower())
+        if not matches:
+            raise KeyError(name_or_id)
+        if len(matches) > 1:
+            ids = ", ".join(str(match["id"]) for match in matches)
+            raise ValueError(f"Field name {name_or_id!r} is ambiguous, use one of the IDs {ids}")
+        return str(matches[0]["id"])
+
+    def field_name(self, field_id: str) -> str:
+        """Return the display name of a field ID."""
+        return self._index("fields").by_id[field_id]["name"]
+
+    # Statuses, priorities, resolutions
+
+    def status(self, name_or_id: str) -> dict:
+        """Return the status with this name or ID."""
+        return self._lookup("statuses", name_or_id)
+
+    def status_id(self, name: str) -> str:
+        """Return the ID of a status."""
+        return str(self.status(name)["id"])
+
+    def status_category(self, name_or_id: str) -> str:
+        """Return the status category key of a status: ``new``, ``indeterminate`` or ``done``."""
+        return (self.status(name_or_id).get("statusCategory") or {}).get("key", "")
+
+    def priority_id(self, name: str) -> str:
+        """Return the ID of a priority."""
+        return str(self._lookup("priorities", name)["id"])
+
+    def resolution_id(self, name: str) -> str:
+        """Return the ID of a resolution."""
+        return str(self._lookup("resolutions", name)["id"])
+
+    # Issue types and create metadata
+
+    def issue_type_id(self, name: str, project: Optional[str] = None) -> str:
+        """Return the ID of an issue type, globally or as available in ``project``.
+
+        Without a project, types of company-managed projects win over
+        team-managed types of the same name.
+        """
+        if project is not None:
+            return str(self._lookup(("createmeta", project), name)["id"])
+        index = self._index("issuetypes")
+        if name in index.by_id:
+            return name
+        matches = index.by_name.get(name.lower())
+        if not matches:
+            raise KeyError(name)
+        shared = [match for match in matches if not match.get("scope")]
+        return str((shared or matches)[0]["id"])
+
+    def create_fields(self, project: str, issue_type: str) -> Dict[str, dict]:
+        """Return the create-screen field metadata by field ID for a project and issue type name or ID."""
+        issue_type_id = self.issue_type_id(issue_type, project)
+        return self._index(("createfields", project, issue_type_id)).by_id
+
+    # Loading
+
+    def _lookup(self, key: Any, name_or_id: str) -> dict:
+        index = self._index(key)
+        entry = index.by_id.get(str(name_or_id))
+        if entry is None:
+            matches = index.by_name.get(str(name_or_id).lower())
+            if not matches:
+                raise KeyError(name_or_id)
+            entry = matches[0]
+        return entry
+
+    def _index(self, key: Any) -> _Index:
+        index = self._indexes.get(key)
+        if index is not None and (self.ttl is None or self.clock() - index.loaded_at < self.ttl):
+            return index
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None or (self.ttl is not None and self.clock() - index.loaded_at >= self.ttl):
+                index = _Index(self._load(key), self.clock())
+                self._indexes[key] = index
+                log.debug("Loaded %d %s entries", len(index.by_id), key)
+            return index
+
+    def _load(self, key: Any) -> List[dict]:
+        cloud = hasattr(self.client, "bulk_fetch_issues")
+        if isinstance(key, tuple) and key[0] == "createmeta":
+            return self._pages(
+                lambda start: (
+                    self.client.get_create_issue_meta_issue_types(key[1], start_at=start)
+                    if cloud
+                    else self.client.issue_createmeta_issuetypes(key[1], start=start)
+                ),
+                ("issueTypes", "values"),
+            )
+        if isinstance(key, tuple):
+            _, project, issue_type_id = key
+            return self._pages(
+                lambda start: (
+                    self.client.get_create_issue_meta_issue_type_id(project, issue_type_id, start_at=start)
+                    if cloud
+                    else self.client.issue_createmeta_fieldtypes(project, issue_type_id, start=start)
+                ),
+                ("fields", "values", "results"),
+            )
+        response = getattr(self.client, LOADERS[key][1 if cloud else 0])()
+        if isinstance(response, dict):
+            return response.get("values") or []
+        return list(response or [])
+
+    @staticmethod
+    def _pages(fetch: Callable[[int], Any], keys: Tuple[str, ...]) -> List[dict]:
+        entries: List[dict] = []
+        while True:
+            response = fetch(len(entries)) or {}
+            page = next((response[key] for key in keys if key in response), [])
+            entries.extend(page)
+            total = response.get("total")
+            if not page or response.get("isLast", True if total is None else len(entries) >= total):
+                return entries
@@ -0,0 +1,280 @@
+# coding=utf-8
+"""Regular expression scans over the text of many issues.
+
+:class:`ContentScanner` streams the issues of a JQL query with only their
+``description`` and ``comment`` fields, plus the metadata of their
+attachments when text attachments are scanned too. Comments beyond those
+embedded in the search results and the attachment bodies are fetched
+concurrently per issue. The patterns are compiled once and matched in
+batches of texts rather than one text at a time. For expensive patterns such
+as secret or PII detectors, where the matching dominates the run time, it can
+run in a pool of worker processes that each receive the compiled patterns
+once. The workers are started with ``spawn``, which imports the calling
+script again in each of them: a script using them must keep its own work under
+``if __name__ == "__main__":``.
+"""
+
+import io
+import multiprocessing
+import re
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Tuple, Union
+
+from ..concurrency import DEFAULT_MAX_WORKERS, RateLimiter, map_concurrently
+from ..request_utils import get_default_logger
+from .attachments import download_attachment
+
+log = get_default_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 1024 * 1024
+DEFAULT_MAX_ATTACHMENT_SIZE = 1024 * 1024
+COMMENT_PAGE_SIZE = 100
+TEXT_MIME_TYPES = ("text/", "application/json", "application/xml", "application/x-yaml", "application/yaml")
+
+# (issue key, location, text)
+Document = Tuple[str, str, str]
+Patterns = Union[str, Pattern, Iterable[Union[str, Pattern]], Dict[str, Union[str, Pattern]]]
+
+
+class ScanHit(NamedTuple):
+    """One match of a pattern.
+
+    ``location`` is ``description``, ``comment/<id>`` or ``attachment/<id>/<filename>``;
+    ``pattern`` is the name given to the pattern, or its source.
+    """
+
+    issue: str
+    location: str
+    pattern: str
+    match: str
+
+
+@dataclass
+class ScanReport:
+    """Counters of the last :meth:`ContentScanner.scan`."""
+
+    issues: int = 0
+    documents: int = 0
+    characters: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Scanned characters per second."""
+        return self.characters / self.seconds if self.seconds else 0.0
+
+
+class ContentScanner(object):
+    """Find pattern matches in the descriptions, comments and text attachments of issues.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param patterns: A pattern, a list of patterns, or a dict naming the patterns;
+        strings are compiled with ``flags``.
+    :param flags: ``re`` flags for patterns given as strings.
+    :param attachments: Also scan attachments with a text MIME type of at most ``max_attachment_size`` bytes.
+    :param max_attachment_size: Size of the largest attachment scanned.
+    :param processes: Number of worker processes matching the patterns, e.g. ``os.cpu_count()``;
+        the calling script must then guard its own work with ``if __name__ == "__main__":``.
+        Default: 0, matching in the calling process, which is also faster for cheap patterns.
+    :param batch_size: Characters of text sent to a worker process at a time.
+    :param max_workers: Number of concurrent requests for further comments and attachments.
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing all requests.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        patterns: Patterns,
+        flags: int = 0,
+        attachments: bool = False,
+        max_attachment_size: int = DEFAULT_MAX_ATTACHMENT_SIZE,
+        processes: int = 0,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.client = client
+        self.patterns = compile_patterns(patterns, flags)
+        self.attachments = attachments
+        self.max_attachment_size = max_attachment_size
+        self.processes = processes
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.report = ScanReport()
+
+    def scan(self, jql: str) -> Iterator[ScanHit]:
+        """Yield the matches in the issues of ``jql``, in search order.
+
+        Counters of the run are kept in :attr:`report`.
+        """
+        self.report = ScanReport()
+        started = time.monotonic()
+        batches = self._batches(self._documents(jql))
+        if self.processes:
+            results = self._scan_in_pool(batches)
+        else:
+            results = (scan_documents(self.patterns, batch) for batch in batches)
+        for hits in results:
+            self.report.hits += len(hits)
+            for hit in hits:
+                yield ScanHit(*hit)
+        self.report.seconds = time.monotonic() - started
+        log.info(
+            "Scanned %d documents of %d issues, %.1f MB/s, %d hits",
+            self.report.documents,
+            self.report.issues,
+            self.report.throughput / 1024 / 1024,
+            self.report.hits,
+        )
+
+    def _scan_in_pool(self, batches: Iterator[List[Document]]) -> Iterator[List[tuple]]:
+        # "spawn" keeps the workers clear of the locks held by the request threads at fork time
+        pool = ProcessPoolExecutor(
+            self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.patterns,),
+        )
+        pending: Deque[Future] = deque()
+        try:
+            for batch in batches:
+                pending.append(pool.submit(_scan_batch, batch))
+                if len(pending) >= self.processes * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _batches(self, documents: Iterator[Document]) -> Iterator[List[Document]]:
+        batch: List[Document] = []
+        size = 0
+        for document in documents:
+            batch.append(document)
+            size += len(document[2])
+            if size >= self.batch_size:
+                yield batch
+                batch, size = [], 0
+        if batch:
+            yield batch
+
+    def _documents(self, jql: str) -> Iterator[Document]:
+        fields = ["description", "comment"] + (["attachment"] if self.attachments else [])
+        if hasattr(self.client, "iter_enhanced_jql"):
+            issues = self.client.iter_enhanced_jql(jql, fields=fields, rate_limiter=self.rate_limiter)
+        else:
+            issues = self.client.iter_jql(jql, fields=fields, rate_limiter=self.rate_limiter)
+        # Most issues need no further request, so the rate limiter paces the requests themselves
+        for _, future in map_concurrently(self._issue_documents, issues, max_workers=self.max_workers):
+            documents = future.result()
+            self.report.issues += 1
+            for document in documents:
+                self.report.documents += 1
+                self.report.characters += len(document[2])
+                yield document
+
+    def _issue_documents(self, issue: dict) -> List[Document]:
+        """Collect the texts of one issue, fetching the comments and attachments missing from the search result."""
+        key = issue["key"]
+        fields = issue.get("fields") or {}
+        documents: List[Document] = []
+        description = plain_text(fields.get("description"))
+        if description:
+            documents.append((key, "description", description))
+        comment = fields.get("comment") or {}
+        comments = list(comment.get("comments") or ())
+        if int(comment.get("total") or 0) > len(comments):
+            comments = self._all_comments(key)
+        for item in comments:
+            body = plain_text(item.get("body"))
+            if body:
+                documents.append((key, f"comment/{item.get('id')}", body))
+        attachments = (fields.get("attachment") or []) if self.attachments else []
+        for meta in attachments:
+            if _is_text(meta) and int(meta.get("size") or 0) <= self.max_attachment_size:
+                documents.append((key, f"attachment/{meta['id']}/{meta['filename']}", self._download(meta)))
+        return documents
+
+    def _url(self, resource: str) -> str:
+        if hasattr(self.client, "bulk_fetch_issues"):
+            return self.client.endpoint(resource)
+        return self.client.resource_url(resource)
+
+    def _all_comments(self, key: str) -> List[dict]:
+        comments: List[dict] = []
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response = self.client.get(
+                self._url(f"issue/{key}/comment"), params={"startAt": len(comments), "maxResults": COMMENT_PAGE_SIZE}
+            )
+            page = (response or {}).get("comments") or []
+            comments.extend(page)
+            if not page or len(comments) >= int((response or {}).get("total") or 0):
+                return comments
+
+    def _download(self, meta: dict) -> str:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        content = io.BytesIO()
+        download_attachment(self.client, meta, content)
+        return content.getvalue().decode("utf-8", errors="replace")
+
+
+def compile_patterns(patterns: Patterns, flags: int = 0) -> Dict[str, Pattern]:
+    """Compile patterns into a dict by name; unnamed patterns are named by their source."""
+    if isinstance(patterns, (str, re.Pattern)):
+        patterns = [patterns]
+    if not isinstance(patterns, dict):
+        patterns = {getattr(pattern, "pattern", pattern): pattern for pattern in patterns}
+    if not patterns:
+        raise ValueError("At least one pattern is required")
+    return {
+        str(name): pattern if isinstance(pattern, re.Pattern) else re.compile(pattern, flags)
+        for name, pattern in patterns.items()
+    }
+
+
+def scan_documents(patterns: Dict[str, Pattern], documents: Iterable[Document]) -> List[tuple]:
+    """Return ``(issue, location, pattern name, match)`` for every match of every pattern in the documents."""
+    hits = []
+    for issue, location, text in documents:
+        for name, pattern in patterns.items():
+            for match in pattern.finditer(text):
+                hits.append((issue, location, name, match.group(0)))
+    return hits
+
+
+def plain_text(value: Any) -> str:
+    """Return the text of a wiki markup string or of an Atlassian Document Format node."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        if value.get("type") == "text":
+            return value.get("text") or ""
+        parts = [plain_text(node) for node in value.get("content") or ()]
+        separator = "" if value.get("type") in ("paragraph", "heading") else "\n"
+        return separator.join(part for part in parts if part)
+    return str(value)
+
+
+def _is_text(meta: dict) -> bool:
+    return str(meta.get("mimeType") or "").lower().startswith(TEXT_MIME_TYPES)
+
+
+_WORKER_PATTERNS: Dict[str, Pattern] = {}
+
+
+def _init_worker(patterns: Dict[str, Pattern]) -> None:
+    _WORKER_PATTERNS.update(patterns)
+
+
+def _scan_batch(documents: List[Document]) -> List[tuple]:
+    return scan_documents(_WORKER_PATTERNS, documents)
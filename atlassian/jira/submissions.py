@@ -0,0 +1,362 @@
+# coding=utf-8
+"""Buffered submission of Jira Software development entities.
+
+The builds, deployments, feature flags, vulnerabilities and development
+information APIs of Jira Software Cloud accept up to 100 entities per
+request, while CI systems usually report them one event at a time.
+:class:`SubmissionQueue` buffers the entities per API and sends them from a
+background thread once a buffer holds a full batch or its oldest entity has
+waited ``max_delay`` seconds. An entity submitted again before it is sent
+replaces the buffered one unless that has a newer ``updateSequenceNumber``,
+which Jira would keep anyway; repositories of development information are
+merged commit by commit, branch by branch and pull request by pull request.
+Throttled and failing requests are retried with backoff, honouring
+``Retry-After``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from ..bulk import JIRA_SOFTWARE_ENTITY_LIMIT, RETRIABLE_STATUS_CODES, BulkItemError, is_retriable_error
+from ..concurrency import RateLimiter
+from ..request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+DEFAULT_MAX_DELAY = 5.0
+DEFAULT_MAX_PENDING = 10000
+DEVINFO_ENTITIES = ("commits", "branches", "pullRequests")
+
+
+def _text(*values: Any) -> Tuple[str, ...]:
+    return tuple(str(value) for value in values)
+
+
+class EntityType(NamedTuple):
+    """How the entities of one Jira Software API are sent and identified.
+
+    ``rejected`` maps a response to the errors of the entities Jira rejected, by entity key.
+    """
+
+    method: str
+    payload: str
+    key: Callable[[dict], Tuple[str, ...]]
+    rejected: Callable[[dict], Dict[Tuple[str, ...], Any]]
+
+
+def _rejected_builds(response: dict) -> Dict[Tuple[str, ...], Any]:
+    return {
+        _text(rejection["key"].get("pipelineId"), rejection["key"].get("buildNumber")): rejection.get("errors")
+        for rejection in response.get("rejectedBuilds") or ()
+    }
+
+
+def _rejected_deployments(response: dict) -> Dict[Tuple[str, ...], Any]:
+    rejected = {}
+    for rejection in response.get("rejectedDeployments") or ():
+        key = rejection["key"]
+        key = _text(key.get("pipelineId"), key.get("environmentId"), key.get("deploymentSequenceNumber"))
+        rejected[key] = rejection.get("errors")
+    return rejected
+
+
+def _rejected_feature_flags(response: dict) -> Dict[Tuple[str, ...], Any]:
+    return {
+        _text(failure.get("featureFlagId")): failure.get("errors")
+        for failure in response.get("failedFeatureFlags") or ()
+    }
+
+
+def _rejected_vulnerabilities(response: dict) -> Dict[Tuple[str, ...], Any]:
+    # ``failedVulnerabilities`` maps the vulnerability ID to its errors
+    return {_text(key): errors for key, errors in (response.get("failedVulnerabilities") or {}).items()}
+
+
+def _rejected_repositories(response: dict) -> Dict[Tuple[str, ...], Any]:
+    # ``failedDevinfoEntities`` maps the repository ID to the errors of the repository and of its
+    # commits, branches and pull requests; a repository is reported as a whole
+    return {_text(key): failure for key, failure in (response.get("failedDevinfoEntities") or {}).items()}
+
+
+ENTITY_TYPES: Dict[str, EntityType] = {
+    "builds": EntityType(
+        "submit_builds", "builds", lambda build: _text(build["pipelineId"], build["buildNumber"]), _rejected_builds
+    ),
+    "deployments": EntityType(
+        "submit_deployments",
+        "deployments",
+        lambda deployment: _text(
+            deployment["pipeline"]["id"], deployment["environment"]["id"], deployment["deploymentSequenceNumber"]
+        ),
+        _rejected_deployments,
+    ),
+    "feature_flags": EntityType(
+        "submit_feature_flags", "flags", lambda flag: _text(flag["id"]), _rejected_feature_flags
+    ),
+    "vulnerabilities": EntityType(
+        "submit_vulnerabilities",
+        "vulnerabilities",
+        lambda vulnerability: _text(vulnerability["id"]),
+        _rejected_vulnerabilities,
+    ),
+    "devinfo": EntityType(
+        "store_development_information",
+        "repositories",
+        lambda repository: _text(repository["id"]),
+        _rejected_repositories,
+    ),
+}
+
+
+@dataclass
+class SubmissionReport:
+    """Running totals of a :class:`SubmissionQueue`.
+
+    ``deduplicated`` counts entities replaced by, or dropped in favour of, a
+    newer version while buffered. ``errors`` holds the entities Jira rejected
+    and those still failing after the retries; retriable ones may be added again.
+    """
+
+    submitted: int = 0
+    requests: int = 0
+    retries: int = 0
+    deduplicated: int = 0
+    errors: List[BulkItemError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class SubmissionQueue(object):
+    """Accumulate Jira Software entities and submit them in batches from a background thread.
+
+    Use it as a context manager, or call :meth:`close` before exiting, so that
+    the buffered entities are sent::
+
+        with SubmissionQueue(software, provider_metadata={"product": "CI"}) as queue:
+            queue.add("builds", build)
+
+    :param client: ``JiraSoftware`` client.
+    :param max_batch: Entities per request, at most 100.
+    :param max_delay: Seconds an entity waits for its batch to fill before it is sent.
+    :param max_pending: Buffered entities at which :meth:`add` blocks until a batch is sent.
+    :param properties: OPTIONAL: ``properties`` sent with every request.
+    :param provider_metadata: OPTIONAL: ``providerMetadata`` sent with every request.
+    :param retries: Attempts after a throttled or failed request before its entities are reported as errors.
+    :param backoff: Seconds before the first retry without ``Retry-After``; doubled for every further retry.
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing all requests.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_batch: int = JIRA_SOFTWARE_ENTITY_LIMIT,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        properties: Optional[dict] = None,
+        provider_metadata: Optional[dict] = None,
+        retries: int = 3,
+        backoff: float = 1.0,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        if not 1 <= max_batch <= JIRA_SOFTWARE_ENTITY_LIMIT:
+            raise ValueError(f"max_batch must be between 1 and {JIRA_SOFTWARE_ENTITY_LIMIT}")
+        self.client = client
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max(max_pending, max_batch)
+        self.properties = properties
+        self.provider_metadata = provider_metadata
+        self.retries = retries
+        self.backoff = backoff
+        self.rate_limiter = rate_limiter
+        self.report = SubmissionReport()
+        self._condition = threading.Condition()
+        self._send_lock = threading.Lock()
+        # entity type -> entity key -> (entity, time it was first buffered)
+        self._buffers: Dict[str, "OrderedDict[Tuple[str, ...], Tuple[dict, float]]"] = {
+            name: OrderedDict() for name in ENTITY_TYPES
+        }
+        self._pending = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SubmissionQueue":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def add(self, entity_type: str, *entities: dict) -> None:
+        """Buffer entities to be sent with the next batch of their type.
+
+        :param entity_type: ``builds``, ``deployments``, ``feature_flags``, ``vulnerabilities``
+            or ``devinfo`` (repositories with their commits, branches and pull requests).
+        :param entities: Entities as documented for the corresponding submit request.
+        """
+        kind = ENTITY_TYPES.get(entity_type)
+        if kind is None:
+            raise ValueError(f"Unknown entity type '{entity_type}'. Use one of: {', '.join(ENTITY_TYPES)}")
+        if not hasattr(self.client, kind.method):
+            raise ValueError(f"{type(self.client).__name__} cannot submit {entity_type}; use a JiraSoftware client")
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The submission queue is closed")
+            self._start()
+            buffer = self._buffers[entity_type]
+            for entity in entities:
+                while self._pending >= self.max_pending and kind.key(entity) not in buffer:
+                    self._condition.notify_all()
+                    self._condition.wait()
+                self._buffer(entity_type, buffer, kind.key(entity), entity)
+            self._condition.notify_all()
+
+    def flush(self) -> SubmissionReport:
+        """Send every buffered entity now and return the running totals."""
+        while True:
+            with self._condition:
+                batch = next((batch for batch in map(self._take, ENTITY_TYPES) if batch[1]), None)
+            if batch is None:
+                break
+            self._send(*batch)
+        # Wait for a batch the background thread may still be sending
+        with self._send_lock:
+            return self.report
+
+    def close(self) -> SubmissionReport:
+        """Stop the background thread and send the remaining entities."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        return self.flush()
+
+    def _start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="atlassian-submission-queue", daemon=True)
+            self._thread.start()
+
+    def _buffer(
+        self,
+        entity_type: str,
+        buffer: "OrderedDict[Tuple[str, ...], Tuple[dict, float]]",
+        key: Tuple[str, ...],
+        entity: dict,
+    ) -> None:
+        previous = buffer.get(key)
+        if previous is None:
+            buffer[key] = (entity, time.monotonic())
+            self._pending += 1
+            return
+        self.report.deduplicated += 1
+        if entity_type == "devinfo":
+            buffer[key] = (_merge_repository(previous[0], entity), previous[1])
+        elif _sequence(entity) >= _sequence(previous[0]):
+            buffer[key] = (entity, previous[1])
+
+    def _take(self, entity_type: str, due_only: bool = False) -> Tuple[str, List[dict]]:
+        """Remove the next batch of ``entity_type``; with ``due_only`` only a full or expired one."""
+        buffer = self._buffers[entity_type]
+        if not buffer:
+            return entity_type, []
+        if due_only and len(buffer) < self.max_batch:
+            oldest = next(iter(buffer.values()))[1]
+            if time.monotonic() - oldest < self.max_delay:
+                return entity_type, []
+        batch = [buffer.popitem(last=False)[1][0] for _ in range(min(self.max_batch, len(buffer)))]
+        self._pending -= len(batch)
+        self._condition.notify_all()
+        return entity_type, batch
+
+    def _next_due(self) -> Optional[float]:
+        stamps = [next(iter(buffer.values()))[1] for buffer in self._buffers.values() if buffer]
+        return min(stamps) + self.max_delay - time.monotonic() if stamps else None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                batch = None
+                while batch is None:
+                    batch = next(
+                        (batch for batch in (self._take(name, True) for name in ENTITY_TYPES) if batch[1]), None
+                    )
+                    if batch is None:
+                        if self._closed:
+                            return
+                        due = self._next_due()
+                        self._condition.wait(None if due is None else max(due, 0.001))
+            self._send(*batch)
+
+    def _send(self, entity_type: str, entities: List[dict]) -> None:
+        kind = ENTITY_TYPES[entity_type]
+        data: Dict[str, Any] = {kind.payload: entities}
+        if self.properties is not None:
+            data["properties"] = self.properties
+        if self.provider_metadata is not None:
+            data["providerMetadata"] = self.provider_metadata
+        with self._send_lock:
+            for attempt in range(self.retries + 1):
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                self.report.requests += 1
+                try:
+                    response = getattr(self.client, kind.method)(data=data)
+                except Exception as e:
+                    retriable = is_retriable_error(e, RETRIABLE_STATUS_CODES)
+                    if retriable and attempt < self.retries:
+                        self.report.retries += 1
+                        delay = _retry_after(e, self.backoff * 2**attempt)
+                        log.warning(
+                            "Submitting %d %s failed, retrying in %.1fs: %s", len(entities), entity_type, delay, e
+                        )
+                        time.sleep(delay)
+                        continue
+                    log.warning("Submitting %d %s failed: %s", len(entities), entity_type, e)
+                    self.report.errors.extend(BulkItemError(entity, e, retriable) for entity in entities)
+                    return
+                break
+            if not isinstance(response, dict):
+                response = {}
+            if response.get("unknownIssueKeys"):
+                log.warning("Jira does not know the issues %s", ", ".join(map(str, response["unknownIssueKeys"])))
+            rejected = kind.rejected(response)
+            for entity in entities:
+                errors = rejected.get(kind.key(entity))
+                if errors is None:
+                    self.report.submitted += 1
+                else:
+                    self.report.errors.append(BulkItemError(entity, errors))
+
+
+def _sequence(entity: dict) -> int:
+    return int(entity.get("updateSequenceNumber") or entity.get("updateSequenceId") or 0)
+
+
+def _merge_repository(old: dict, new: dict) -> dict:
+    """Merge two versions of a development information repository, keeping the newest version of every entity."""
+    merged = dict(new if _sequence(new) >= _sequence(old) else old)
+    for name in DEVINFO_ENTITIES:
+        entities: Dict[str, dict] = {}
+        for entity in list(old.get(name) or ()) + list(new.get(name) or ()):
+            current = entities.get(entity["id"])
+            if current is None or _sequence(entity) >= _sequence(current):
+                entities[entity["id"]] = entity
+        if entities:
+            merged[name] = list(entities.values())
+    return merged
+
+
+def _retry_after(error: Exception, default: float) -> float:
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers["Retry-After"])  # type: ignore[union-attr]
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return default
@@ -0,0 +1,365 @@
+# coding=utf-8
+"""Bulk issue transitions.
+
+:func:`bulk_transition` moves any number of issues to a target status. The
+issues are grouped by project, issue type and current status, which share
+their workflow step, so the transition to take is looked up once per group
+instead of once per issue. On Jira Cloud the groups are submitted as
+``bulk/issues/transition`` operations of up to 1000 issues and their
+``bulk/queue`` progress is polled until they finish; on Server/Data Center the
+resolved transitions are posted concurrently, one request per issue.
+
+:class:`TransitionCache` keeps the transitions of each workflow step for the
+single-issue ``Jira.set_issue_status`` methods.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from requests import HTTPError
+
+from ..bulk import JIRA_BULK_FETCH_LIMIT, BulkItemError, is_retriable_error
+from ..concurrency import DEFAULT_MAX_WORKERS, RateLimiter, chunked, map_concurrently
+from ..request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+BULK_TRANSITION_LIMIT = 1000
+BULK_TERMINAL_STATES = ("COMPLETE", "FAILED", "CANCELLED", "DEAD")
+TRANSITION_FIELDS = ["project", "issuetype", "status"]
+
+T_group = Tuple[str, str, str]
+
+
+@dataclass
+class TransitionReport:
+    """Outcome of :func:`bulk_transition`; issues are identified by key."""
+
+    transitioned: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    errors: List[BulkItemError] = field(default_factory=list)
+    task_ids: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True when no issue failed."""
+        return not self.errors
+
+
+def _group_of(issue: dict) -> T_group:
+    fields = issue.get("fields") or {}
+    return (
+        (fields.get("project") or {}).get("key", ""),
+        (fields.get("issuetype") or {}).get("id") or (fields.get("issuetype") or {}).get("name", ""),
+        (fields.get("status") or {}).get("name", ""),
+    )
+
+
+def bulk_transition(
+    client: Any,
+    issues: Iterable[Union[str, dict]],
+    status: str,
+    send_notification: bool = True,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    poll_interval: float = 1.0,
+    timeout: Optional[float] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> TransitionReport:
+    """Transition ``issues`` to the status named ``status``.
+
+    Issues already in ``status`` are reported as unchanged. Issues whose
+    workflow has no transition to ``status`` from their current status, and
+    issues Jira refused to transition, are reported in ``errors`` with the
+    Jira error message.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param issues: Issue keys, or issues fetched with their ``project``, ``issuetype`` and ``status`` fields.
+    :param status: Name of the target status.
+    :param send_notification: Jira Cloud only: send the bulk operation notification email.
+    :param max_workers: Number of concurrent requests.
+    :param poll_interval: Seconds between two ``bulk/queue`` progress requests.
+    :param timeout: OPTIONAL: stop polling a bulk operation after this many seconds;
+        its unfinished issues are reported as retriable errors.
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing all requests.
+    :return: :class:`TransitionReport`
+    """
+    report = TransitionReport()
+    groups: Dict[T_group, List[dict]] = {}
+    loaded, missing = _load_issues(client, issues, max_workers, rate_limiter)
+    report.errors.extend(BulkItemError(key, "Issue does not exist or is not visible") for key in missing)
+    for issue in loaded:
+        if _group_of(issue)[2].lower() == status.lower():
+            report.unchanged.append(issue["key"])
+        else:
+            groups.setdefault(_group_of(issue), []).append(issue)
+
+    pool: Dict[str, Any] = {"max_workers": max_workers, "rate_limiter": rate_limiter}
+    resolved: List[Tuple[str, dict]] = []
+    for group, future in map_concurrently(
+        lambda group: _transition_id(client, groups[group][0], status), groups, **pool
+    ):
+        try:
+            transition_id = future.result()
+        except Exception as e:
+            report.errors.extend(BulkItemError(issue["key"], e, is_retriable_error(e)) for issue in groups[group])
+            continue
+        if transition_id is None:
+            message = f"No transition to {status} from {group[2]} in {group[0]} ({group[1]})"
+            report.errors.extend(BulkItemError(issue["key"], message) for issue in groups[group])
+        else:
+            resolved.extend((transition_id, issue) for issue in groups[group])
+    log.info("Transitioning %d issues in %d groups to %s", len(resolved), len(groups), status)
+
+    if hasattr(client, "submit_bulk_transition") or getattr(client, "cloud", False):
+        submit = _BulkSubmission(client, send_notification, poll_interval, timeout, rate_limiter)
+        for chunk, future in map_concurrently(submit, chunked(resolved, BULK_TRANSITION_LIMIT), **pool):
+            try:
+                partial = future.result()
+            except Exception as e:
+                retriable = is_retriable_error(e)
+                report.errors.extend(BulkItemError(issue["key"], e, retriable) for _, issue in chunk)
+                continue
+            report.transitioned.extend(partial.transitioned)
+            report.errors.extend(partial.errors)
+            report.task_ids.extend(partial.task_ids)
+    else:
+
+        def transition(item: Tuple[str, dict]) -> Any:
+            return client.set_issue_status_by_transition_id(item[1]["key"], item[0])
+
+        for (_, issue), future in map_concurrently(transition, resolved, **pool):
+            try:
+                future.result()
+            except Exception as e:
+                report.errors.append(BulkItemError(issue["key"], e, is_retriable_error(e)))
+            else:
+                report.transitioned.append(issue["key"])
+    return report
+
+
+def _load_issues(
+    client: Any, issues: Iterable[Union[str, dict]], max_workers: int, rate_limiter: Optional[RateLimiter]
+) -> Tuple[List[dict], List[str]]:
+    loaded: List[dict] = []
+    keys: List[str] = []
+    for issue in issues:
+        if isinstance(issue, dict):
+            loaded.append(issue)
+        else:
+            keys.append(str(issue))
+
+    def fetch(chunk: List[str]) -> List[dict]:
+        if hasattr(client, "bulk_fetch_issues"):
+            response = client.bulk_fetch_issues(data={"issueIdsOrKeys": chunk, "fields": TRANSITION_FIELDS})
+        else:
+            response, _ = client.bulk_issue(chunk, fields=TRANSITION_FIELDS)
+        return (response or {}).get("issues", [])
+
+    chunks = chunked(keys, JIRA_BULK_FETCH_LIMIT)
+    for _, future in map_concurrently(fetch, chunks, max_workers=max_workers, rate_limiter=rate_limiter):
+        loaded.extend(future.result())
+    found = {issue.get("key") for issue in loaded} | {issue.get("id") for issue in loaded}
+    return loaded, [key for key in keys if key not in found]
+
+
+def _transition_id(client: Any, issue: dict, status: str) -> Optional[str]:
+    """Return the ID of the transition of ``issue`` leading to ``status``."""
+    if hasattr(client, "get_transitions"):
+        transitions = [
+            {"id": transition["id"], "to": (transition.get("to") or {}).get("name")}
+            for transition in (client.get_transitions(issue["key"]) or {}).get("transitions", [])
+        ]
+    else:
+        transitions = client.get_issue_transitions(issue["key"])
+    for transition in transitions:
+        if str(transition.get("to") or "").lower() == status.lower():
+            return str(transition["id"])
+    return None
+
+
+class _BulkSubmission(object):
+    """Submit one chunk of resolved issues as a Jira Cloud bulk operation and wait for it."""
+
+    def __init__(
+        self,
+        client: Any,
+        send_notification: bool,
+        poll_interval: float,
+        timeout: Optional[float],
+        rate_limiter: Optional[RateLimiter],
+    ):
+        self.client = client
+        self.send_notification = send_notification
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+
+    def __call__(self, chunk: List[Tuple[str, dict]]) -> TransitionReport:
+        by_transition: Dict[str, List[str]] = {}
+        for transition_id, issue in chunk:
+            by_transition.setdefault(transition_id, []).append(issue["key"])
+        data = {
+            "bulkTransitionInputs": [
+                {"transitionId": transition_id, "selectedIssueIdsOrKeys": keys}
+                for transition_id, keys in by_transition.items()
+            ],
+            "sendBulkNotification": self.send_notification,
+        }
+        if hasattr(self.client, "submit_bulk_transition"):
+            response = self.client.submit_bulk_transition(data=data)
+        else:
+            response = self.client.post(self.client.resource_url("bulk/issues/transition"), data=data)
+        task_id = str((response or {})["taskId"])
+        progress = self._wait(task_id)
+
+        report = TransitionReport(task_ids=[task_id])
+        processed = {str(issue_id) for issue_id in progress.get("processedAccessibleIssues") or ()}
+        failed = {
+            str(issue_id): messages for issue_id, messages in (progress.get("failedAccessibleIssues") or {}).items()
+        }
+        finished = progress.get("status") in BULK_TERMINAL_STATES
+        for _, issue in chunk:
+            issue_id, key = str(issue.get("id")), issue["key"]
+            if issue_id in failed or key in failed:
+                messages = failed.get(issue_id) or failed.get(key)
+                report.errors.append(BulkItemError(key, "; ".join(messages or ()) or "Transition failed"))
+            elif issue_id in processed or key in processed:
+                report.transitioned.append(key)
+            elif finished:
+                report.errors.append(BulkItemError(key, f"Not transitioned by bulk operation {task_id}"))
+            else:
+                report.errors.append(BulkItemError(key, f"Bulk operation {task_id} still running", retriable=True))
+        return report
+
+    def _wait(self, task_id: str) -> dict:
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if hasattr(self.client, "get_bulk_operation_progress"):
+                progress = self.client.get_bulk_operation_progress(task_id)
+            else:
+                progress = self.client.get(self.client.resource_url(f"bulk/queue/{task_id}"))
+            progress = progress or {}
+            log.debug("Bulk operation %s: %s %s%%", task_id, progress.get("status"), progress.get("progressPercent"))
+            if progress.get("status") in BULK_TERMINAL_STATES:
+                return progress
+            if deadline is not None and time.monotonic() + self.poll_interval > deadline:
+                log.warning("Bulk operation %s did not finish within %s seconds", task_id, self.timeout)
+                return progress
+            time.sleep(self.poll_interval)
+
+
+class TransitionCache(object):
+    """Transitions available per workflow step, keyed by project, issue type and status.
+
+    Issues of one project and issue type share a workflow, so Jira offers the
+    same transitions for all issues in a status, conditions aside. An issue of
+    an unknown step is read once with ``expand=transitions``, without adding it
+    to the user's issue history, which also fills the cache for its step. The
+    step an issue was moved to is remembered, so moving it again, moving an
+    issue held by ``client.issue_cache``, or moving an issue passed with its
+    ``project``, ``issuetype`` and ``status`` fields, e.g. from a search, takes
+    only the transition request once its step is known. When Jira refuses a
+    transition taken from the cache, the step is dropped and the transition is
+    resolved from the issue.
+
+    :param max_issues: Number of issues whose current step is remembered.
+    """
+
+    def __init__(self, max_issues: int = 10000):
+        self.max_issues = max_issues
+        self._lock = threading.Lock()
+        self._steps: Dict[T_group, List[dict]] = {}
+        self._issues: "OrderedDict[str, T_group]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def clear(self) -> None:
+        """Forget everything, e.g. after a workflow was changed."""
+        with self._lock:
+            self._steps.clear()
+            self._issues.clear()
+
+    def invalidate(self, group: Optional[T_group] = None, issue_key: Optional[str] = None) -> None:
+        """Forget the transitions of a workflow step and the remembered step of an issue."""
+        with self._lock:
+            if group is not None:
+                self._steps.pop(group, None)
+            if issue_key is not None:
+                self._issues.pop(issue_key, None)
+
+    def transition(
+        self,
+        client: Any,
+        issue_key: str,
+        matches: Callable[[dict], bool],
+        post: Callable[[Optional[dict]], Any],
+        issue: Optional[dict] = None,
+    ) -> Any:
+        """Find the transition of ``issue_key`` accepted by ``matches`` and ``post`` it.
+
+        ``post`` receives the transition as ``{"id", "name", "to"}``, or None
+        when the issue has no such transition.
+
+        :param issue: OPTIONAL: The issue with its ``project``, ``issuetype`` and
+            ``status`` fields, identifying its workflow step without a request.
+        """
+        group, transitions, cached = self._lookup(client, issue_key, issue)
+        transition = next((candidate for candidate in transitions if matches(candidate)), None)
+        if cached:
+            try:
+                if transition is not None:
+                    return self._posted(issue_key, group, transition, post(transition))
+            except HTTPError as e:
+                log.debug("Cached transition %s of %s failed, resolving again: %s", transition["id"], issue_key, e)
+            self.invalidate(group, issue_key)
+            group, transitions, _ = self._lookup(client, issue_key)
+            transition = next((candidate for candidate in transitions if matches(candidate)), None)
+        return self._posted(issue_key, group, transition, post(transition))
+
+    def _lookup(self, client: Any, issue_key: str, issue: Optional[dict] = None) -> Tuple[T_group, List[dict], bool]:
+        """Return the step of the issue, its transitions, and whether both came from the cache."""
+        group = _group_of(issue) if issue else self._issues.get(issue_key)
+        issue_cache = getattr(client, "issue_cache", None)
+        if group is None and issue_cache is not None:
+            cached_issue = issue_cache.get(issue_key, TRANSITION_FIELDS)
+            if cached_issue is not None:
+                group = _group_of(cached_issue)
+        with self._lock:
+            transitions = self._steps.get(group) if group is not None else None
+        if group is not None and transitions is not None:
+            return group, transitions, True
+
+        issue = client.get_issue(issue_key, fields=TRANSITION_FIELDS, expand="transitions", update_history=False) or {}
+        group = _group_of(issue)
+        transitions = [
+            {
+                "id": str(transition["id"]),
+                "name": transition.get("name"),
+                "to": (transition.get("to") or {}).get("name"),
+            }
+            for transition in issue.get("transitions") or ()
+        ]
+        with self._lock:
+            self._steps[group] = transitions
+            self._remember(issue_key, group)
+        return group, transitions, False
+
+    def _posted(self, issue_key: str, group: T_group, transition: Optional[dict], response: Any) -> Any:
+        with self._lock:
+            if transition is not None and transition.get("to"):
+                self._remember(issue_key, (group[0], group[1], transition["to"]))
+            else:
+                self._issues.pop(issue_key, None)
+        return response
+
+    def _remember(self, issue_key: str, group: T_group) -> None:
+        self._issues[issue_key] = group
+        self._issues.move_to_end(issue_key)
+        while len(self._issues) > self.max_issues:
+            self._issues.popitem(last=False)
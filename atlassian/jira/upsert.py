@@ -0,0 +1,255 @@
+# coding=utf-8
+"""Batched create-or-update of issues.
+
+:func:`upsert_issues` is the bulk counterpart of
+``Jira.issue_create_or_update``. Instead of an existence check and an update
+per record, it looks up a whole batch of keys at once (``issue/bulkfetch`` on
+``JiraCloud``, a ``key in (...)`` search on ``Jira``), compares the desired
+fields with the current ones, creates the records without a key through
+``issue/bulk`` and sends only the changed fields of the existing ones,
+concurrently. Records whose fields already match are not written at all.
+
+Keys are matched the way Jira resolves them: regardless of case, and through
+the old key of an issue that was moved to another project. A key that does not
+resolve to an issue is reported as an error rather than created, so that a
+typo or a deleted issue does not turn into a duplicate.
+"""
+
+import re
+from dataclasses import dataclass, field
+from numbers import Number
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from requests import HTTPError
+
+from ..bulk import JIRA_BULK_FETCH_LIMIT, BulkItemError, is_retriable_error
+from ..concurrency import DEFAULT_MAX_WORKERS, RateLimiter, chunked, map_concurrently
+from ..request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+ISSUE_KEY_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9_]*-[0-9]+")
+
+
+@dataclass
+class UpsertReport:
+    """Outcome of :func:`upsert_issues`.
+
+    ``created`` pairs each record with the issue Jira created for it,
+    ``updated`` maps issue keys to the fields that were sent, and ``errors``
+    holds the records that could not be written.
+    """
+
+    created: List[Tuple[dict, dict]] = field(default_factory=list)
+    updated: Dict[str, dict] = field(default_factory=dict)
+    unchanged: List[str] = field(default_factory=list)
+    errors: List[BulkItemError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True when every record was written or already up to date."""
+        return not self.errors
+
+
+def field_matches(desired: Any, current: Any) -> bool:
+    """Return True when the current field value already satisfies the desired one.
+
+    Objects match when every key given in ``desired`` matches, so
+    ``{"name": "High"}`` matches a full priority object. Lists of plain values
+    are compared regardless of order, as Jira does not keep e.g. label order.
+    """
+    if isinstance(desired, dict):
+        return isinstance(current, dict) and all(
+            field_matches(value, current.get(key)) for key, value in desired.items()
+        )
+    if isinstance(desired, (list, tuple)):
+        if not isinstance(current, (list, tuple)) or len(desired) != len(current):
+            return not desired and not current
+        if all(not isinstance(value, (dict, list, tuple)) for value in desired):
+            return sorted(map(str, desired)) == sorted(map(str, current))
+        return all(field_matches(value, other) for value, other in zip(desired, current))
+    if desired is None or desired == "":
+        return current is None or current == "" or current == []
+    if isinstance(desired, Number) and isinstance(current, Number) and not isinstance(desired, bool):
+        return float(desired) == float(current)  # type: ignore[arg-type]
+    return desired == current
+
+
+def changed_fields(desired: dict, current: dict) -> dict:
+    """Return the subset of ``desired`` whose values differ from the ``current`` issue fields."""
+    return {name: value for name, value in desired.items() if not field_matches(value, current.get(name))}
+
+
+def upsert_issues(
+    client: Any,
+    records: Iterable[dict],
+    key_field: str = "issuekey",
+    immutable_fields: Iterable[str] = ("project", "issuetype"),
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    notify_users: bool = True,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> UpsertReport:
+    """Create or update one issue per record, a batch of records at a time.
+
+    Every record holds the issue fields as accepted by ``issue_create`` plus,
+    for existing issues, the issue key under ``key_field``. Records without a
+    key are created; the others are updated with the fields that differ.
+    Records whose key is malformed or does not resolve to an existing issue
+    are reported in ``errors`` and not written. Records are not modified.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param records: Desired issue fields; any iterable, consumed one batch at a time.
+    :param key_field: Record entry holding the issue key.
+    :param immutable_fields: Fields only used when creating, e.g. because the
+        edit screen does not allow changing them.
+    :param batch_size: Number of records resolved together.
+    :param notify_users: Send update notifications (disabling requires admin rights).
+    :param max_workers: Number of concurrent requests.
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing all requests.
+    :return: :class:`UpsertReport`
+    """
+    report = UpsertReport()
+    create_only = set(immutable_fields) | {key_field}
+    pool: Dict[str, Any] = {"max_workers": max_workers, "rate_limiter": rate_limiter}
+    for batch in chunked(records, batch_size):
+        keys = list(dict.fromkeys(str(record[key_field]) for record in batch if record.get(key_field)))
+        names = {name for record in batch for name in record if name not in create_only}
+        existing = _existing_issues(
+            client, [key for key in keys if ISSUE_KEY_PATTERN.fullmatch(key)], sorted(names), pool
+        )
+
+        creates: List[dict] = []
+        updates: List[Tuple[str, dict]] = []
+        unchanged = len(report.unchanged)
+        for record in batch:
+            key = str(record[key_field]) if record.get(key_field) else None
+            fields = {name: value for name, value in record.items() if name != key_field}
+            if key is None:
+                creates.append({"fields": fields})
+                continue
+            issue = existing.get(key)
+            if isinstance(issue, Exception) or issue is None:
+                if issue is None:
+                    reason = "does not exist" if ISSUE_KEY_PATTERN.fullmatch(key) else "is not a valid issue key"
+                    issue = ValueError(f"Issue {key} {reason}")
+                report.errors.append(BulkItemError(record, issue, is_retriable_error(issue)))
+                continue
+            changes = changed_fields(
+                {name: value for name, value in fields.items() if name not in create_only},
+                issue.get("fields") or {},
+            )
+            if changes:
+                updates.append((issue["key"], changes))
+            else:
+                report.unchanged.append(issue["key"])
+        log.info(
+            "Upsert batch of %d records: %d to create, %d to update, %d unchanged",
+            len(batch),
+            len(creates),
+            len(updates),
+            len(report.unchanged) - unchanged,
+        )
+
+        if creates:
+            created = client.bulk_create_issues(creates, **pool)
+            report.created.extend((payload["fields"], issue) for payload, issue in created.successes)
+            report.errors.extend(
+                BulkItemError(error.item["fields"], error.error, error.retriable) for error in created.errors
+            )
+
+        def update(item: Tuple[str, dict]) -> Any:
+            key, changes = item
+            if hasattr(client, "bulk_fetch_issues"):
+                return client.edit_issue(key, notify_users=notify_users, data={"fields": changes})
+            return client.update_issue_field(key, changes, notify_users=notify_users)
+
+        for (key, changes), future in map_concurrently(update, updates, **pool):
+            try:
+                future.result()
+            except Exception as e:
+                report.errors.append(BulkItemError({key_field: key, **changes}, e, is_retriable_error(e)))
+            else:
+                report.updated[key] = changes
+    return report
+
+
+def _existing_issues(client: Any, keys: List[str], fields: List[str], pool: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the existing issues among ``keys`` by the requested key.
+
+    Keys that Jira returned under another key, in another case or after a
+    move, are matched by fetching them one by one. Keys that could not be
+    looked up map to the exception raised for them; keys of issues that do not
+    exist are left out.
+    """
+    if not keys:
+        return {}
+    fields = fields or ["key"]
+
+    def fetch(chunk: List[str]) -> List[dict]:
+        if hasattr(client, "bulk_fetch_issues"):
+            response = client.bulk_fetch_issues(data={"issueIdsOrKeys": chunk, "fields": fields})
+            return (response or {}).get("issues", [])
+        while chunk:
+            try:
+                # A strictly validated ``key in (...)`` fails with 400 as soon as one key does not
+                # exist; ``validate_query`` is not supported by the enhanced search on Cloud
+                response, _ = client.bulk_issue(chunk, fields=fields, validate_query="warn")
+            except HTTPError as e:
+                rejected = _rejected_keys(e, chunk)
+                if not rejected:
+                    raise
+                chunk = [key for key in chunk if key.upper() not in rejected]
+            else:
+                return (response or {}).get("issues", [])
+        return []
+
+    found: Dict[str, Any] = {}
+    requested: Dict[str, List[str]] = {}
+    for key in keys:
+        requested.setdefault(key.upper(), []).append(key)
+    moved = False
+    for _, future in map_concurrently(
+        fetch, chunked([same[0] for same in requested.values()], JIRA_BULK_FETCH_LIMIT), **pool
+    ):
+        for issue in future.result():
+            same = requested.get(str(issue.get("key", "")).upper())
+            if same is None:
+                moved = True
+            for key in same or ():
+                found[key] = issue
+    unmatched = [key for key in keys if key not in found]
+    if not moved or not unmatched:
+        return found
+
+    def fetch_one(key: str) -> Optional[dict]:
+        try:
+            return client.get_issue(key, fields=",".join(fields), update_history=False)
+        except HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    for key, future in map_concurrently(fetch_one, unmatched, **pool):
+        try:
+            issue = future.result()
+        except Exception as e:
+            found[key] = e
+        else:
+            if issue:
+                found[key] = issue
+    return found
+
+
+def _rejected_keys(error: HTTPError, keys: List[str]) -> Set[str]:
+    """Return the upper-cased ``keys`` named in the ``errorMessages`` of a 400 search response."""
+    if error.response is None or error.response.status_code != 400:
+        return set()
+    try:
+        messages = error.response.json().get("errorMessages") or []
+    except ValueError:
+        return set()
+    quoted = {match.upper() for message in messages for match in re.findall(r"'([^']+)'", str(message))}
+    return {key.upper() for key in keys} & quoted
@@ -0,0 +1,182 @@
+# coding=utf-8
+"""Cached user lookups for enriching issues.
+
+:class:`UserDirectory` pages through every user once (``users/search`` on
+Jira Cloud, ``user/search?username=.`` on Server/Data Center) into an
+in-memory index by account ID, username and user key. Identifiers missing
+from the index, e.g. users created since, are looked up in bulk: ``user/bulk``
+in chunks on Cloud, concurrent ``user`` requests on Server/Data Center.
+Results, including unknown identifiers, are kept for ``ttl`` seconds.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from requests import HTTPError
+
+from ..bulk import JIRA_USER_BULK_LIMIT, JIRA_USER_SEARCH_LIMIT
+from ..concurrency import DEFAULT_MAX_WORKERS, RateLimiter, chunked, map_concurrently
+from ..request_utils import get_default_logger
+
+log = get_default_logger(__name__)
+
+DEFAULT_TTL = 3600.0
+USER_IDS = ("accountId", "name", "key")
+
+
+class UserDirectory(object):
+    """Index of Jira users answering many lookups with few requests.
+
+    :param client: ``Jira`` (Server/Data Center or Cloud) or ``JiraCloud`` client.
+    :param ttl: Seconds users are kept; ``None`` keeps them until :meth:`invalidate`.
+    :param preload: Page through all users on first use. Disable on sites with
+        many more users than are looked up; only the requested users are fetched then.
+    :param max_workers: Number of concurrent requests.
+    :param rate_limiter: OPTIONAL: ``atlassian.concurrency.RateLimiter`` pacing all requests.
+    :param clock: Monotonic time source, replaceable for tests.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        ttl: Optional[float] = DEFAULT_TTL,
+        preload: bool = True,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.preload = preload
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._users: Dict[str, Tuple[Optional[dict], float]] = {}
+        self._loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len({id(user) for user, _ in self._users.values() if user is not None})
+
+    def invalidate(self) -> None:
+        """Forget all users; the next lookup loads them again."""
+        with self._lock:
+            self._users.clear()
+            self._loaded_at = None
+
+    def load(self) -> int:
+        """Page through all users into the index and return their number."""
+        loaded_at = self.clock()
+        count = 0
+        with self._lock:
+            for user in self._all_users():
+                self._put(user, loaded_at)
+                count += 1
+            self._loaded_at = loaded_at
+        log.info("Loaded %d users", count)
+        return count
+
+    def get(self, user_id: str) -> Optional[dict]:
+        """Return the user with this account ID, username or key, or None when there is none."""
+        return self.resolve_many([user_id])[user_id]
+
+    def resolve_many(self, user_ids: Iterable[Optional[str]]) -> Dict[str, Optional[dict]]:
+        """Return the user for every account ID, username or key; unknown ones map to None.
+
+        Empty identifiers, e.g. of unassigned issues, are skipped.
+        """
+        ids = list(dict.fromkeys(user_id for user_id in user_ids if user_id))
+        if self.preload and (self._loaded_at is None or self._expired(self._loaded_at)):
+            self.load()
+        found: Dict[str, Optional[dict]] = {}
+        missing: List[str] = []
+        for user_id in ids:
+            entry = self._users.get(user_id)
+            if entry is None or self._expired(entry[1]):
+                missing.append(user_id)
+            else:
+                found[user_id] = entry[0]
+        if missing:
+            fetched = self._fetch(missing)
+            now = self.clock()
+            with self._lock:
+                for user_id in missing:
+                    user = fetched.get(user_id)
+                    if user is None:
+                        self._users[user_id] = (None, now)
+                    else:
+                        self._put(user, now)
+                    found[user_id] = user
+        return {user_id: found[user_id] for user_id in ids}
+
+    def _expired(self, stamp: float) -> bool:
+        return self.ttl is not None and self.clock() - stamp >= self.ttl
+
+    def _put(self, user: dict, stamp: float) -> None:
+        for name in USER_IDS:
+            if user.get(name):
+                self._users[user[name]] = (user, stamp)
+
+    def _all_users(self) -> Iterator[dict]:
+        start = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if hasattr(self.client, "bulk_fetch_issues"):
+                page = self.client.get_all_users(start_at=start, max_results=JIRA_USER_SEARCH_LIMIT)
+            elif getattr(self.client, "cloud", False):
+                page = self.client.users_get_all(start=start, limit=JIRA_USER_SEARCH_LIMIT)
+            else:
+                page = self.client.user_find_by_user_string(
+                    username=".", start=start, limit=JIRA_USER_SEARCH_LIMIT, include_inactive_users=True
+                )
+            page = page or []
+            yield from page
+            # Cloud pages may hold fewer users than requested before the last one
+            if not page or (not getattr(self.client, "cloud", False) and len(page) < JIRA_USER_SEARCH_LIMIT):
+                return
+            start += len(page)
+
+    def _fetch(self, user_ids: List[str]) -> Dict[str, dict]:
+        """Look up users missing from the index by any of their identifiers."""
+        pool: Dict[str, Any] = {"max_workers": self.max_workers, "rate_limiter": self.rate_limiter}
+        fetched: Dict[str, dict] = {}
+        if getattr(self.client, "cloud", False):
+            for _, future in map_concurrently(self._bulk, chunked(user_ids, JIRA_USER_BULK_LIMIT), **pool):
+                for user in future.result():
+                    fetched[user["accountId"]] = user
+            return fetched
+        for user_id, future in map_concurrently(self._single, user_ids, **pool):
+            user = future.result()
+            if user is not None:
+                fetched[user_id] = user
+        return fetched
+
+    def _bulk(self, account_ids: List[str]) -> List[dict]:
+        users: List[dict] = []
+        while True:
+            params = {"accountId": account_ids, "startAt": len(users), "maxResults": len(account_ids)}
+            if hasattr(self.client, "bulk_get_users"):
+                response = self.client.bulk_get_users(
+                    start_at=params["startAt"], max_results=params["maxResults"], account_id=account_ids
+                )
+            else:
+                response = self.client.get(self.client.resource_url("user/bulk"), params=params)
+            page = (response or {}).get("values") or []
+            users.extend(page)
+            if not page or (response or {}).get("isLast", True):
+                return users
+
+    def _single(self, user_id: str) -> Optional[dict]:
+        """Look up a Server/Data Center user by username, then by user key."""
+        for lookup in ({"username": user_id}, {"key": user_id}):
+            try:
+                user = self.client.user(**lookup)
+            except HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    continue
+                raise
+            if isinstance(user, dict):
+                return user
+        return None
@@ -53,6 +53,7 @@ from atlassian.models.jira.issues import (
     issue_type_for,
 )
 from atlassian.models.jira.comment import Comment, Visibility
+from atlassian.models.jira.compact import CompactIssue, CompactIssueFields, clear_shared_entities
 from atlassian.models.jira.serializer import FieldMapping, bulk_serialize, serialize, to_fields_dict
 from atlassian.models.jira.transition import Transition, TransitionBuilder
 from atlassian.models.jira.update import UpdateBuilder, UpdatePayload
@@ -63,6 +64,8 @@ __all__ = [
     "Bug",
     "BugBuilder",
     "Comment",
+    "CompactIssue",
+    "CompactIssueFields",
     "Component",
     "CustomField",
     "Epic",
@@ -96,6 +99,7 @@ __all__ = [
     "Visibility",
     "bug",
     "bulk_serialize",
+    "clear_shared_entities",
     "epic",
     "get_issue_type_registry",
     "issue_type_for",
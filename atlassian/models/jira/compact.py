@@ -0,0 +1,214 @@
+"""Compact, read-only issue representations for large result sets.
+
+:class:`CompactIssue` and :class:`CompactIssueFields` hold the same fields as
+:class:`~atlassian.models.jira.JiraIssue` plus the issue key, id and status,
+for analysing hundreds of thousands of issues in memory. They are frozen and
+slotted, so no instance carries a ``__dict__``; collections are tuples whose
+empty default is the single shared ``()``; projects, issue types, priorities,
+versions, components and users parsed by :meth:`CompactIssue.from_dict` are
+shared between issues; and status names and labels are interned strings. Use
+:meth:`CompactIssue.to_issue` to get a mutable ``JiraIssue`` for one of them.
+
+The shared entities are kept in a module-level table of at most
+``SHARED_ENTITY_LIMIT`` entries, which :func:`clear_shared_entities` empties.
+The entity classes themselves are the regular ones of
+:mod:`atlassian.models.jira.fields`; only the compact classes are slotted.
+"""
+
+from __future__ import annotations
+
+import datetime
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Optional, TypeVar, Union
+
+from atlassian.models.jira.fields import (
+    Component,
+    CustomField,
+    IssueFields,
+    IssueLink,
+    IssueType,
+    Parent,
+    Priority,
+    Project,
+    User,
+    Version,
+)
+from atlassian.models.jira.issues import JiraIssue, get_issue_type_registry
+
+_T = TypeVar("_T")
+
+# Entities parsed by ``CompactIssue.from_dict`` are shared up to this many distinct values
+SHARED_ENTITY_LIMIT = 65536
+_SHARED: dict[Any, Any] = {}
+
+
+def clear_shared_entities() -> None:
+    """Forget the projects, users, versions etc. shared between compact issues parsed so far."""
+    _SHARED.clear()
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+# The entries of a REST API dict that ``from_dict`` of each entity class reads
+_IDENTITIES: dict[type, tuple[str, ...]] = {
+    Project: ("key", "id"),
+    Parent: ("key", "id"),
+    IssueType: ("name", "id"),
+    Priority: ("name", "id"),
+    Component: ("name", "id"),
+    Version: ("name", "id"),
+    User: ("accountId", "name"),
+}
+
+
+def _shared(entity_cls: type[_T], data: dict[str, Any]) -> _T:
+    """Return the entity parsed from ``data``, shared with the compact issues parsed before."""
+    key = (entity_cls, *(data.get(name) for name in _IDENTITIES[entity_cls]))
+    entity = _SHARED.get(key)
+    if entity is None:
+        entity = entity_cls.from_dict(data)  # type: ignore[attr-defined]
+        if len(_SHARED) < SHARED_ENTITY_LIMIT:
+            _SHARED[key] = entity
+    return entity
+
+
+def _frozen_getstate(self: Any) -> list[Any]:
+    return [getattr(self, f.name) for f in fields(self)]
+
+
+def _frozen_setstate(self: Any, state: list[Any]) -> None:
+    for f, value in zip(fields(self), state):
+        object.__setattr__(self, f.name, value)
+
+
+def _slotted(cls: type[_T]) -> type[_T]:
+    """Recreate a frozen dataclass with ``__slots__`` and without a per-instance ``__dict__``.
+
+    Equivalent to ``dataclass(frozen=True, slots=True)``, which needs Python 3.10.
+    """
+    inherited = {name for base in cls.__mro__[1:] for name in getattr(base, "__slots__", ())}
+    names = tuple(f.name for f in fields(cls) if f.name not in inherited)  # type: ignore[arg-type]
+    namespace = dict(cls.__dict__)
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    namespace["__slots__"] = names
+    namespace["__getstate__"] = _frozen_getstate
+    namespace["__setstate__"] = _frozen_setstate
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+@_slotted
+@dataclass(frozen=True)
+class CompactIssueFields:  # pylint: disable=too-many-instance-attributes
+    project: Optional[Project] = None
+    issue_type: Optional[IssueType] = None
+    status: Optional[str] = None
+    summary: Optional[str] = None
+    description: Optional[Union[str, dict[str, Any]]] = None
+    priority: Optional[Priority] = None
+    labels: tuple[str, ...] = ()
+    components: tuple[Component, ...] = ()
+    assignee: Optional[User] = None
+    reporter: Optional[User] = None
+    parent: Optional[Parent] = None
+    epic_link: Optional[str] = None
+    epic_name: Optional[str] = None
+    fix_versions: tuple[Version, ...] = ()
+    affected_versions: tuple[Version, ...] = ()
+    due_date: Optional[datetime.date] = None
+    story_points: Optional[float] = None
+    issue_links: tuple[IssueLink, ...] = ()
+    custom_fields: tuple[CustomField, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], *, mapping: Optional[Any] = None) -> CompactIssueFields:
+        """Parse a Jira REST API fields dict, like :meth:`IssueFields.from_dict`."""
+        from atlassian.models.jira.serializer import FieldMapping  # pylint: disable=import-outside-toplevel
+
+        if mapping is None:
+            mapping = FieldMapping()
+
+        def entity(name: str, entity_cls: Any) -> Any:
+            value = data.get(name)
+            return _shared(entity_cls, value) if value else None
+
+        def entities(name: str, entity_cls: Any) -> tuple[Any, ...]:
+            return tuple(_shared(entity_cls, value) for value in data.get(name) or ())
+
+        status = data.get("status")
+        due_date = data.get("duedate")
+        return cls(
+            project=entity("project", Project),
+            issue_type=entity("issuetype", IssueType),
+            status=_intern(status.get("name")) if status else None,
+            summary=data.get("summary"),
+            description=data.get("description"),
+            priority=entity("priority", Priority),
+            labels=tuple(_intern(label) for label in data.get("labels") or ()),
+            components=entities("components", Component),
+            assignee=entity("assignee", User),
+            reporter=entity("reporter", User),
+            parent=entity("parent", Parent),
+            epic_link=data.get(mapping.epic_link_field),
+            epic_name=data.get(mapping.epic_name_field),
+            fix_versions=entities("fixVersions", Version),
+            affected_versions=entities("versions", Version),
+            due_date=datetime.date.fromisoformat(due_date) if due_date else None,
+            story_points=data.get(mapping.story_points_field),
+        )
+
+    def to_fields(self) -> IssueFields:
+        """Return a mutable :class:`IssueFields` copy."""
+        return IssueFields(
+            project=self.project,
+            issue_type=self.issue_type,
+            summary=self.summary,
+            description=self.description,
+            priority=self.priority,
+            labels=list(self.labels),
+            components=list(self.components),
+            assignee=self.assignee,
+            reporter=self.reporter,
+            parent=self.parent,
+            epic_link=self.epic_link,
+            epic_name=self.epic_name,
+            fix_versions=list(self.fix_versions),
+            affected_versions=list(self.affected_versions),
+            due_date=self.due_date,
+            story_points=self.story_points,
+            issue_links=list(self.issue_links),
+            custom_fields=list(self.custom_fields),
+        )
+
+
+_EMPTY_FIELDS = CompactIssueFields()
+
+
+@_slotted
+@dataclass(frozen=True)
+class CompactIssue:
+    key: Optional[str] = None
+    id: Optional[str] = None
+    fields: CompactIssueFields = _EMPTY_FIELDS
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], *, mapping: Any = None) -> CompactIssue:
+        """Create a compact issue from a Jira REST API issue dict, e.g. a search result."""
+        return cls(
+            key=data.get("key"),
+            id=data.get("id"),
+            fields=CompactIssueFields.from_dict(data.get("fields", data), mapping=mapping),
+        )
+
+    def to_issue(self) -> JiraIssue:
+        """Return a mutable :class:`JiraIssue` of the registered class for the issue type."""
+        name = self.fields.issue_type.name if self.fields.issue_type else None
+        issue_cls = get_issue_type_registry().get(name or "", JiraIssue)
+        issue = issue_cls.__new__(issue_cls)
+        issue.fields = self.fields.to_fields()
+        return issue
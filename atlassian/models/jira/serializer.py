@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 from atlassian.models.jira.fields import IssueFields, IssueLink
@@ -12,12 +12,50 @@ class FieldMapping:
     """Maps well-known model fields to instance-specific Jira custom field IDs.
 
     Different Jira instances use different custom field IDs for concepts like
-    epic link or story points. Override the defaults here.
+    epic link or story points. Override the defaults here, or build the mapping
+    from the instance with ``FieldMapping.from_metadata(jira)``.
+
+    With ``metadata`` (an ``atlassian.jira.metadata.MetadataRegistry``), custom
+    fields may also be given by their display name, e.g.
+    ``CustomField("Team", ...)``, and are serialized under their field ID. The
+    models do not know the client, so names are only resolved with a mapping
+    built by ``from_metadata``; the default mapping passes them through.
     """
 
     epic_link_field: str = "customfield_10014"
     story_points_field: str = "customfield_10028"
     epic_name_field: str = "customfield_10011"
+    metadata: Optional[Any] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_metadata(cls, metadata: Any) -> FieldMapping:
+        """Build a mapping from the field names of an instance, keeping the defaults for missing fields.
+
+        :param metadata: A ``Jira`` or ``JiraCloud`` client, whose ``metadata`` is used, or a ``MetadataRegistry``.
+        """
+        metadata = getattr(metadata, "metadata", metadata)
+        defaults = cls()
+
+        def resolve(default: str, *names: str) -> str:
+            for name in names:
+                try:
+                    return metadata.field_id(name)
+                except (KeyError, ValueError):
+                    continue
+            return default
+
+        return cls(
+            epic_link_field=resolve(defaults.epic_link_field, "Epic Link"),
+            story_points_field=resolve(defaults.story_points_field, "Story Points", "Story point estimate"),
+            epic_name_field=resolve(defaults.epic_name_field, "Epic Name"),
+            metadata=metadata,
+        )
+
+    def field_id(self, name_or_id: str) -> str:
+        """Return the field ID for a field ID or, with ``metadata``, a field display name."""
+        if self.metadata is None or name_or_id.startswith("customfield_"):
+            return name_or_id
+        return self.metadata.field_id(name_or_id)
 
 
 def _ser_entity_fields(f: IssueFields, fields: dict[str, Any]) -> None:
@@ -63,7 +101,7 @@ def _ser_custom_and_mapped_fields(f: IssueFields, fields: dict[str, Any], mappin
     if f.story_points is not None:
         fields[mapping.story_points_field] = f.story_points
     for cf in f.custom_fields:
-        fields[cf.field_id] = cf.value
+        fields[mapping.field_id(cf.field_id)] = cf.value
 
 
 def _ser_issue_links(links: list[IssueLink]) -> list[dict[str, Any]]:
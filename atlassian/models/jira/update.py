@@ -39,11 +39,15 @@ class UpdateBuilder:  # pylint: disable=too-many-public-methods
         )
         jira.issue_update(payload.issue_key, payload.fields, update=payload.update)
 
+    With ``metadata`` (a ``Jira`` or ``JiraCloud`` client, whose ``metadata``
+    is used, or a ``MetadataRegistry``), ``set_custom_field`` also accepts
+    field display names such as ``"Story Points"``; without it they are sent as given.
     """
 
-    def __init__(self, issue_key: str) -> None:
+    def __init__(self, issue_key: str, metadata: Optional[Any] = None) -> None:
         """Initialize the builder for the given issue key."""
         self._issue_key = issue_key
+        self._metadata = getattr(metadata, "metadata", metadata)
         self._fields: dict[str, Any] = {}
         self._update: dict[str, list[dict[str, Any]]] = {}
 
@@ -142,6 +146,8 @@ class UpdateBuilder:  # pylint: disable=too-many-public-methods
         return self
 
     def set_custom_field(self, field_id: str, value: Any) -> UpdateBuilder:
+        if self._metadata is not None and not field_id.startswith("customfield_"):
+            field_id = self._metadata.field_id(field_id)
         self._fields[field_id] = value
         return self
 
@@ -0,0 +1,243 @@
+# coding=utf-8
+"""Streaming ``multipart/form-data`` request bodies.
+
+``requests`` renders a multipart body into a single ``bytes`` object before
+sending it, so uploading a file holds the whole file in memory. The
+:class:`MultipartEncoder` produces the same wire format lazily: file objects
+are read in small blocks while the body is transmitted, and the total
+``Content-Length`` is computed up front from file sizes whenever possible.
+"""
+
+import io
+import os
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+from requests.utils import guess_filename, to_key_val_list
+from urllib3.fields import RequestField
+from urllib3.filepost import choose_boundary
+
+T_progress_callback = Callable[[int, Optional[int]], None]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _stream_length(stream: Any) -> Optional[int]:
+    """Return the number of bytes left in ``stream`` or ``None`` if unknown."""
+    try:
+        position = stream.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+    try:
+        return max(0, os.fstat(stream.fileno()).st_size - position)
+    except (AttributeError, OSError, ValueError):
+        pass
+    try:
+        end = stream.seek(0, os.SEEK_END)
+        stream.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return max(0, end - position)
+
+
+class _Segment(object):
+    """A contiguous piece of the body: either static bytes or a file object."""
+
+    __slots__ = ("data", "stream", "start", "length")
+
+    def __init__(self, data: Optional[bytes] = None, stream: Optional[BinaryIO] = None):
+        self.data = data
+        self.stream = stream
+        self.start = None
+        if stream is not None:
+            try:
+                self.start = stream.tell()
+            except (AttributeError, OSError, ValueError):
+                self.start = None
+            self.length = _stream_length(stream)
+        else:
+            self.length = len(data or b"")
+
+    def seek(self, offset: int) -> None:
+        if self.stream is None:
+            return
+        if self.start is None:
+            if offset:
+                raise io.UnsupportedOperation("Multipart file part is not seekable")
+            return
+        self.stream.seek(self.start + offset)
+
+
+class MultipartEncoder(object):
+    """Lazily encode form fields and files as ``multipart/form-data``.
+
+    The encoder accepts the same ``files`` and ``data`` arguments as
+    ``requests`` and is passed to ``requests`` as a streamed ``data`` body.
+    It implements ``read``, ``tell`` and ``seek`` so the body can be rewound
+    when ``requests`` or ``urllib3`` retry or follow a redirect.
+
+    :param files: dict or list of ``(name, value)`` pairs, where ``value`` is a
+        file object, ``bytes``/``str``, or a ``(filename, fileobj[, content_type[, headers]])`` tuple.
+    :param data: Optional plain form fields sent before the files.
+    :param callback: Optional ``callback(bytes_sent, total_bytes)`` invoked after
+        every block of the body is read. ``total_bytes`` is ``None`` when the
+        size of a file object cannot be determined.
+    :param chunk_size: Block size used when iterating over the body.
+    :param boundary: Optional multipart boundary, randomly generated by default.
+    """
+
+    def __init__(
+        self,
+        files: Any,
+        data: Any = None,
+        callback: Optional[T_progress_callback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        boundary: Optional[str] = None,
+    ):
+        if not files:
+            raise ValueError("Files must be provided.")
+        if isinstance(data, (str, bytes)):
+            raise ValueError("Data must not be a string.")
+        self.boundary = boundary or choose_boundary()
+        self.callback = callback
+        self.chunk_size = chunk_size
+        self._segments = self._build_segments(files, data)
+        lengths = [segment.length for segment in self._segments]
+        self.len = None if None in lengths else sum(lengths)
+        self._index = 0
+        self._offset = 0
+        self._position = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _build_segments(self, files: Any, data: Any) -> List[_Segment]:
+        segments: List[_Segment] = []
+        for name, value in to_key_val_list(data or {}):
+            if isinstance(value, (str, bytes)) or not hasattr(value, "__iter__"):
+                value = [value]
+            for item in value:
+                if item is None:
+                    continue
+                if not isinstance(item, bytes):
+                    item = str(item).encode("utf-8")
+                if isinstance(name, bytes):
+                    name = name.decode("utf-8")
+                field = RequestField(name=name, data=item)
+                field.make_multipart()
+                segments.extend(self._part(field, item))
+
+        for name, value in to_key_val_list(files):
+            content_type = None
+            headers = None
+            if isinstance(value, (tuple, list)):
+                if len(value) == 2:
+                    filename, content = value
+                elif len(value) == 3:
+                    filename, content, content_type = value
+                else:
+                    filename, content, content_type, headers = value
+            else:
+                filename = guess_filename(value) or name
+                content = value
+            if content is None:
+                continue
+            field = RequestField(name=name, data=b"", filename=filename, headers=headers)
+            field.make_multipart(content_type=content_type)
+            segments.extend(self._part(field, content))
+
+        segments.append(_Segment(f"--{self.boundary}--\r\n".encode("latin-1")))
+        return segments
+
+    def _part(self, field: RequestField, content: Any) -> Tuple[_Segment, _Segment, _Segment]:
+        header = f"--{self.boundary}\r\n".encode("latin-1") + field.render_headers().encode("utf-8")
+        if isinstance(content, str):
+            body = _Segment(content.encode("utf-8"))
+        elif isinstance(content, (bytes, bytearray, memoryview)):
+            body = _Segment(bytes(content))
+        elif hasattr(content, "read"):
+            body = _Segment(stream=content)
+        else:
+            body = _Segment(str(content).encode("utf-8"))
+        return _Segment(header), body, _Segment(b"\r\n")
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def _read_segment(self, size: int) -> bytes:
+        segment = self._segments[self._index]
+        if segment.stream is None:
+            data = segment.data or b""
+            chunk = data[self._offset :] if size < 0 else data[self._offset : self._offset + size]
+        else:
+            chunk = segment.stream.read(size)
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+        if not chunk:
+            self._index += 1
+            self._offset = 0
+        else:
+            self._offset += len(chunk)
+        return chunk
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """Read up to ``size`` bytes of the encoded body (all remaining if negative)."""
+        if size is None:
+            size = -1
+        chunks = []
+        remaining = size
+        while self._index < len(self._segments) and (size < 0 or remaining > 0):
+            chunk = self._read_segment(remaining if size >= 0 else self.chunk_size)
+            if chunk:
+                chunks.append(chunk)
+                remaining -= len(chunk)
+        result = b"".join(chunks)
+        if result:
+            self._position += len(result)
+            if self.callback is not None:
+                self.callback(self._position, self.len)
+        return result
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Reposition the body so it can be sent again.
+
+        Arbitrary positions require every part to have a known size; bodies
+        with unsized streams can only be rewound to the start.
+        """
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            if self.len is None:
+                raise io.UnsupportedOperation("Cannot seek from the end of an unsized multipart body")
+            offset += self.len
+        if offset < 0 or (self.len is not None and offset > self.len):
+            raise ValueError(f"Invalid multipart body position {offset}")
+        if self.len is None and offset:
+            raise io.UnsupportedOperation("Unsized multipart bodies can only be rewound to the start")
+
+        remaining = offset
+        index = 0
+        while index < len(self._segments):
+            length = self._segments[index].length or 0
+            if remaining < length or index == len(self._segments) - 1:
+                break
+            remaining -= length
+            index += 1
+        for segment in self._segments[index + 1 :]:
+            segment.seek(0)
+        self._segments[index].seek(remaining)
+        self._index = index
+        self._offset = remaining
+        self._position = offset
+        return offset
+
+    def rewind(self) -> None:
+        """Return to the start of the body, resetting every file part."""
+        self.seek(0)
@@ -40,6 +40,7 @@ from requests_oauthlib import OAuth1, OAuth2
 from typing_extensions import Self
 from urllib3.util import Retry
 
+from atlassian.multipart import MultipartEncoder, T_progress_callback
 from atlassian.request_utils import get_default_logger
 
 T_resp = Union[Response, T_resp_json]
@@ -485,6 +486,8 @@ class AtlassianRestAPI(object):
         absolute: bool = False,
         advanced_mode: bool = False,
         allow_redirects: bool = True,
+        progress_callback: Optional[T_progress_callback] = None,
+        stream: bool = False,
     ) -> Response:
         """
 
@@ -495,10 +498,14 @@ class AtlassianRestAPI(object):
         :param flags:
         :param params:
         :param headers:
-        :param files:
+        :param files: OPTIONAL: multipart files, streamed from disk instead of loaded into memory
         :param trailing: bool - OPTIONAL: Add trailing slash to url
         :param absolute: bool, OPTIONAL: Do not prefix url, url is absolute
         :param advanced_mode: bool, OPTIONAL: Return the raw response
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` called while
+            a multipart upload is sent. ``total_bytes`` is None if a file size is unknown.
+        :param stream: bool, OPTIONAL: Do not read the response body, e.g. to read a download
+            with ``iter_content``; the caller closes the response
         :return:
         """
         url = self.url_joiner(None if absolute else self.url, path, trailing)
@@ -518,24 +525,32 @@ class AtlassianRestAPI(object):
             json_dump = None if json is None else dumps(json)
 
         headers = headers or self.default_headers
+        if files:
+            # The multipart encoder supplies its own boundary, which must not
+            # be shadowed by a JSON (or any other) content type.
+            headers = {key: value for key, value in headers.items() if key.lower() != "content-type"}
 
-        # ``requests`` reads file-like multipart values when preparing a
-        # request. Reset them before every attempt so a retry cannot upload an
+        # Multipart bodies are streamed from the file objects while they are
+        # sent. Reset them before every attempt so a retry cannot upload an
         # already-consumed, zero-byte file.
         file_positions = []
         if files:
             for upload in files.values():
-                stream = upload[1] if isinstance(upload, (tuple, list)) and len(upload) > 1 else upload
-                if hasattr(stream, "seek") and hasattr(stream, "tell"):
+                upload_file = upload[1] if isinstance(upload, (tuple, list)) and len(upload) > 1 else upload
+                if hasattr(upload_file, "seek") and hasattr(upload_file, "tell"):
                     try:
-                        file_positions.append((stream, stream.tell()))
+                        file_positions.append((upload_file, upload_file.tell()))
                     except (OSError, ValueError):
                         pass
 
         retry_handler = self._retry_handler()
         while True:
-            for stream, position in file_positions:
-                stream.seek(position)
+            for upload_file, position in file_positions:
+                upload_file.seek(position)
+            body = None
+            if files:
+                body = MultipartEncoder(files, data=data, callback=progress_callback)
+                headers["Content-Type"] = body.content_type
             self.log_curl_debug(
                 method=method,
                 url=url,
@@ -550,24 +565,27 @@ class AtlassianRestAPI(object):
                 method=method,
                 url=url,
                 headers=headers,
-                data=request_data,
+                data=request_data if body is None else body,
                 json=json,
                 timeout=self.timeout,
                 verify=self.verify_ssl,
-                files=files,
                 proxies=self.proxies,
                 cert=self.cert,
                 allow_redirects=allow_redirects,
+                stream=stream,
             )
             continue_retries = retry_handler(response)
             if continue_retries:
+                if stream:
+                    response.close()
                 continue
             break
 
         response.encoding = "utf-8"
 
         log.debug("HTTP: %s %s -> %s %s", method, path, response.status_code, response.reason)
-        log.debug("HTTP: Response text -> %s", response.text)
+        if not stream:
+            log.debug("HTTP: Response text -> %s", response.text)
 
         if self.advanced_mode or advanced_mode:
             return response
@@ -749,6 +767,7 @@ class AtlassianRestAPI(object):
         trailing: Optional[bool] = ...,
         absolute: bool = ...,
         advanced_mode: Literal[False] = ...,
+        progress_callback: Optional[T_progress_callback] = ...,
     ) -> T_resp_json:
         ...  # fmt: skip
 
@@ -765,6 +784,7 @@ class AtlassianRestAPI(object):
         absolute: bool = ...,
         *,
         advanced_mode: Literal[False] = ...,
+        progress_callback: Optional[T_progress_callback] = ...,
     ) -> T_resp_json:
         ...  # fmt: skip
 
@@ -780,6 +800,7 @@ class AtlassianRestAPI(object):
         trailing: Optional[bool] = ...,
         absolute: bool = ...,
         advanced_mode: Literal[False] = ...,
+        progress_callback: Optional[T_progress_callback] = ...,
     ) -> T_resp_json:
         ...  # fmt: skip
 
@@ -797,6 +818,7 @@ class AtlassianRestAPI(object):
         absolute: bool = ...,
         *,
         advanced_mode: Literal[True],
+        progress_callback: Optional[T_progress_callback] = ...,
     ) -> Response:
         ...  # fmt: skip
 
@@ -813,6 +835,7 @@ class AtlassianRestAPI(object):
         trailing: Optional[bool] = ...,
         absolute: bool = ...,
         advanced_mode: bool = ...,
+        progress_callback: Optional[T_progress_callback] = ...,
     ) -> Union[Response, dict, None]:
         ...  # fmt: skip
 
@@ -827,6 +850,7 @@ class AtlassianRestAPI(object):
         trailing: Optional[bool] = None,
         absolute: bool = False,
         advanced_mode: bool = False,
+        progress_callback: Optional[T_progress_callback] = None,
     ) -> Union[Response, dict, None]:
         """
         :param path:
@@ -838,6 +862,7 @@ class AtlassianRestAPI(object):
         :param trailing:
         :param absolute:
         :param advanced_mode: bool, OPTIONAL: Return the raw response
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` for multipart uploads
         :return: if advanced_mode is not set - returns dictionary. If it is set - returns raw response.
         """
         response = self.request(
@@ -851,6 +876,7 @@ class AtlassianRestAPI(object):
             trailing=trailing,
             absolute=absolute,
             advanced_mode=advanced_mode,
+            progress_callback=progress_callback,
         )
         if self.advanced_mode or advanced_mode:
             return response
@@ -869,6 +895,7 @@ class AtlassianRestAPI(object):
         absolute: bool = ...,
         *,
         advanced_mode: Literal[False],
+        progress_callback: Optional[T_progress_callback] = ...,
     ) -> T_resp_json:
         ...  # fmt: skip
 
@@ -883,6 +910,7 @@ class AtlassianRestAPI(object):
         params: Optional[dict] = ...,
         absolute: bool = ...,
         advanced_mode: Literal[False] = ...,
+        progress_callback: Optional[T_progress_callback] = ...,
     ) -> T_resp_json:
         ...  # fmt: skip
 
@@ -899,6 +927,7 @@ class AtlassianRestAPI(object):
         absolute: bool = ...,
         *,
         advanced_mode: Literal[True],
+        progress_callback: Optional[T_progress_callback] = ...,
     ) -> Response:
         ...  # fmt: skip
 
@@ -914,6 +943,7 @@ class AtlassianRestAPI(object):
         params: Optional[dict] = ...,
         absolute: bool = ...,
         advanced_mode: bool = ...,
+        progress_callback: Optional[T_progress_callback] = ...,
     ) -> Union[Response, dict, None]:
         ...  # fmt: skip
 
@@ -927,6 +957,7 @@ class AtlassianRestAPI(object):
         params: Optional[dict] = None,
         absolute: bool = False,
         advanced_mode: bool = False,
+        progress_callback: Optional[T_progress_callback] = None,
     ) -> Union[Response, dict, None]:
         """
         :param path: Path of request
@@ -937,6 +968,7 @@ class AtlassianRestAPI(object):
         :param params:
         :param absolute:
         :param advanced_mode: bool, OPTIONAL: Return the raw response
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` for multipart uploads
         :return: if advanced_mode is not set - returns dictionary. If it is set - returns raw response.
         """
         response = self.request(
@@ -949,6 +981,7 @@ class AtlassianRestAPI(object):
             trailing=trailing,
             absolute=absolute,
             advanced_mode=advanced_mode,
+            progress_callback=progress_callback,
         )
         if self.advanced_mode or advanced_mode:
             return response
@@ -969,6 +1002,7 @@ class AtlassianRestAPI(object):
         params: Optional[dict] = None,
         absolute: bool = False,
         advanced_mode: bool = False,
+        progress_callback: Optional[T_progress_callback] = None,
     ) -> T_resp:
         """
         :param path: Path of request
@@ -979,6 +1013,7 @@ class AtlassianRestAPI(object):
         :param params:
         :param absolute:
         :param advanced_mode: bool, OPTIONAL: Return the raw response
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` for multipart uploads
         :return: if advanced_mode is not set - returns dictionary. If it is set - returns raw response.
         """
         response = self.request(
@@ -991,6 +1026,7 @@ class AtlassianRestAPI(object):
             trailing=trailing,
             absolute=absolute,
             advanced_mode=advanced_mode,
+            progress_callback=progress_callback,
         )
         if self.advanced_mode or advanced_mode:
             return response
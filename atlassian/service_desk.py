@@ -584,11 +584,12 @@ class ServiceDesk(AtlassianRestAPI):
             comment=comment,
         )
 
-    def attach_temporary_file(self, service_desk_id, filename):
+    def attach_temporary_file(self, service_desk_id, filename, progress_callback=None):
         """
         Create temporary attachment, which can later be converted into permanent attachment
         :param service_desk_id: str
         :param filename: str
+        :param progress_callback: OPTIONAL: ``callback(bytes_sent, total_bytes)`` called during the upload
         :return: Temporary Attachment ID
         """
         url = f"rest/servicedeskapi/servicedesk/{service_desk_id}/attachTemporaryFile"
@@ -603,16 +604,13 @@ class ServiceDesk(AtlassianRestAPI):
             # bug https://github.com/atlassian-api/atlassian-python-api/issues/1056
             # in advanced_mode it returns the raw response therefore .json() is needed
             # in normal mode this is not needed and would fail
+            response = self.post(
+                path=url, headers=experimental_headers, files={"file": file}, progress_callback=progress_callback
+            )
             if self.advanced_mode:
-                result = (
-                    self.post(path=url, headers=experimental_headers, files={"file": file})
-                    .json()
-                    .get("temporaryAttachments")
-                )
+                result = response.json().get("temporaryAttachments")
             else:
-                result = self.post(path=url, headers=experimental_headers, files={"file": file}).get(
-                    "temporaryAttachments"
-                )
+                result = response.get("temporaryAttachments")
             temp_attachment_id = result[0].get("temporaryAttachmentId")
 
             return temp_attachment_id
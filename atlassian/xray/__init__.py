@@ -762,9 +762,14 @@ class Xray(AtlassianRestAPI):
         """Import an Xray JSON test execution result."""
         return self.post(self.resource_url("import/execution"), data=data)
 
-    def import_test_execution_multipart(self, files=None, data=None):
+    def import_test_execution_multipart(self, files=None, data=None, progress_callback=None):
         """Import an Xray test execution using multipart form data."""
-        return self.post(self.resource_url("import/execution/multipart"), data=data, files=files)
+        return self.post(
+            self.resource_url("import/execution/multipart"),
+            data=data,
+            files=files,
+            progress_callback=progress_callback,
+        )
 
     def export_dataset(self, **filters):
         """Export a dataset as CSV using the supplied v2 filters."""
@@ -0,0 +1,20 @@
+# coding: utf-8
+"""
+Pure Python reference workload.
+
+``benchmarks/compare.py`` divides every timing by this benchmark so a
+baseline recorded on one machine can be checked on another.
+"""
+
+
+def _workload():
+    total = 0
+    values = {}
+    for index in range(20000):
+        values[str(index)] = index
+        total += len(str(index)) * index
+    return total, sorted(values)[:10]
+
+
+def test_calibration(benchmark):
+    benchmark(_workload)
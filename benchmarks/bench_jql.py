@@ -0,0 +1,44 @@
+# coding: utf-8
+"""
+Benchmarks for client-side JQL evaluation against the ``jql/match`` round trip
+it replaces, over 1000 synthetic issues already held in memory. The stand-in
+server answers after 50 ms, a typical Jira Cloud round trip.
+"""
+
+import datetime
+
+from atlassian import Jira
+from atlassian.jira.jql import JqlContext, match_issues, parse_jql
+from tests.stand_in_server import synthetic_issue
+
+ISSUES = [synthetic_issue(index) for index in range(1000)]
+JQL = (
+    'project = BENCH AND status in ("To Do", "In Progress") AND assignee != currentUser() '
+    "AND labels = team-1 AND updated >= -14d ORDER BY priority DESC, key"
+)
+ROUND_TRIP = 0.05
+CONTEXT = JqlContext(current_user="user-1", now=datetime.datetime(2024, 2, 20, tzinfo=datetime.timezone.utc))
+
+
+def test_jql_parse(benchmark):
+    query = benchmark(parse_jql, JQL)
+
+    assert query.supported
+
+
+def test_jql_match_local(benchmark):
+    query = parse_jql(JQL)
+
+    matched = benchmark(query.filter, ISSUES, CONTEXT)
+
+    assert matched
+
+
+def test_jql_match_server(benchmark, stand_in):
+    stand_in.latency = ROUND_TRIP
+    jira = Jira(url=stand_in.url, username="user", password="pass", cloud=True)
+    query = parse_jql('issue in linkedIssues("BENCH-1")')
+
+    matched = benchmark(match_issues, query, ISSUES, CONTEXT, client=jira)
+
+    assert len(matched) == len(ISSUES)
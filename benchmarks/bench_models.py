@@ -0,0 +1,66 @@
+# coding: utf-8
+"""
+Benchmarks for the atlassian.models.jira dataclasses
+"""
+
+import gc
+import json
+import tracemalloc
+
+from atlassian.models.jira import CompactIssue, JiraIssue, bulk_serialize, serialize
+from tests.stand_in_server import synthetic_issue
+
+PAYLOADS = [synthetic_issue(index) for index in range(500)]
+
+
+def footprint(parse, count=5000):
+    """Bytes retained per issue parsed from freshly decoded JSON, as after a search."""
+    text = json.dumps([synthetic_issue(index) for index in range(count)])
+    payloads = json.loads(text)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        issues = [parse(payload) for payload in payloads]
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert len(issues) == count
+    return retained / count
+
+
+def test_from_dict(benchmark):
+    issues = benchmark(lambda: [JiraIssue.from_dict(payload) for payload in PAYLOADS])
+
+    assert len(issues) == len(PAYLOADS)
+
+
+def test_compact_from_dict(benchmark):
+    issues = benchmark(lambda: [CompactIssue.from_dict(payload) for payload in PAYLOADS])
+
+    assert len(issues) == len(PAYLOADS)
+
+
+def test_footprint_per_issue(benchmark):
+    full = footprint(JiraIssue.from_dict)
+    compact = benchmark.pedantic(footprint, args=(CompactIssue.from_dict,), rounds=1)
+    benchmark.extra_info.update(full_bytes=round(full), compact_bytes=round(compact))
+
+    # Summaries and descriptions are shared with the payloads; the models themselves shrink
+    assert compact < full * 0.6
+
+
+def test_serialize(benchmark):
+    issue = JiraIssue.from_dict(PAYLOADS[0])
+
+    result = benchmark(serialize, issue)
+
+    assert result["fields"]["summary"] == "Synthetic issue 1"
+
+
+def test_bulk_serialize(benchmark):
+    issues = [JiraIssue.from_dict(payload) for payload in PAYLOADS]
+
+    result = benchmark(bulk_serialize, issues)
+
+    assert len(result) == len(PAYLOADS)
@@ -0,0 +1,61 @@
+# coding: utf-8
+"""
+Benchmarks for every ``_get_paged`` implementation, each draining a
+2000 item synthetic collection in pages of 100 from the stand-in server.
+"""
+
+import pytest
+
+from atlassian import Bitbucket, Jira
+from atlassian.bitbucket.cloud.base import BitbucketCloudBase
+from atlassian.bitbucket.server import Server as BitbucketServer
+from atlassian.confluence import ConfluenceCloud, ConfluenceServer
+from atlassian.confluence.server.confluence_server import ConfluenceServer as ConfluenceServerV1
+
+from .conftest import DATASET_SIZE, PAGE_SIZE
+
+
+def jira_cloud(url):
+    jira = Jira(url=url, username="user", password="pass", cloud=True)
+    return jira._get_paged(jira.resource_url("project/search"), params={"maxResults": PAGE_SIZE})
+
+
+def confluence_legacy(url):
+    confluence = ConfluenceServer(url=url, username="user", password="pass")
+    return confluence.get_all_pages_from_space("BENCH", limit=PAGE_SIZE)
+
+
+def confluence_v1(url):
+    confluence = ConfluenceServerV1(url=url, username="user", password="pass")
+    return confluence._get_paged("rest/api/content", params={"limit": PAGE_SIZE})
+
+
+def confluence_v2(url):
+    confluence = ConfluenceCloud(url=url, username="user", password="pass")
+    return confluence._get_paged("api/v2/pages", params={"limit": PAGE_SIZE})
+
+
+def bitbucket_legacy(url):
+    bitbucket = Bitbucket(url=url, username="user", password="pass")
+    return bitbucket.project_list(limit=PAGE_SIZE)
+
+
+def bitbucket_server(url):
+    bitbucket = BitbucketServer(url, username="user", password="pass")
+    return bitbucket.projects._get_paged(None, params={"limit": PAGE_SIZE})
+
+
+def bitbucket_cloud(url):
+    repositories = BitbucketCloudBase(f"{url}/2.0/repositories/bench", username="user", password="pass")
+    return repositories._get_paged(None, params={"pagelen": PAGE_SIZE})
+
+
+@pytest.mark.parametrize(
+    "pager",
+    [jira_cloud, confluence_legacy, confluence_v1, confluence_v2, bitbucket_legacy, bitbucket_server, bitbucket_cloud],
+    ids=lambda pager: pager.__name__,
+)
+def test_get_paged(benchmark, stand_in, pager):
+    items = benchmark(lambda: list(pager(stand_in.url)))
+
+    assert len(items) == DATASET_SIZE
@@ -0,0 +1,51 @@
+# coding: utf-8
+"""
+Benchmarks for response decoding and HTML/XML parsing
+"""
+
+import json
+
+import pytest
+
+from atlassian import Crowd
+from atlassian.confluence import ConfluenceServer
+from tests.mockup import load_fixture
+from tests.stand_in_server import synthetic_issue
+
+FIXTURES = [
+    ("jira/rest/agile/1.0/epic/none/issue", "GET", "fields=*all"),
+    ("bitbucket/cloud/2.0/repositories/TestWorkspace1/testrepository1/pullrequests", "GET", None),
+]
+
+
+@pytest.mark.parametrize("path, method, key", FIXTURES, ids=lambda value: str(value).split("/")[-1])
+def test_json_decode_fixture(benchmark, path, method, key):
+    response = load_fixture(path, method, key)
+    assert response.status_code == 200
+
+    benchmark(response.json)
+
+
+def test_json_decode_search_page(benchmark):
+    content = json.dumps({"startAt": 0, "total": 1000, "issues": [synthetic_issue(i) for i in range(1000)]})
+
+    page = benchmark(json.loads, content)
+
+    assert len(page["issues"]) == 1000
+
+
+def test_confluence_get_tables_from_page(benchmark, stand_in):
+    confluence = ConfluenceServer(url=stand_in.url, username="user", password="pass")
+
+    result = benchmark(confluence.get_tables_from_page, 123456)
+
+    assert result["number_of_tables_in_page"] == 25
+
+
+def test_crowd_memberships(benchmark, stand_in):
+    pytest.importorskip("lxml")
+    crowd = Crowd(url=stand_in.url, username="app", password="secret")
+
+    memberships = benchmark(lambda: crowd.memberships)
+
+    assert len(memberships) == stand_in.dataset_size
@@ -0,0 +1,55 @@
+# coding: utf-8
+"""
+Benchmarks for request building and dispatch in atlassian.rest_client
+"""
+
+from requests import Response, Session
+
+from atlassian import Jira
+from atlassian.rest_client import AtlassianRestAPI
+
+
+class CannedSession(Session):
+    """Session answering every request with the same response without network I/O."""
+
+    def request(self, method, url, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response.encoding = "utf-8"
+        response._content = b'{"ok": true}'
+        response.url = url
+        return response
+
+
+def test_request_overhead(benchmark):
+    api = AtlassianRestAPI(url="https://example.test", session=CannedSession())
+
+    result = benchmark(api.get, "rest/api/2/myself", params={"expand": "groups"})
+
+    assert result == {"ok": True}
+
+
+def test_request_round_trip(benchmark, stand_in):
+    jira = Jira(url=stand_in.url, username="user", password="pass")
+
+    page = benchmark(jira.jql, "project = BENCH", limit=10, fields="summary")
+
+    assert len(page["issues"]) == 10
+
+
+def test_url_joiner(benchmark):
+    def join():
+        for _ in range(100):
+            AtlassianRestAPI.url_joiner("https://example.test/jira/", "/rest/api/2/issue/FOO-1", trailing=True)
+
+    benchmark(join)
+
+
+def test_resource_url(benchmark):
+    jira = Jira(url="https://example.test", username="user", password="pass")
+
+    def build():
+        for _ in range(100):
+            jira.resource_url("issue/FOO-1/transitions")
+
+    benchmark(build)
@@ -0,0 +1,37 @@
+# coding: utf-8
+"""
+Benchmarks for the JQL content scanner: the descriptions of the 2000 stand-in
+issues are streamed from the search endpoint and matched in the calling
+process, and in a pool of two worker processes, whose start-up is included.
+The pool pays off once matching, not the search, dominates the run time.
+"""
+
+from atlassian import Jira
+from atlassian.jira.scanning import ContentScanner
+
+PATTERNS = {
+    "issue number": r"issue \d+\.",
+    "assignment": r"\b\w+(?:\s+\w+){2,}\s*=\s*['\"][^'\"]{8,}['\"]",
+    "token": r"(?i)\b(?:password|secret|token)\w*\s*[:=]\s*\S{8,}",
+}
+
+
+def scan(jira, processes):
+    scanner = ContentScanner(jira, PATTERNS, processes=processes, batch_size=64 * 1024)
+    return list(scanner.scan("project = BENCH"))
+
+
+def test_scan_inline(benchmark, stand_in):
+    jira = Jira(url=stand_in.url, username="user", password="pass")
+
+    hits = benchmark.pedantic(scan, args=(jira, 0), rounds=3)
+
+    assert len(hits) == 4 * 2000
+
+
+def test_scan_process_pool(benchmark, stand_in):
+    jira = Jira(url=stand_in.url, username="user", password="pass")
+
+    hits = benchmark.pedantic(scan, args=(jira, 2), rounds=3)
+
+    assert len(hits) == 4 * 2000
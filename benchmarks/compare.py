@@ -0,0 +1,95 @@
+# coding: utf-8
+"""
+Compare a pytest-benchmark JSON report with the stored baseline.
+
+The fastest round of every benchmark is divided by the ``test_calibration``
+benchmark of the same run before it is compared, so a baseline recorded on one machine can gate a
+CI runner of different speed. Benchmarks that go through the loopback
+network are noisier than pure Python ones, hence the generous default
+threshold. The script exits with status 1 when any
+benchmark is slower than the baseline by more than the threshold.
+
+Usage::
+
+    python -m pytest benchmarks --benchmark-json=.benchmarks/current.json
+    python -m benchmarks.compare .benchmarks/current.json --threshold 0.5
+    python -m benchmarks.compare .benchmarks/current.json --update
+"""
+
+import argparse
+import json
+import os
+import sys
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+CALIBRATION = "test_calibration"
+DEFAULT_THRESHOLD = 0.5
+
+
+def load_report(path, statistic="min"):
+    """Return ``{benchmark name: timing}`` from a pytest-benchmark JSON report."""
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {benchmark["name"]: benchmark["stats"][statistic] for benchmark in report["benchmarks"]}
+
+
+def normalize(timings, calibration=CALIBRATION):
+    """Express every timing as a multiple of the calibration benchmark."""
+    if calibration not in timings:
+        raise ValueError(f"The report does not contain the calibration benchmark [{calibration}]")
+    reference = timings[calibration]
+    return {name: value / reference for name, value in timings.items() if name != calibration}
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Return ``(regressions, missing)`` comparing two normalized timing maps.
+
+    ``regressions`` lists ``(name, baseline, current, change)`` tuples for
+    benchmarks slower than ``baseline * (1 + threshold)``. ``missing`` lists
+    baseline benchmarks absent from the current run.
+    """
+    regressions = []
+    for name, current_value in sorted(current.items()):
+        baseline_value = baseline.get(name)
+        if baseline_value is None:
+            continue
+        change = current_value / baseline_value - 1
+        if change > threshold:
+            regressions.append((name, baseline_value, current_value, change))
+    missing = sorted(set(baseline) - set(current))
+    return regressions, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a benchmark run against the stored baseline")
+    parser.add_argument("report", help="pytest-benchmark JSON report (--benchmark-json)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, 0.5 = 50%%")
+    parser.add_argument("--statistic", default="min", choices=("min", "median", "mean"))
+    parser.add_argument("--update", action="store_true", help="store the report as the new baseline")
+    args = parser.parse_args(argv)
+
+    current = normalize(load_report(args.report, args.statistic))
+    if args.update:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"statistic": args.statistic, "benchmarks": current}, f, indent=4, sort_keys=True)
+            f.write("\n")
+        print(f"Stored {len(current)} benchmarks in {args.baseline}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["benchmarks"]
+    regressions, missing = compare(baseline, current, args.threshold)
+    for name in missing:
+        print(f"MISSING  {name}")
+    for name, baseline_value, current_value, change in regressions:
+        print(f"SLOWER   {name}: {baseline_value:.4f} -> {current_value:.4f} (+{change:.0%})")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    print(f"{len(current)} benchmarks within {args.threshold:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+# coding: utf-8
+"""
+Fixtures for the performance benchmarks.
+
+The benchmarks talk to :class:`tests.stand_in_server.StandInServer` over real
+sockets, so the global ``Session.request`` mock installed by ``tests/mockup.py``
+is undone for the whole benchmark session.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from tests.mockup import REAL_SESSION_REQUEST
+from tests.stand_in_server import StandInServer
+
+DATASET_SIZE = 2000
+PAGE_SIZE = 100
+
+
+@pytest.fixture(scope="session")
+def stand_in():
+    with patch("requests.Session.request", REAL_SESSION_REQUEST):
+        with StandInServer(dataset_size=DATASET_SIZE, max_page_size=PAGE_SIZE, tables_per_page=25) as server:
+            yield server
+
+
+@pytest.fixture(autouse=True)
+def _reset_stand_in(request):
+    if "stand_in" in request.fixturenames:
+        request.getfixturevalue("stand_in").reset()
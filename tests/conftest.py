@@ -7,7 +7,8 @@ import pytest
 from unittest.mock import Mock, patch
 
 # Import mockup server for testing
-from .mockup import mockup_server
+from .mockup import REAL_SESSION_REQUEST, mockup_server
+from .stand_in_server import StandInServer
 
 
 @pytest.fixture(scope="session")
@@ -16,6 +17,36 @@ def mock_server_url():
     return mockup_server()
 
 
+@pytest.fixture(scope="session")
+def _stand_in_server():
+    with StandInServer(dataset_size=250) as server:
+        yield server
+
+
+@pytest.fixture
+def stand_in_server(_stand_in_server):
+    """Fixture providing a local HTTP stand-in server reached through real sockets."""
+    _stand_in_server.reset()
+    with patch("requests.Session.request", REAL_SESSION_REQUEST):
+        yield _stand_in_server
+
+
+class FakeClock:
+    """Monotonic clock standing in for ``time.monotonic``; tests move it by setting ``now``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fixture providing a fake monotonic clock for TTL caches, starting at 0."""
+    return FakeClock()
+
+
 @pytest.fixture
 def mock_response():
     """Fixture providing a mock response object."""
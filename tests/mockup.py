@@ -13,19 +13,16 @@ def mockup_server():
     return SERVER
 
 
-def request_mockup(*args, **kwargs):
-    method = kwargs["method"]
-    url = kwargs["url"]
-    if not url.startswith(SERVER + "/"):
-        raise ValueError(f"URL [{url}] does not start with [{SERVER}/].")
-    parts = url[len(SERVER) + 1 :].split("?")
-    url = parts[0]
-    response_key = parts[1] if len(parts) > 1 else None
-    if kwargs["data"] is not None:
-        response_key = str(kwargs["data"])
+def load_fixture(url, method, response_key, server=SERVER):
+    """Load a canned response from ``tests/responses``.
 
+    :param url: Request path relative to the server, without the query string
+    :param method: HTTP method, which is also the fixture file name
+    :param response_key: Query string or request body selecting the response
+    :param server: Base URL prepended to relative links of paged responses
+    :return: A ``requests.Response``
+    """
     response = Response()
-    response.url = kwargs["url"]
 
     response_file = os.path.join(RESPONSE_ROOT, url, method)
     try:
@@ -49,9 +46,9 @@ def request_mockup(*args, **kwargs):
                         if "links" in cur_dict:
                             for link in list(cur_dict["links"].values()):
                                 for ld in link if type(link) is list else [link]:
-                                    ld["href"] = f"{SERVER}/{ld['href']}"
+                                    ld["href"] = f"{server}/{ld['href']}"
                 if "next" in data:
-                    data["next"] = f"{SERVER}/{data['next']}"
+                    data["next"] = f"{server}/{data['next']}"
 
                 response.encoding = "utf-8"
                 response._content = bytes(json.dumps(data), response.encoding)
@@ -79,5 +76,24 @@ def request_mockup(*args, **kwargs):
     return response
 
 
+def request_mockup(*args, **kwargs):
+    method = kwargs["method"]
+    url = kwargs["url"]
+    if not url.startswith(SERVER + "/"):
+        raise ValueError(f"URL [{url}] does not start with [{SERVER}/].")
+    parts = url[len(SERVER) + 1 :].split("?")
+    url = parts[0]
+    response_key = parts[1] if len(parts) > 1 else None
+    if kwargs["data"] is not None:
+        response_key = str(kwargs["data"])
+
+    response = load_fixture(url, method, response_key)
+    response.url = kwargs["url"]
+    return response
+
+
+# Tests exercising real sockets (see ``tests/stand_in_server.py``) need the
+# unpatched implementation.
+REAL_SESSION_REQUEST = Session.request
 Session.request = Mock()
 Session.request.side_effect = request_mockup
@@ -0,0 +1,657 @@
+# coding: utf-8
+"""
+Local Atlassian stand-in HTTP server.
+
+``tests/mockup.py`` replaces ``Session.request`` and therefore never opens a
+socket. This module serves the same ``tests/responses`` fixtures over real
+HTTP, together with synthetic paginated datasets of configurable size, so
+connection pooling, concurrency, streaming, latency and throttling can be
+exercised and benchmarked without network access.
+
+Synthetic endpoints (all paths may be prefixed, e.g. with ``/wiki`` or ``/jira``):
+
+* ``GET|POST rest/api/2/search`` - Jira Server/DC ``startAt``/``total`` search; ``key in (...)`` selects
+  issues and answers ``400`` for unknown keys unless ``validateQuery`` is ``warn`` or ``false``.
+  Keys match regardless of case, and ``OLD-<n>`` is the key ``BENCH-<n>`` had before it was moved
+* ``GET rest/api/3/search/jql`` - Jira Cloud enhanced search (``nextPageToken``); ``key in (...)``
+  is always validated strictly
+* ``GET rest/api/{2,3}/issue/<key>`` - a single ``BENCH`` or ``OLD`` issue by key
+* ``GET rest/api/{2,3}/project/search`` - Jira Cloud ``isLast``/``nextPage`` paging
+* ``POST rest/api/{2,3}/issue/bulk`` - bulk issue creation
+* ``POST rest/api/{2,3}/issue/bulkfetch`` - issues by id or key
+* ``POST rest/api/{2,3}/worklog/list`` - worklogs by id
+* ``POST rest/api/{2,3}/changelog/bulkfetch`` - status and assignee histories paged with ``nextPageToken``
+* ``GET rest/api/{2,3}/worklog/{updated,deleted}`` - ``since``/``nextPage`` change feeds,
+  every tenth worklog is reported as deleted
+* ``GET secure/attachment/<id>/<name>`` - ``attachment_size(id)`` bytes of binary content
+* ``POST rest/api/{2,3}/jql/match`` - every known issue id matches every JQL
+* ``POST rest/api/{2,3}/search/approximate-count`` - every JQL matches the whole dataset
+* ``GET sr/jira.issueviews:searchrequest-{csv,excel}-...`` - ``tempMax``/``pager/start`` navigator exports;
+  issues 120, 240, ... are in two sprints, so windows holding them have two ``Sprint`` columns
+* ``GET rest/api/content`` - Confluence ``start``/``limit`` with ``_links.next``
+* ``GET rest/api/content/<id>`` - Confluence page whose storage body holds HTML tables
+* ``GET api/v2/pages`` - Confluence Cloud v2 cursor pagination
+* ``GET rest/usermanagement/<version>/group/membership`` - Crowd memberships as XML
+* ``GET rest/api/1.0/projects`` and ``.../repos`` - Bitbucket Server ``nextPageStart``
+* ``GET 2.0/repositories/<workspace>`` - Bitbucket Cloud ``next`` links
+
+Any other request is answered from ``tests/responses`` exactly as
+``tests/mockup.py`` would.
+
+Standalone usage::
+
+    python -m tests.stand_in_server --port 8080 --dataset-size 100000 --latency 0.02
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from .mockup import load_fixture
+
+STATUSES = ("To Do", "In Progress", "In Review", "Done")
+ISSUE_TYPES = ("Task", "Bug", "Story", "Epic")
+PRIORITIES = ("Lowest", "Low", "Medium", "High", "Highest")
+WORKLOG_EPOCH = 1704067200000  # 2024-01-01T00:00:00Z in milliseconds
+
+
+def synthetic_issue(index, project="BENCH"):
+    """Return a deterministic issue resembling a Jira REST ``issue`` payload."""
+    number = index + 1
+    day = 1 + index % 28
+    return {
+        "id": str(10000 + index),
+        "key": f"{project}-{number}",
+        "self": f"rest/api/2/issue/{10000 + index}",
+        "fields": {
+            "summary": f"Synthetic issue {number}",
+            "description": f"Generated description for issue {number}. " * 4,
+            "status": {"name": STATUSES[index % len(STATUSES)], "id": str(1 + index % len(STATUSES))},
+            "issuetype": {"name": ISSUE_TYPES[index % len(ISSUE_TYPES)]},
+            "priority": {"name": PRIORITIES[index % len(PRIORITIES)]},
+            "assignee": {"accountId": f"user-{index % 50}", "displayName": f"User {index % 50}"},
+            "labels": [f"label-{index % 7}", f"team-{index % 3}"],
+            "project": {"key": project},
+            "created": f"2024-01-{day:02d}T10:00:00.000+0000",
+            "updated": f"2024-02-{day:02d}T12:30:00.000+0000",
+        },
+    }
+
+
+def synthetic_histories(index):
+    """Return the changelog of ``synthetic_issue(index)``: one status step per history, then an assignee change."""
+    histories = []
+    status = index % len(STATUSES)
+    for step in range(status):
+        histories.append(
+            {
+                "id": str(index * 10 + step),
+                "created": f"2024-01-{1 + index % 28:02d}T{11 + step:02d}:00:00.000+0000",
+                "items": [
+                    {
+                        "field": "status",
+                        "fieldId": "status",
+                        "fromString": STATUSES[step],
+                        "toString": STATUSES[step + 1],
+                    }
+                ],
+            }
+        )
+    histories.append(
+        {
+            "id": str(index * 10 + 9),
+            "created": f"2024-01-{1 + index % 28:02d}T18:00:00.000+0000",
+            "items": [{"field": "assignee", "fieldId": "assignee", "from": None, "to": f"user-{index % 50}"}],
+        }
+    )
+    return histories
+
+
+def attachment_size(attachment_id):
+    """Return the size in bytes of the synthetic attachment ``attachment_id``."""
+    return 1024 * (1 + int(attachment_id) % 64)
+
+
+def select_fields(issue, fields):
+    """Reduce ``issue`` to the requested ``fields`` like the Jira search API does."""
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    if not fields or "*all" in fields or "*navigable" in fields:
+        return issue
+    if list(fields) == ["id"]:
+        return {"id": issue["id"]}
+    selected = {key: issue[key] for key in ("id", "key", "self")}
+    selected["fields"] = {name: value for name, value in issue["fields"].items() if name in fields}
+    return selected
+
+
+class StandInServer(object):
+    """Threaded HTTP server standing in for Jira, Confluence and Bitbucket.
+
+    :param host: Interface to bind, loopback by default.
+    :param port: Port to bind, ``0`` selects a free port.
+    :param dataset_size: Number of items in every synthetic collection.
+    :param max_page_size: Upper bound applied to requested page sizes.
+    :param tables_per_page: Number of 20 row tables in synthetic Confluence pages.
+    :param latency: Seconds to sleep before answering each request.
+    :param throttle_rate: Probability of answering ``429`` with ``Retry-After``.
+    :param error_rate: Probability of answering ``500``.
+    :param retry_after: ``Retry-After`` value sent with throttled responses.
+    :param seed: Seed making the random fault injection reproducible.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        dataset_size=1000,
+        max_page_size=1000,
+        tables_per_page=10,
+        latency=0.0,
+        throttle_rate=0.0,
+        error_rate=0.0,
+        retry_after=0,
+        seed=0,
+    ):
+        self.host = host
+        self.port = port
+        self.dataset_size = dataset_size
+        self.max_page_size = max_page_size
+        self.tables_per_page = tables_per_page
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self._defaults = dict(
+            dataset_size=dataset_size,
+            max_page_size=max_page_size,
+            tables_per_page=tables_per_page,
+            latency=latency,
+            throttle_rate=throttle_rate,
+            error_rate=error_rate,
+            retry_after=retry_after,
+        )
+        self.requests = Counter()
+        self._faults = deque()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._httpd = None
+        self._thread = None
+        self._routes = [
+            ("GET", r"rest/api/2/search", self._jira_search),
+            ("POST", r"rest/api/2/search", self._jira_search),
+            ("GET", r"rest/api/3/search/jql", self._jira_enhanced_search),
+            ("GET", r"rest/api/[23]/project/search", self._jira_project_search),
+            ("POST", r"rest/api/[23]/issue/bulk", self._jira_issue_bulk),
+            ("POST", r"rest/api/[23]/issue/bulkfetch", self._jira_issue_bulkfetch),
+            ("GET", r"rest/api/[23]/issue/(?i:bench|old)-\d+", self._jira_issue),
+            ("POST", r"rest/api/[23]/worklog/list", self._jira_worklog_list),
+            ("POST", r"rest/api/[23]/changelog/bulkfetch", self._jira_changelog_bulkfetch),
+            ("GET", r"rest/api/[23]/worklog/(?:updated|deleted)", self._jira_worklog_feed),
+            ("POST", r"rest/api/[23]/jql/match", self._jira_jql_match),
+            ("POST", r"rest/api/[23]/search/approximate-count", self._jira_approximate_count),
+            (
+                "GET",
+                r"sr/jira\.issueviews:searchrequest-(?:csv|excel)-(?:all|current)-fields/temp/SearchRequest\.(?:csv|xls)",
+                self._jira_navigator_export,
+            ),
+            ("GET", r"secure/attachment/\d+/[^/]+", self._jira_attachment_content),
+            ("GET", r"rest/api/content", self._confluence_content),
+            ("GET", r"rest/api/content/\d+", self._confluence_page),
+            ("GET", r"api/v2/pages", self._confluence_v2_pages),
+            ("GET", r"rest/usermanagement/[^/]+/group/membership", self._crowd_memberships),
+            ("GET", r"rest/api/1\.0/projects(?:/[^/]+/repos)?", self._bitbucket_server_paged),
+            ("GET", r"2\.0/repositories/[^/]+", self._bitbucket_cloud_paged),
+        ]
+
+    # Lifecycle
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        handler = type("StandInHandler", (_Handler,), {"stand_in": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stand-in-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def reset(self):
+        """Clear counters and queued faults and restore the configured defaults."""
+        with self._lock:
+            for name, value in self._defaults.items():
+                setattr(self, name, value)
+            self.requests.clear()
+            self._faults.clear()
+            self._random = random.Random(self.seed)
+
+    # Fault injection
+
+    def inject(self, status, count=1, headers=None, body=None):
+        """Answer the next ``count`` requests with ``status`` instead of their normal response."""
+        with self._lock:
+            for _ in range(count):
+                self._faults.append((status, dict(headers or {}), body))
+
+    def throttle(self, count=1, retry_after=None):
+        """Answer the next ``count`` requests with ``429`` and a ``Retry-After`` header."""
+        seconds = self.retry_after if retry_after is None else retry_after
+        self.inject(429, count, headers={"Retry-After": str(seconds)})
+
+    def _next_fault(self):
+        with self._lock:
+            if self._faults:
+                return self._faults.popleft()
+            if self.throttle_rate and self._random.random() < self.throttle_rate:
+                return 429, {"Retry-After": str(self.retry_after)}, None
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 500, {}, None
+        return None
+
+    # Dispatch
+
+    def handle(self, method, raw_path, body):
+        """Return ``(status, headers, content)`` for one request."""
+        parsed = urlsplit(raw_path)
+        path = parsed.path.lstrip("/")
+        with self._lock:
+            self.requests[f"{method} {path}"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        fault = self._next_fault()
+        if fault is not None:
+            status, headers, fault_body = fault
+            payload = fault_body if fault_body is not None else {"errorMessages": [f"Injected HTTP {status}"]}
+            return status, headers, json.dumps(payload).encode("utf-8")
+
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        for route_method, pattern, handler in self._routes:
+            match = re.fullmatch(rf"(?:.*/)?({pattern})", path)
+            if route_method == method and match:
+                payload = json.loads(body) if body else {}
+                prefix = path[: match.start(1)]
+                result = handler(params, payload, prefix, match.group(1))
+                if isinstance(result, tuple):
+                    status, result = result
+                    return status, {}, json.dumps(result).encode("utf-8")
+                if isinstance(result, bytes):
+                    return 200, {"Content-Type": "application/octet-stream"}, result
+                if isinstance(result, str):
+                    return 200, {"Content-Type": "application/xml"}, result.encode("utf-8")
+                return 200, {}, json.dumps(result).encode("utf-8")
+
+        response_key = body.decode("utf-8") if body else (parsed.query or None)
+        response = load_fixture(path, method, response_key, server=self.url)
+        return response.status_code, dict(response.headers), response.content
+
+    # Synthetic datasets
+
+    def _page(self, start, limit):
+        start = max(0, int(start or 0))
+        limit = max(0, min(int(limit if limit is not None else 50), self.max_page_size))
+        end = min(self.dataset_size, start + limit)
+        return start, limit, end
+
+    def _jira_search(self, params, payload, prefix, path):
+        params = {**params, **payload}
+        keys = re.fullmatch(r"\s*key\s+in\s*\(([^)]*)\)\s*", params.get("jql") or "")
+        if keys:
+            return self._jira_search_keys([key.strip() for key in keys.group(1).split(",")], params)
+        start, limit, end = self._page(params.get("startAt"), params.get("maxResults"))
+        return {
+            "expand": "schema,names",
+            "startAt": start,
+            "maxResults": limit,
+            "total": self.dataset_size,
+            "issues": [select_fields(synthetic_issue(index), params.get("fields")) for index in range(start, end)],
+        }
+
+    def _issue_index(self, key):
+        project, _, number = key.rpartition("-")
+        if project.upper() in ("BENCH", "OLD") and number.isdigit() and 0 < int(number) <= self.dataset_size:
+            return int(number) - 1
+        return None
+
+    def _jira_search_keys(self, keys, params):
+        indexes = []
+        unknown = []
+        for key in keys:
+            index = self._issue_index(key)
+            if index is None:
+                unknown.append(f"An issue with key '{key}' does not exist for field 'key'.")
+            else:
+                indexes.append(index)
+        if unknown and str(params.get("validateQuery", "strict")).lower() not in ("warn", "false"):
+            return 400, {"errorMessages": unknown, "errors": {}}
+        start, limit, _ = self._page(params.get("startAt"), params.get("maxResults"))
+        response = {
+            "startAt": start,
+            "maxResults": limit,
+            "total": len(indexes),
+            "issues": [
+                select_fields(synthetic_issue(index), params.get("fields")) for index in indexes[start : start + limit]
+            ],
+        }
+        if unknown:
+            response["warningMessages"] = unknown
+        return response
+
+    def _jira_enhanced_search(self, params, payload, prefix, path):
+        keys = re.fullmatch(r"\s*key\s+in\s*\(([^)]*)\)\s*", params.get("jql") or "")
+        if keys:
+            response = self._jira_search_keys(
+                [key.strip() for key in keys.group(1).split(",")], {"fields": params.get("fields")}
+            )
+            if isinstance(response, tuple):
+                return response
+            return {"issues": response["issues"], "isLast": True}
+        start, limit, end = self._page(params.get("nextPageToken"), params.get("maxResults"))
+        response = {
+            "issues": [select_fields(synthetic_issue(index), params.get("fields")) for index in range(start, end)],
+            "isLast": end >= self.dataset_size,
+        }
+        if end < self.dataset_size:
+            response["nextPageToken"] = str(end)
+        return response
+
+    def _jira_project_search(self, params, payload, prefix, path):
+        start, limit, end = self._page(params.get("startAt"), params.get("maxResults"))
+        response = {
+            "startAt": start,
+            "maxResults": limit,
+            "total": self.dataset_size,
+            "isLast": end >= self.dataset_size,
+            "values": [
+                {"id": str(index), "key": f"P{index}", "name": f"Project {index}"} for index in range(start, end)
+            ],
+        }
+        if end < self.dataset_size:
+            query = urlencode({**params, "startAt": end, "maxResults": limit})
+            response["nextPage"] = f"{self.url}/{prefix}{path}?{query}"
+        return response
+
+    def _jira_issue_bulk(self, params, payload, prefix, path):
+        with self._lock:
+            first = self.requests["created"]
+            self.requests["created"] += len(payload.get("issueUpdates", []))
+        return {
+            "issues": [
+                {"id": str(20000 + first + offset), "key": f"BULK-{first + offset + 1}"}
+                for offset, _ in enumerate(payload.get("issueUpdates", []))
+            ],
+            "errors": [],
+        }
+
+    def _jira_issue_bulkfetch(self, params, payload, prefix, path):
+        issues = []
+        errors = []
+        for id_or_key in payload.get("issueIdsOrKeys", []):
+            id_or_key = str(id_or_key)
+            index = int(id_or_key.rsplit("-", 1)[-1]) - 1 if "-" in id_or_key else int(id_or_key) - 10000
+            if 0 <= index < self.dataset_size:
+                issues.append(select_fields(synthetic_issue(index), payload.get("fields")))
+            else:
+                errors.append({"issueIdsOrKeys": [id_or_key], "errorMessages": ["Issue does not exist"]})
+        return {"issues": issues, "issueErrors": errors}
+
+    def _jira_issue(self, params, payload, prefix, path):
+        index = self._issue_index(path.rsplit("/", 1)[-1])
+        if index is None:
+            return 404, {
+                "errorMessages": ["Issue does not exist or you do not have permission to see it."],
+                "errors": {},
+            }
+        return select_fields(synthetic_issue(index), params.get("fields"))
+
+    def _jira_changelog_bulkfetch(self, params, payload, prefix, path):
+        field_ids = set(payload.get("fieldIds") or ())
+        entries = []
+        for id_or_key in payload.get("issueIdsOrKeys", []):
+            id_or_key = str(id_or_key)
+            index = int(id_or_key.rsplit("-", 1)[-1]) - 1 if "-" in id_or_key else int(id_or_key) - 10000
+            if 0 <= index < self.dataset_size:
+                for history in synthetic_histories(index):
+                    if not field_ids or any(item["fieldId"] in field_ids for item in history["items"]):
+                        entries.append((str(10000 + index), history))
+        start = int(payload.get("nextPageToken") or 0)
+        end = start + min(int(payload.get("maxResults") or 1000), self.max_page_size)
+        changelogs = []
+        for issue_id, history in entries[start:end]:
+            if not changelogs or changelogs[-1]["issueId"] != issue_id:
+                changelogs.append({"issueId": issue_id, "changeHistories": []})
+            changelogs[-1]["changeHistories"].append(history)
+        response = {"issueChangeLogs": changelogs}
+        if end < len(entries):
+            response["nextPageToken"] = str(end)
+        return response
+
+    def _jira_worklog_list(self, params, payload, prefix, path):
+        return [
+            {
+                "id": str(worklog_id),
+                "issueId": str(10000 + int(worklog_id) % self.dataset_size),
+                "timeSpentSeconds": 3600,
+            }
+            for worklog_id in payload.get("ids", [])
+            if 0 <= int(worklog_id) < self.dataset_size
+        ]
+
+    def _jira_worklog_feed(self, params, payload, prefix, path):
+        since = int(params.get("since") or 0)
+        deleted = path.endswith("deleted")
+        limit = min(self.max_page_size, 1000)
+        first = max(0, (since - WORKLOG_EPOCH) // 1000 + 1) if since >= WORKLOG_EPOCH else 0
+        values = []
+        index = first
+        while index < self.dataset_size and len(values) < limit:
+            if (index % 10 == 0) == deleted:
+                values.append({"worklogId": index, "updatedTime": WORKLOG_EPOCH + index * 1000, "properties": []})
+            index += 1
+        last_page = index >= self.dataset_size
+        until = values[-1]["updatedTime"] if values else since
+        response = {"values": values, "since": since, "until": until, "lastPage": last_page}
+        if not last_page:
+            response["nextPage"] = f"{self.url}/{prefix}{path}?since={until}"
+        return response
+
+    def _jira_attachment_content(self, params, payload, prefix, path):
+        attachment_id = path.split("/")[2]
+        size = attachment_size(attachment_id)
+        return ((attachment_id.encode("ascii") + b"\n") * size)[:size]
+
+    def _jira_jql_match(self, params, payload, prefix, path):
+        # Every synthetic issue matches; only the request cost matters here.
+        known = [issue_id for issue_id in payload.get("issueIds", []) if 0 <= int(issue_id) - 10000 < self.dataset_size]
+        return {"matches": [{"matchedIssues": known, "errors": []} for _ in payload.get("jqls", [])]}
+
+    def _jira_approximate_count(self, params, payload, prefix, path):
+        return {"count": self.dataset_size}
+
+    def _jira_navigator_export(self, params, payload, prefix, path):
+        start = max(0, int(params.get("pager/start") or 0))
+        end = min(self.dataset_size, start + min(int(params.get("tempMax") or 1000), 1000, self.max_page_size))
+        issues = [synthetic_issue(index) for index in range(start, end)]
+        sprints = [
+            [f"Sprint {index % 5}"] + ([f"Sprint {index % 5 + 1}"] if index % 120 == 119 else [])
+            for index in range(start, end)
+        ]
+        if path.endswith(".xls"):
+            rows = "".join(f"<tr><td>{issue['key']}</td><td>{issue['fields']['summary']}</td></tr>" for issue in issues)
+            table = f'<table id="issuetable"><thead><tr><th>Key</th><th>Summary</th></tr></thead><tbody>{rows}</tbody></table>'
+            return f"<html><body>{table}</body></html>".encode("utf-8")
+        columns = max((len(names) for names in sprints), default=1)
+        delimiter = params.get("delimiter") or ","
+        output = io.StringIO()
+        writer = csv.writer(output, delimiter=delimiter)
+        writer.writerow(["Summary", "Issue key", "Issue id", "Labels", "Labels"] + ["Sprint"] * columns)
+        for issue, names in zip(issues, sprints):
+            fields = issue["fields"]
+            writer.writerow([fields["summary"], issue["key"], issue["id"], *fields["labels"], *names])
+        return output.getvalue().encode("utf-8")
+
+    def _confluence_content(self, params, payload, prefix, path):
+        start, limit, end = self._page(params.get("start"), params.get("limit", 25))
+        response = {
+            "results": [
+                {"id": str(100000 + index), "type": "page", "title": f"Page {index}"} for index in range(start, end)
+            ],
+            "start": start,
+            "limit": limit,
+            "size": end - start,
+            "_links": {"base": self.url, "context": ""},
+        }
+        if end < self.dataset_size:
+            query = urlencode({**params, "start": end, "limit": limit})
+            response["_links"]["next"] = f"/{prefix}{path}?{query}"
+        return response
+
+    def _confluence_page(self, params, payload, prefix, path):
+        page_id = path.rsplit("/", 1)[-1]
+        row = "<tr>" + "".join(f"<td><p>cell {column}</p></td>" for column in range(6)) + "</tr>"
+        header = "<tr>" + "".join(f"<th>Column {column}</th>" for column in range(6)) + "</tr>"
+        table = f"<table><tbody>{header}{row * 20}</tbody></table>"
+        body = "".join(
+            f"<h2>Section {index}</h2><p>Text before table {index}.</p>{table}" for index in range(self.tables_per_page)
+        )
+        return {
+            "id": page_id,
+            "type": "page",
+            "title": f"Page {page_id}",
+            "body": {"storage": {"value": body, "representation": "storage"}},
+        }
+
+    def _confluence_v2_pages(self, params, payload, prefix, path):
+        start, limit, end = self._page(params.get("cursor"), params.get("limit", 25))
+        response = {
+            "results": [{"id": str(100000 + index), "title": f"Page {index}"} for index in range(start, end)],
+            "_links": {"base": self.url},
+        }
+        if end < self.dataset_size:
+            query = urlencode({**params, "cursor": end, "limit": limit})
+            response["_links"]["next"] = f"/{prefix}{path}?{query}"
+        return response
+
+    def _crowd_memberships(self, params, payload, prefix, path):
+        groups = "".join(
+            f'<membership group="group-{index}"><users>'
+            + "".join(f'<user name="user-{(index + member) % self.dataset_size}"/>' for member in range(20))
+            + '</users><groups><group name="nested-group"/></groups></membership>'
+            for index in range(self.dataset_size)
+        )
+        return f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><memberships>{groups}</memberships>'
+
+    def _bitbucket_server_paged(self, params, payload, prefix, path):
+        start, limit, end = self._page(params.get("start"), params.get("limit", 25))
+        response = {
+            "size": end - start,
+            "limit": limit,
+            "start": start,
+            "isLastPage": end >= self.dataset_size,
+            "values": [{"id": index, "key": f"K{index}", "slug": f"slug-{index}"} for index in range(start, end)],
+        }
+        if end < self.dataset_size:
+            response["nextPageStart"] = end
+        return response
+
+    def _bitbucket_cloud_paged(self, params, payload, prefix, path):
+        page = max(1, int(params.get("page", 1)))
+        limit = min(int(params.get("pagelen", 10)), self.max_page_size)
+        start, _, end = self._page((page - 1) * limit, limit)
+        response = {
+            "page": page,
+            "pagelen": limit,
+            "size": self.dataset_size,
+            "values": [{"uuid": f"{{{index}}}", "slug": f"repo-{index}"} for index in range(start, end)],
+        }
+        if end < self.dataset_size:
+            query = urlencode({**params, "page": page + 1, "pagelen": limit})
+            response["next"] = f"{self.url}/{prefix}{path}?{query}"
+        return response
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid delayed-ACK stalls.
+    disable_nagle_algorithm = True
+    stand_in = None
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, content = self.stand_in.handle(self.command, self.path, body)
+        self.send_response(status)
+        headers = {key: value for key, value in headers.items() if key.lower() not in ("content-length", "connection")}
+        headers.setdefault("Content-Type", "application/json;charset=UTF-8")
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Atlassian fixtures and synthetic datasets locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--dataset-size", type=int, default=1000)
+    parser.add_argument("--max-page-size", type=int, default=1000)
+    parser.add_argument("--tables-per-page", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="probability of a 429 response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 500 response")
+    parser.add_argument("--retry-after", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = StandInServer(
+        host=args.host,
+        port=args.port,
+        dataset_size=args.dataset_size,
+        max_page_size=args.max_page_size,
+        tables_per_page=args.tables_per_page,
+        latency=args.latency,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    ).start()
+    print(f"Serving on {server.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
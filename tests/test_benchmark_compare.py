@@ -0,0 +1,44 @@
+# coding: utf-8
+"""
+Tests for the benchmark regression check in benchmarks/compare.py
+"""
+
+import json
+
+import pytest
+
+from benchmarks import compare
+
+
+def write_report(path, timings):
+    report = {
+        "benchmarks": [{"name": name, "stats": {"median": value, "min": value}} for name, value in timings.items()]
+    }
+    path.write_text(json.dumps(report), encoding="utf-8")
+    return str(path)
+
+
+class TestBenchmarkCompare:
+    def test_normalize_divides_by_calibration(self):
+        assert compare.normalize({"test_calibration": 2.0, "test_a": 1.0}) == {"test_a": 0.5}
+
+    def test_normalize_requires_calibration(self):
+        with pytest.raises(ValueError):
+            compare.normalize({"test_a": 1.0})
+
+    def test_compare_reports_regressions_and_missing(self):
+        regressions, missing = compare.compare({"a": 1.0, "b": 1.0, "c": 1.0}, {"a": 1.2, "b": 1.5}, threshold=0.25)
+
+        assert [name for name, *_ in regressions] == ["b"]
+        assert missing == ["c"]
+
+    def test_main_update_then_check(self, tmp_path, capsys):
+        baseline = str(tmp_path / "baseline.json")
+        fast = write_report(tmp_path / "fast.json", {"test_calibration": 1.0, "test_a": 1.0})
+        same_on_slower_machine = write_report(tmp_path / "slow.json", {"test_calibration": 2.0, "test_a": 2.0})
+        regressed = write_report(tmp_path / "regressed.json", {"test_calibration": 1.0, "test_a": 1.5})
+
+        assert compare.main([fast, "--baseline", baseline, "--update"]) == 0
+        assert compare.main([same_on_slower_machine, "--baseline", baseline]) == 0
+        assert compare.main([regressed, "--baseline", baseline, "--threshold", "0.25"]) == 1
+        assert "SLOWER   test_a" in capsys.readouterr().out
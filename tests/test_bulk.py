@@ -0,0 +1,119 @@
+# coding: utf-8
+"""
+Unit tests for atlassian.bulk module
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from requests import HTTPError, Response
+
+from atlassian import Jira, JiraCloud, JiraSoftware
+from atlassian.bulk import BulkWriter, split_issue_bulk_response
+
+
+def http_error(status_code):
+    return HTTPError(f"HTTP {status_code}", response=SimpleNamespace(status_code=status_code))
+
+
+def json_response(status_code, body):
+    response = Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode("utf-8")
+    return response
+
+
+class TestBulkWriter:
+    def test_chunks_unbounded_input_and_merges_results(self):
+        sent = []
+
+        def send(chunk):
+            sent.append(list(chunk))
+            return {"count": len(chunk)}
+
+        report = BulkWriter(send, chunk_size=3, max_workers=2).write(iter(range(8)))
+
+        assert report.ok
+        assert report.chunks == 3
+        assert sorted(len(chunk) for chunk in sent) == [2, 3, 3]
+        assert sorted(item for item, _ in report.successes) == list(range(8))
+
+    def test_classifies_retriable_and_permanent_failures(self):
+        def send(chunk):
+            if chunk[0] == 0:
+                raise http_error(429)
+            if chunk[0] == 2:
+                raise http_error(400)
+            return {}
+
+        report = BulkWriter(send, chunk_size=2).write(range(6))
+
+        assert sorted(report.retriable) == [0, 1]
+        assert sorted(error.item for error in report.failed) == [2, 3]
+        assert sorted(item for item, _ in report.successes) == [4, 5]
+        assert not report.ok
+
+    def test_issue_bulk_partial_failure(self):
+        chunk = [{"fields": {"summary": str(index)}} for index in range(3)]
+        response = {
+            "issues": [{"key": "TEST-1"}, {"key": "TEST-2"}],
+            "errors": [{"status": 400, "failedElementNumber": 1, "elementErrors": {"errors": {"summary": "bad"}}}],
+        }
+
+        successes, errors = split_issue_bulk_response(chunk, response)
+
+        assert successes == [(chunk[0], {"key": "TEST-1"}), (chunk[2], {"key": "TEST-2"})]
+        assert errors[0].item is chunk[1]
+        assert not errors[0].retriable
+
+
+class TestClientBulkHelpers:
+    def test_jira_bulk_create_issues_sends_fifty_per_request(self):
+        jira = Jira("https://jira.example.com")
+        issues = [{"fields": {"summary": str(index)}} for index in range(120)]
+
+        def post(path, data=None, advanced_mode=False):
+            created = [{"key": f"TEST-{index}"} for index, _ in enumerate(data["issueUpdates"])]
+            return json_response(201, {"issues": created, "errors": []})
+
+        with patch.object(jira, "post", side_effect=post) as mock_post:
+            report = jira.bulk_create_issues(issues)
+
+        assert report.ok
+        assert len(report.successes) == 120
+        assert sorted(len(c.kwargs["data"]["issueUpdates"]) for c in mock_post.call_args_list) == [20, 50, 50]
+        assert mock_post.call_args.args[0] == "rest/api/2/issue/bulk"
+
+    def test_jira_cloud_bulk_create_issues_attributes_all_failed_chunk(self):
+        jira = JiraCloud("https://example.atlassian.net")
+        body = {"issues": [], "errors": [{"status": 400, "failedElementNumber": 0}]}
+        with patch.object(jira, "post", return_value=json_response(400, body)):
+            report = jira.bulk_create_issues([{"fields": {}}])
+
+        assert [error.error for error in report.errors] == body["errors"]
+
+    def test_jira_bulk_get_worklogs_reports_missing_ids(self):
+        jira = Jira("https://jira.example.com")
+
+        with patch.object(jira, "get_worklogs", side_effect=lambda ids, expand=None: [{"id": i} for i in ids[:-1]]):
+            report = jira.bulk_get_worklogs(range(1500))
+
+        assert report.chunks == 2
+        assert len(report.successes) == 1498
+        assert sorted(error.item for error in report.errors) == [999, 1499]
+
+    def test_software_bulk_submit_builds_reports_rejections(self):
+        software = JiraSoftware("https://example.atlassian.net")
+        builds = [{"pipelineId": "p", "buildNumber": number} for number in range(150)]
+
+        def submit_builds(data=None):
+            return {"rejectedBuilds": [{"key": {"pipelineId": "p", "buildNumber": 7}, "errors": ["bad"]}]}
+
+        with patch.object(software, "submit_builds", side_effect=submit_builds) as submit:
+            report = software.bulk_submit_builds(builds, provider_metadata={"product": "ci"})
+
+        assert submit.call_count == 2
+        assert all(c.kwargs["data"]["providerMetadata"] == {"product": "ci"} for c in submit.call_args_list)
+        assert [(error.item["buildNumber"], error.error) for error in report.errors] == [(7, ["bad"])]
+        assert len(report.successes) == 149
@@ -0,0 +1,157 @@
+# coding: utf-8
+"""
+Unit tests for atlassian.concurrency module
+"""
+
+import threading
+import time
+from itertools import count
+
+import pytest
+
+from atlassian.concurrency import (
+    RateLimiter,
+    chunked,
+    iter_cursor_pages,
+    iter_prefetched,
+    map_concurrently,
+    run_concurrently,
+)
+
+
+class TestChunked:
+    def test_chunks_are_bounded(self):
+        assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+        assert list(chunked([], 3)) == []
+
+    def test_rejects_non_positive_size(self):
+        with pytest.raises(ValueError):
+            list(chunked([1], 0))
+
+
+class TestMapConcurrently:
+    def test_ordered_results(self):
+        def slow_square(value):
+            time.sleep(0.01 * (5 - value))
+            return value * value
+
+        results = [(item, future.result()) for item, future in map_concurrently(slow_square, range(5))]
+        assert results == [(value, value * value) for value in range(5)]
+
+    def test_unordered_results_and_errors(self):
+        def fail_on_three(value):
+            if value == 3:
+                raise ValueError("three")
+            return value
+
+        results = {}
+        for item, future in map_concurrently(fail_on_three, range(5), ordered=False):
+            results[item] = future.exception() or future.result()
+        assert isinstance(results.pop(3), ValueError)
+        assert results == {0: 0, 1: 1, 2: 2, 4: 4}
+
+    def test_unbounded_input_is_consumed_lazily(self):
+        consumed = []
+
+        def numbers():
+            for value in count():
+                consumed.append(value)
+                yield value
+
+        iterator = map_concurrently(lambda value: value, numbers(), max_workers=2)
+        first = [next(iterator)[0] for _ in range(3)]
+        iterator.close()
+        assert first == [0, 1, 2]
+        assert len(consumed) <= 3 + 4
+
+    def test_max_workers_bounds_concurrency(self):
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def track(_):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+        run_concurrently(track, range(20), max_workers=3)
+        assert active[1] <= 3
+
+
+class TestIterPrefetched:
+    def test_yields_in_order_while_producing_ahead(self):
+        produced = []
+
+        def pages():
+            for page in range(4):
+                produced.append(page)
+                yield page
+
+        iterator = iter_prefetched(pages())
+        assert next(iterator) == 0
+        deadline = time.monotonic() + 1
+        while len(produced) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert produced[:2] == [0, 1]
+        assert list(iterator) == [1, 2, 3]
+
+    def test_errors_are_raised_in_consumer(self):
+        def pages():
+            yield 1
+            raise RuntimeError("boom")
+
+        iterator = iter_prefetched(pages())
+        assert next(iterator) == 1
+        with pytest.raises(RuntimeError, match="boom"):
+            next(iterator)
+
+    def test_abandoning_stops_producer(self):
+        produced = count()
+
+        def pages():
+            while True:
+                yield next(produced)
+
+        iterator = iter_prefetched(pages(), depth=2)
+        assert next(iterator) == 0
+        iterator.close()
+        time.sleep(0.3)
+        stopped_at = next(produced)
+        time.sleep(0.2)
+        assert next(produced) == stopped_at + 1
+
+
+class TestIterCursorPages:
+    def test_follows_tokens_until_the_last_page(self):
+        responses = {
+            None: {"issues": [1, 2], "nextPageToken": "a"},
+            "a": {"issues": [3], "nextPageToken": "b", "isLast": False},
+            "b": {"issues": [4], "nextPageToken": "c", "isLast": True},
+        }
+        tokens = []
+
+        def fetch_page(token):
+            tokens.append(token)
+            return responses[token]
+
+        assert list(iter_cursor_pages(fetch_page)) == [[1, 2], [3], [4]]
+        assert tokens == [None, "a", "b"]
+
+    def test_stops_without_token_or_response(self):
+        assert list(iter_cursor_pages(lambda token: {"values": [1]}, items="values")) == [[1]]
+        assert list(iter_cursor_pages(lambda token: None)) == []
+
+
+class TestRateLimiter:
+    def test_paces_calls_after_burst(self):
+        limiter = RateLimiter(rate=100, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.04
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            RateLimiter(0)
@@ -4,6 +4,7 @@
 from unittest import TestCase
 from unittest.mock import patch, sentinel
 
+import pytest
 from requests import HTTPError
 
 from atlassian import jira
@@ -219,3 +220,63 @@ class TestJira(TestCase):
                 "name": "Confluence",
             },
         )
+
+
+class TestJiraIterJql:
+    """``iter_jql`` against the paginated search of the local stand-in server."""
+
+    def test_server_pages_sequentially_with_prefetch(self, stand_in_server):
+        client = jira.Jira(stand_in_server.url, username="username", password="password")
+
+        keys = [issue["key"] for issue in client.iter_jql("project = BENCH", fields=["summary"], page_size=40)]
+
+        assert keys == [f"BENCH-{number}" for number in range(1, stand_in_server.dataset_size + 1)]
+        assert stand_in_server.requests["GET rest/api/2/search"] == 7
+
+    def test_server_parallel_pages_keep_order(self, stand_in_server):
+        client = jira.Jira(stand_in_server.url, username="username", password="password")
+
+        keys = [issue["key"] for issue in client.iter_jql("project = BENCH", page_size=25, max_workers=4)]
+
+        assert keys == [f"BENCH-{number}" for number in range(1, stand_in_server.dataset_size + 1)]
+        assert stand_in_server.requests["GET rest/api/2/search"] == 10
+
+    def test_start_and_limit(self, stand_in_server):
+        client = jira.Jira(stand_in_server.url, username="username", password="password")
+
+        issues = list(client.iter_jql("project = BENCH", start=10, limit=55, page_size=20, max_workers=3))
+
+        assert [issue["key"] for issue in issues] == [f"BENCH-{number}" for number in range(11, 66)]
+        assert stand_in_server.requests["GET rest/api/2/search"] == 3
+
+    def test_abandoned_iteration_stops_paging(self, stand_in_server):
+        client = jira.Jira(stand_in_server.url, username="username", password="password")
+
+        iterator = client.iter_jql("project = BENCH", page_size=10)
+        assert next(iterator)["key"] == "BENCH-1"
+        iterator.close()
+
+        assert stand_in_server.requests["GET rest/api/2/search"] <= 3
+
+    def test_cloud_follows_next_page_token(self, stand_in_server):
+        client = jira.Jira(stand_in_server.url, username="username", password="password", cloud=True)
+
+        keys = [issue["key"] for issue in client.iter_jql("project = BENCH", page_size=100)]
+
+        assert len(keys) == len(set(keys)) == stand_in_server.dataset_size
+        assert stand_in_server.requests["GET rest/api/3/search/jql"] == 3
+        with pytest.raises(ValueError):
+            next(client.iter_jql("project = BENCH", start=5))
+
+    @patch.object(jira.Jira, "get")
+    def test_fields_and_expand_are_sent(self, mock_get):
+        mock_get.return_value = {"startAt": 0, "maxResults": 50, "total": 1, "issues": [{"key": "FOO-1"}]}
+        client = jira.Jira(f"{mockup_server()}/jira", username="username", password="password")
+
+        assert list(client.iter_jql("project = FOO", fields=["summary", "status"], expand="changelog")) == [
+            {"key": "FOO-1"}
+        ]
+        mock_get.assert_called_once_with(
+            "rest/api/2/search",
+            params={"jql": "project = FOO", "fields": "summary,status", "expand": "changelog", "startAt": 0},
+        )
@@ -0,0 +1,134 @@
+# coding: utf-8
+"""
+Tests for the attachment archiver in atlassian/jira/attachments.py
+"""
+
+import os
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+from atlassian import Jira
+from atlassian.jira.attachments import AttachmentArchiver
+
+from .stand_in_server import attachment_size
+
+
+def attachment(server, attachment_id):
+    return {
+        "id": str(attachment_id),
+        "filename": f"file-{attachment_id}.bin",
+        "size": attachment_size(attachment_id),
+        "content": f"{server.url}/secure/attachment/{attachment_id}/file-{attachment_id}.bin",
+    }
+
+
+def issues(server, count=3, per_issue=4):
+    return [
+        {
+            "key": f"DEMO-{number}",
+            "fields": {"attachment": [attachment(server, number * 100 + index) for index in range(per_issue)]},
+        }
+        for number in range(1, count + 1)
+    ]
+
+
+def downloads(server):
+    return sum(count for request, count in server.requests.items() if request.startswith("GET secure/attachment/"))
+
+
+class TestAttachmentArchiver:
+    def test_directory_is_filled_and_resumed(self, stand_in_server, tmp_path):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        archiver = AttachmentArchiver(jira, str(tmp_path / "out"), max_workers=3, block_size=1000)
+
+        report = archiver.archive(issues(stand_in_server))
+
+        assert (report.downloaded, report.skipped, report.errors) == (12, 0, [])
+        assert report.bytes == sum(attachment_size(number * 100 + index) for number in (1, 2, 3) for index in range(4))
+        assert report.throughput > 0
+        path = tmp_path / "out" / "DEMO-2" / "201_file-201.bin"
+        assert path.read_bytes().startswith(b"201\n201\n")
+        assert os.path.getsize(path) == attachment_size(201)
+
+        os.remove(path)
+        again = archiver.archive(issues(stand_in_server))
+
+        assert (again.downloaded, again.skipped) == (1, 11)
+        assert downloads(stand_in_server) == 13
+
+    def test_zip_entries_are_streamed_and_appended(self, stand_in_server, tmp_path):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        target = str(tmp_path / "attachments.zip")
+
+        first = AttachmentArchiver(jira, target, compression=zipfile.ZIP_DEFLATED).archive(issues(stand_in_server, 2))
+        second = AttachmentArchiver(jira, target).archive(issues(stand_in_server, 3))
+
+        assert (first.downloaded, second.downloaded, second.skipped) == (8, 4, 8)
+        with zipfile.ZipFile(target) as archive:
+            sizes = {info.filename: info.file_size for info in archive.infolist()}
+            assert len(sizes) == 12
+            assert sizes["DEMO-3/302_file-302.bin"] == attachment_size(302)
+            assert archive.read("DEMO-1/100_file-100.bin").startswith(b"100\n")
+            assert archive.getinfo("DEMO-1/100_file-100.bin").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_zip_downloads_are_spooled_up_to_spool_size(self, stand_in_server, tmp_path):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        target = str(tmp_path / "attachments.zip")
+
+        with patch.object(tempfile, "SpooledTemporaryFile", wraps=tempfile.SpooledTemporaryFile) as spooled:
+            report = AttachmentArchiver(jira, target, max_workers=2, spool_size=1000).archive(
+                issues(stand_in_server, 1)
+            )
+
+        assert {call.kwargs["max_size"] for call in spooled.call_args_list} == {1000}
+        assert report.downloaded == 4
+        with zipfile.ZipFile(target) as archive:
+            assert archive.getinfo("DEMO-1/103_file-103.bin").file_size == attachment_size(103)
+
+    def test_failed_downloads_are_reported(self, stand_in_server, tmp_path):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        broken = {**attachment(stand_in_server, 7), "content": f"{stand_in_server.url}/missing/7"}
+
+        report = AttachmentArchiver(jira, str(tmp_path / "out.zip")).archive(
+            [{"key": "DEMO-1", "fields": {"attachment": [attachment(stand_in_server, 1), broken]}}]
+        )
+
+        assert report.downloaded == 1
+        assert [error.item["id"] for error in report.errors] == ["7"]
+        assert not report.errors[0].retriable
+
+    def test_throttled_downloads_are_retried_by_the_client(self, stand_in_server, tmp_path):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        stand_in_server.throttle(1, retry_after=0)
+
+        report = AttachmentArchiver(jira, str(tmp_path / "out"), max_workers=1).archive(issues(stand_in_server, 1, 1))
+
+        assert (report.downloaded, report.errors) == (1, [])
+        assert (tmp_path / "out" / "DEMO-1" / "100_file-100.bin").read_bytes().startswith(b"100\n")
+        assert downloads(stand_in_server) == 2
+
+    def test_keys_and_jql_are_resolved(self, stand_in_server, tmp_path):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        found = issues(stand_in_server, 3, 1)
+
+        with (
+            patch.object(jira, "bulk_issue", return_value=({"issues": found[:2]}, [])) as bulk_issue,
+            patch.object(jira, "iter_jql", return_value=iter(found[2:])) as iter_jql,
+        ):
+            report = AttachmentArchiver(jira, str(tmp_path / "out")).archive(["DEMO-1", "DEMO-2"], jql="project = DEMO")
+
+        bulk_issue.assert_called_once_with(["DEMO-1", "DEMO-2"], fields=["attachment"])
+        assert iter_jql.call_args.args == ("project = DEMO",)
+        assert report.downloaded == 3
+
+    def test_get_all_attachment_contents(self, stand_in_server, tmp_path):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        issue = {"id": "10001", **issues(stand_in_server, 1)[0]}
+
+        with patch.object(jira, "issue", return_value=issue):
+            path = jira.get_all_attachment_contents("DEMO-1", path=str(tmp_path))
+
+        assert path == str(tmp_path / "10001_attachments.zip")
+        with zipfile.ZipFile(path) as archive:
+            assert sorted(archive.namelist()) == [f"file-10{index}.bin" for index in range(4)]
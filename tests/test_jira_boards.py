@@ -0,0 +1,123 @@
+# coding: utf-8
+"""
+Tests for the board snapshot collector in atlassian/jira/boards.py
+"""
+
+import re
+from dataclasses import asdict
+from unittest.mock import Mock, patch
+
+import pytest
+from requests import HTTPError
+
+from atlassian import Jira
+from atlassian.jira.boards import collect_board_snapshots
+
+BOARDS = [
+    {"id": 1, "name": "DEMO board", "type": "scrum", "location": {"projectKey": "DEMO"}},
+    {"id": 2, "name": "Support", "type": "kanban"},
+    {"id": 3, "name": "Simple", "type": "simple"},
+]
+SPRINTS = {1: [{"id": 100 + number, "name": f"Sprint {number}", "state": "closed"} for number in range(60)]}
+
+
+def issue(sprint_id, number):
+    return {
+        "id": str(number),
+        "key": f"DEMO-{sprint_id}-{number}",
+        "fields": {
+            "summary": "Story",
+            "status": {
+                "name": "Done" if number % 2 else "To Do",
+                "statusCategory": {"key": "done" if number % 2 else "new"},
+            },
+            "issuetype": {"name": "Story"},
+            "assignee": {"name": "jdoe"} if number % 3 else None,
+            "customfield_10002": 3 if number % 2 else 2.5,
+            "labels": ["a"],
+        },
+    }
+
+
+def listing(values, params):
+    start, limit = params["startAt"], params["maxResults"]
+    return {"values": values[start : start + limit], "isLast": start + limit >= len(values)}
+
+
+def agile_get(calls):
+    def get(url, params=None):
+        calls.append((url, params))
+        match = re.search(r"rest/agile/1.0/board(?:/(\d+))?(/sprint)?(?:/(\d+)/issue)?$", url)
+        board_id, sprint_listing, sprint_id = match.groups()
+        if sprint_id:
+            # Issue pages are capped below the requested size and carry no isLast
+            issues = [issue(sprint_id, number) for number in range(120)]
+            start = params["startAt"]
+            return {"issues": issues[start : start + 40], "startAt": start, "total": len(issues)}
+        if sprint_listing:
+            if board_id == "3":
+                raise HTTPError("The board does not support sprints", response=Mock(status_code=400))
+            return listing(SPRINTS[int(board_id)], params)
+        if board_id:
+            return BOARDS[int(board_id) - 1]
+        return listing(BOARDS, params)
+
+    return get
+
+
+def test_snapshot_of_all_boards_follows_every_listing_to_its_end():
+    jira = Jira(url="https://jira.example.com", username="user", password="pass")
+    calls = []
+    with patch.object(jira, "get", side_effect=agile_get(calls)):
+        snapshots = {board.id: board for board in collect_board_snapshots(jira, estimate_field="customfield_10002")}
+
+    assert set(snapshots) == {1, 2, 3}
+    assert snapshots[2].sprints == [] and snapshots[3].sprints == []
+    board = snapshots[1]
+    assert board.project == "DEMO"
+    assert [sprint.id for sprint in board.sprints] == list(range(100, 160))
+    sprint = board.sprints[0]
+    assert [item.key for item in sprint.issues] == [f"DEMO-100-{number}" for number in range(120)]
+    assert sprint.committed == 60 * 3 + 60 * 2.5
+    assert sprint.completed == 60 * 3
+    assert sprint.issues[1].assignee == "jdoe" and sprint.issues[0].assignee is None
+    assert asdict(board)["sprints"][0]["issues"][1]["status"] == "Done"
+
+    # Sprints of the Kanban board are never requested; 60 sprints take two pages
+    assert [params["startAt"] for url, params in calls if url.endswith("board/1/sprint")] == [0, 50]
+    assert not any(url.endswith("board/2/sprint") for url, _ in calls)
+    issue_calls = [params for url, params in calls if url.endswith("/issue")]
+    assert len(issue_calls) == 60 * 3
+    assert issue_calls[0]["fields"] == "summary,status,issuetype,assignee,resolutiondate,customfield_10002"
+
+
+def test_selected_boards_with_extra_fields():
+    jira = Jira(url="https://jira.example.com", username="user", password="pass")
+    calls = []
+    with patch.object(jira, "get", side_effect=agile_get(calls)):
+        with patch.object(jira.metadata, "field_id", side_effect=[KeyError("Story Points"), "customfield_10002"]):
+            (board,) = collect_board_snapshots(jira, board_ids=[1], states=["active"], fields=["labels"])
+
+    assert not any(url.endswith("rest/agile/1.0/board") for url, _ in calls)
+    assert {params["state"] for url, params in calls if url.endswith("/sprint")} == {"active"}
+    assert board.sprints[5].issues[0].extra == {"labels": ["a"]}
+    # The estimate field was found by its Cloud name
+    assert board.sprints[5].issues[0].estimate == 2.5
+
+
+def test_failed_sprint_is_raised_after_other_boards():
+    jira = Jira(url="https://jira.example.com", username="user", password="pass")
+    get = agile_get([])
+
+    def failing(url, params=None):
+        if url.endswith("sprint/130/issue"):
+            raise HTTPError("Internal error", response=Mock(status_code=500))
+        return get(url, params)
+
+    yielded = []
+    with patch.object(jira, "get", side_effect=failing):
+        with pytest.raises(HTTPError):
+            for board in collect_board_snapshots(jira, estimate_field="customfield_10002", max_workers=2):
+                yielded.append(board.id)
+
+    assert sorted(yielded) == [1, 2, 3]
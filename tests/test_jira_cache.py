@@ -0,0 +1,152 @@
+# coding: utf-8
+"""
+Tests for the sqlite issue cache in atlassian/jira/cache.py
+"""
+
+import time
+from unittest.mock import patch
+
+from atlassian import Jira
+from atlassian.jira.cache import IssueCache
+from atlassian.jira.sync import DeltaSync, SyncStore
+
+
+def issue(issue_id, status="Open", assignee="alice", parent=None, labels=(), updated=None, links=()):
+    fields = {
+        "summary": f"Issue {issue_id}",
+        "project": {"key": "CACHE"},
+        "status": {"name": status},
+        "assignee": {"accountId": assignee} if assignee else None,
+        "updated": updated or f"2024-03-01T10:{issue_id:02d}:00.000+0000",
+        "labels": list(labels),
+        "issuelinks": [{"type": {"name": "Blocks"}, "outwardIssue": {"key": linked_key}} for linked_key in links],
+    }
+    if parent:
+        fields["parent"] = {"key": parent}
+    return {"id": str(10000 + issue_id), "key": f"CACHE-{issue_id}", "fields": fields}
+
+
+class TestIssueCache:
+    def test_query_uses_indexed_columns(self):
+        cache = IssueCache()
+        cache.put_many(
+            [
+                issue(1, labels=["backend"], parent="CACHE-9"),
+                issue(2, status="Done", labels=["backend", "ui"], parent="CACHE-9"),
+                issue(3, assignee="bob", links=["CACHE-1"]),
+            ]
+        )
+
+        assert len(cache) == 3
+        assert [i["key"] for i in cache.query(status="Open")] == ["CACHE-3", "CACHE-1"]
+        assert [i["key"] for i in cache.query(assignee="alice", label="backend", order_by="key", descending=False)] == [
+            "CACHE-1",
+            "CACHE-2",
+        ]
+        assert [i["key"] for i in cache.children("CACHE-9")] == ["CACHE-1", "CACHE-2"]
+        assert cache.count(project="CACHE", status=["Open", "Done"]) == 3
+        assert cache.count(updated_since="2024-03-01T10:02:00.000+0000") == 2
+        assert cache.links("CACHE-3") == [("Blocks", "outward", "CACHE-1")]
+
+    def test_put_replaces_indexes_of_changed_issue(self):
+        cache = IssueCache()
+        cache.put(issue(1, labels=["old"]))
+        cache.put(issue(1, status="Done", labels=["new"], updated="2024-03-02T00:00:00.000+0000"))
+
+        assert cache.count(label="old") == 0
+        assert cache.count(label="new", status="Done") == 1
+
+    def test_partial_issue_is_served_only_for_cached_fields(self):
+        cache = IssueCache()
+        cache.put(issue(1), fields=["summary", "status"])
+
+        assert cache.get("CACHE-1") is None
+        assert cache.get("CACHE-1", fields="summary")["fields"] == {"summary": "Issue 1"}
+        assert cache.get("10001", fields=["summary", "labels"]) is None
+
+        cache.put(issue(1))
+        cache.put(issue(1), fields=["summary"])
+        assert cache.get("CACHE-1")["fields"]["labels"] == []
+
+    def test_navigable_issue_is_not_a_complete_copy(self):
+        cache = IssueCache()
+        cache.put(issue(1), fields="*navigable")
+
+        # Non-navigable fields such as comment and worklog are missing from search results
+        assert cache.get("CACHE-1") is None
+        assert cache.get("CACHE-1", fields="*all") is None
+        assert cache.get("CACHE-1", fields="comment") is None
+        assert cache.get("CACHE-1", fields="*navigable") == issue(1)
+        assert cache.get("CACHE-1", fields="summary")["fields"] == {"summary": "Issue 1"}
+
+        cache.put(issue(1))
+        cache.put(issue(1), fields="*navigable")
+        assert cache.get("CACHE-1") == issue(1)
+
+    def test_max_age_expires_entries(self):
+        cache = IssueCache(max_age=60)
+        cache.put(issue(1))
+
+        with patch("atlassian.jira.cache.time.time", return_value=time.time() + 120):
+            assert cache.get("CACHE-1") is None
+        assert cache.misses == 1
+
+    def test_is_a_delta_sync_sink(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        cache = IssueCache()
+        store = SyncStore()
+        store.upsert_issues("CACHE", [("10002", "CACHE-2", None)])
+        cache.put(issue(2))
+
+        with patch.object(jira, "iter_jql", side_effect=[iter([issue(1)]), iter([issue(1)])]):
+            DeltaSync(jira, store, cache).sync("CACHE")
+
+        assert cache.get("CACHE-1") is not None
+        assert cache.get("CACHE-2") is None
+
+
+class TestJiraIssueCacheAside:
+    def test_get_issue_and_issue_are_served_from_cache(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        jira.issue_cache = IssueCache()
+
+        with patch.object(jira, "get", return_value=issue(1)) as get:
+            first = jira.get_issue("CACHE-1")
+            second = jira.get_issue("CACHE-1")
+            third = jira.issue("CACHE-1")
+            jira.get_issue("CACHE-1", expand="changelog")
+
+        assert first == second == third
+        assert get.call_count == 2
+        assert jira.issue_cache.hits == 2
+
+    def test_writes_invalidate_cached_issue(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        jira.issue_cache = IssueCache()
+        jira.issue_cache.put(issue(1))
+
+        with patch("atlassian.rest_client.AtlassianRestAPI.request") as request:
+            jira.update_issue_field("CACHE-1", {"summary": "Changed"})
+
+        assert request.called
+        assert jira.issue_cache.get("CACHE-1") is None
+
+    def test_iter_jql_fills_cache(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        jira.issue_cache = IssueCache()
+
+        keys = [found["key"] for found in jira.iter_jql("project = BENCH", fields=["summary", "status"], limit=30)]
+
+        assert len(jira.issue_cache) == 30
+        assert jira.issue_cache.get(keys[0], fields="summary") is not None
+        assert jira.issue_cache.get(keys[0]) is None
+
+    def test_navigable_search_results_are_not_served_for_all_fields(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        jira.issue_cache = IssueCache()
+
+        for fields in ("*navigable", None):
+            jira.issue_cache.clear()
+            (found,) = jira.iter_jql("key = BENCH-1", fields=fields, limit=1)
+            assert jira.issue_cache.get(found["key"], fields="summary") is not None
+            assert jira.issue_cache.get(found["key"]) is None
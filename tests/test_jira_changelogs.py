@@ -0,0 +1,77 @@
+# coding: utf-8
+"""
+Tests for the changelog streaming in atlassian/jira/changelogs.py
+"""
+
+import datetime
+from unittest.mock import patch
+
+from atlassian import Jira
+from atlassian.jira import JiraCloud
+from atlassian.jira.changelogs import FieldChange, iter_field_changes
+
+UTC = datetime.timezone.utc
+
+
+class TestIterFieldChanges:
+    def test_cloud_chunks_and_follows_tokens(self, stand_in_server):
+        stand_in_server.max_page_size = 100
+        jira = JiraCloud(stand_in_server.url, username="user", password="pass")
+
+        changes = list(iter_field_changes(jira, (str(10000 + index) for index in range(1500)), fields=["status"]))
+
+        assert len(changes) == 373
+        assert {change.field for change in changes} == {"status"}
+        assert changes[0] == FieldChange(
+            "10001", datetime.datetime(2024, 1, 2, 11, tzinfo=UTC), "status", "To Do", "In Progress"
+        )
+        # 373 status histories of the first chunk in pages of 100, and one empty page for the second chunk
+        assert stand_in_server.requests["POST rest/api/3/changelog/bulkfetch"] == 5
+
+    def test_legacy_cloud_client_yields_all_fields(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass", cloud=True)
+
+        changes = list(iter_field_changes(jira, ["BENCH-1", "BENCH-4"], max_workers=2))
+
+        assert [(change.issue, change.field, change.from_value, change.to_value) for change in changes] == [
+            ("10000", "assignee", None, "user-0"),
+            ("10003", "status", "To Do", "In Progress"),
+            ("10003", "status", "In Progress", "In Review"),
+            ("10003", "status", "In Review", "Done"),
+            ("10003", "assignee", None, "user-3"),
+        ]
+
+    def test_server_uses_chunked_searches(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        issue = {
+            "id": "10",
+            "key": "DEMO-1",
+            "changelog": {
+                "histories": [
+                    {
+                        "created": "2024-03-01T10:00:00.000+0100",
+                        "items": [
+                            {"field": "Story Points", "from": "3", "fromString": None, "to": "5", "toString": None},
+                            {"field": "summary", "fromString": "a", "toString": "b"},
+                        ],
+                    }
+                ]
+            },
+        }
+
+        with patch.object(jira, "iter_jql", side_effect=[[issue], []]) as iter_jql:
+            changes = list(iter_field_changes(jira, [f"DEMO-{n}" for n in range(1, 151)], fields=["story points"]))
+
+        assert iter_jql.call_count == 2
+        first = iter_jql.call_args_list[0]
+        assert first.args[0].startswith("key in (DEMO-1, DEMO-2, ") and first.args[0].endswith("DEMO-100)")
+        assert first.kwargs["expand"] == "changelog"
+        assert changes == [
+            FieldChange(
+                "10",
+                datetime.datetime(2024, 3, 1, 10, tzinfo=datetime.timezone(datetime.timedelta(hours=1))),
+                "Story Points",
+                "3",
+                "5",
+            )
+        ]
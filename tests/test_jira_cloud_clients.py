@@ -185,3 +185,57 @@ class TestJiraCloudClients(TestCase):
                 ),
             ],
         )
+
+
+class TestJiraCloudTwoPhaseSearch:
+    """``iter_enhanced_jql`` against the cursor search and bulkfetch of the stand-in server."""
+
+    def test_cursor_pages_are_streamed(self, stand_in_server):
+        jira = JiraCloud(stand_in_server.url, username="user", password="pass")
+
+        keys = [issue["key"] for issue in jira.iter_enhanced_jql("project = BENCH", fields=["summary"], page_size=100)]
+
+        assert keys == [f"BENCH-{number}" for number in range(1, stand_in_server.dataset_size + 1)]
+        assert stand_in_server.requests["GET rest/api/3/search/jql"] == 3
+
+    def test_hydrate_streams_ids_then_bulk_fetches_fields(self, stand_in_server):
+        jira = JiraCloud(stand_in_server.url, username="user", password="pass")
+
+        issues = list(jira.iter_enhanced_jql("project = BENCH", fields="summary,status", hydrate=True, max_workers=3))
+
+        assert [issue["key"] for issue in issues] == [
+            f"BENCH-{number}" for number in range(1, stand_in_server.dataset_size + 1)
+        ]
+        assert set(issues[0]["fields"]) == {"summary", "status"}
+        assert stand_in_server.requests["GET rest/api/3/search/jql"] == 1
+        assert stand_in_server.requests["POST rest/api/3/issue/bulkfetch"] == 3
+
+    def test_hydrate_respects_limit(self, stand_in_server):
+        jira = JiraCloud(stand_in_server.url, username="user", password="pass")
+
+        issues = jira.enhanced_jql_get_list_of_tickets("project = BENCH", fields=["summary"], limit=150, hydrate=True)
+
+        assert [issue["key"] for issue in issues] == [f"BENCH-{number}" for number in range(1, 151)]
+        assert stand_in_server.requests["POST rest/api/3/issue/bulkfetch"] == 2
+
+    def test_hydrate_keeps_search_order_and_skips_missing_issues(self):
+        jira = JiraCloud("https://example.atlassian.net")
+        search = {"issues": [{"id": "3"}, {"id": "1"}, {"id": "2"}], "isLast": True}
+        bulkfetch = {
+            "issues": [{"id": "1", "key": "A-1"}, {"id": "3", "key": "A-3"}],
+            "issueErrors": [{"issueIdsOrKeys": ["2"]}],
+        }
+
+        with (
+            patch.object(jira, "get", return_value=search) as get,
+            patch.object(jira, "post", return_value=bulkfetch) as post,
+        ):
+            issues = list(jira.iter_enhanced_jql("project = A", fields=["summary"], expand="names", hydrate=True))
+
+        assert [issue["key"] for issue in issues] == ["A-3", "A-1"]
+        assert get.call_args.kwargs["params"]["fields"] == "id"
+        post.assert_called_once_with(
+            "rest/api/3/issue/bulkfetch",
+            params=None,
+            data={"issueIdsOrKeys": ["3", "1", "2"], "fields": ["summary"], "expand": ["names"]},
+        )
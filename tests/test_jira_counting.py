@@ -0,0 +1,66 @@
+# coding: utf-8
+"""
+Tests for the issue counting in atlassian/jira/counting.py
+"""
+
+from unittest.mock import patch
+
+import pytest
+from requests import HTTPError
+
+from atlassian import Jira
+from atlassian.jira import JiraCloud
+from atlassian.jira.counting import IssueCounter, count_jql
+
+
+class TestCountJql:
+    def test_server_reads_the_total_without_issues(self, stand_in_server):
+        stand_in_server.dataset_size = 1234
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+
+        assert jira.get_project_issues_count("BENCH") == 1234
+        assert count_jql(jira, "project = BENCH ORDER BY key") == 1234
+        assert stand_in_server.requests["GET rest/api/2/search"] == 2
+
+    def test_cloud_clients_use_the_approximate_count(self, stand_in_server):
+        legacy = Jira(url=stand_in_server.url, username="user", password="pass", cloud=True)
+        cloud = JiraCloud(stand_in_server.url, username="user", password="pass")
+
+        assert legacy.get_project_issues_count("BENCH") == 250
+        assert count_jql(cloud, "project = BENCH") == 250
+        assert stand_in_server.requests["POST rest/api/2/search/approximate-count"] == 1
+        assert stand_in_server.requests["POST rest/api/3/search/approximate-count"] == 1
+        assert not stand_in_server.requests["GET rest/api/3/search/jql"]
+
+
+class TestIssueCounter:
+    def test_counts_concurrently_and_caches_for_ttl(self, stand_in_server, clock):
+        jira = JiraCloud(stand_in_server.url, username="user", password="pass")
+        counter = IssueCounter(jira, ttl=30, max_workers=4, clock=clock)
+        jqls = [f"project = BENCH AND labels = label-{index}" for index in range(7)]
+
+        assert counter.count_many(jqls + jqls[:2]) == dict.fromkeys(jqls, 250)
+        clock.now = 29
+        assert counter.count(jqls[0]) == 250
+        assert stand_in_server.requests["POST rest/api/3/search/approximate-count"] == 7
+        clock.now = 30
+        counter.count(jqls[0])
+        counter.invalidate(jqls[1])
+        counter.count_many(jqls[:2])
+        assert stand_in_server.requests["POST rest/api/3/search/approximate-count"] == 9
+
+    def test_failures_raise_after_the_other_counts(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        counter = IssueCounter(jira, ttl=60)
+
+        def count(client, jql):
+            if jql == "bad":
+                raise HTTPError("Error in the JQL Query")
+            return len(jql)
+
+        with patch("atlassian.jira.counting.count_jql", side_effect=count) as counted:
+            with pytest.raises(HTTPError):
+                counter.count_many(["good", "bad", "better"])
+            assert counter.count_many(["good", "better"]) == {"good": 4, "better": 6}
+
+        assert counted.call_count == 3
@@ -0,0 +1,101 @@
+# coding: utf-8
+"""
+Tests for the windowed issue navigator export in atlassian/jira/export.py
+"""
+
+import csv
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from requests import HTTPError
+
+from atlassian import Jira
+from atlassian.jira.export import IssueExporter, union_header
+
+
+def test_union_header_keeps_repeated_columns_together():
+    headers = [["Key", "Labels", "Sprint"], ["Key", "Labels", "Labels", "Sprint", "Sprint"], ["Key", "Team"]]
+
+    assert union_header(headers) == [
+        ("Key", 0),
+        ("Labels", 0),
+        ("Labels", 1),
+        ("Sprint", 0),
+        ("Sprint", 1),
+        ("Team", 0),
+    ]
+
+
+class TestIssueExporter:
+    def test_csv_windows_are_joined_under_one_header(self, stand_in_server, tmp_path):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        target = str(tmp_path / "issues.csv")
+
+        report = IssueExporter(jira, "project = BENCH", target, window=100, max_workers=3).export()
+
+        with open(target, encoding="utf-8", newline="") as handle:
+            rows = list(csv.reader(handle))
+        assert rows[0] == ["Summary", "Issue key", "Issue id", "Labels", "Labels", "Sprint", "Sprint"]
+        assert [row[1] for row in rows[1:]] == [f"BENCH-{number}" for number in range(1, 251)]
+        assert rows[1][5:] == ["Sprint 0", ""]
+        assert rows[120][5:] == ["Sprint 4", "Sprint 5"]
+        assert (report.issues, report.rows, report.windows, report.resumed) == (250, 250, 3, 0)
+        assert report.bytes == os.path.getsize(target)
+        assert not os.path.exists(f"{target}.parts")
+        assert (
+            stand_in_server.requests["GET sr/jira.issueviews:searchrequest-csv-all-fields/temp/SearchRequest.csv"] == 3
+        )
+
+    def test_failed_export_resumes_with_missing_windows(self, tmp_path):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        target = str(tmp_path / "issues.csv")
+        windows = {0: b"Issue key;Summary\r\nA-1;One\r\n", 1: b"Issue key;Summary\r\nA-2;Two\r\n"}
+        failures = [1]
+
+        def export(jql, limit, all_fields, start, delimiter):
+            assert (jql, limit, delimiter) == ("project = A ORDER BY key ASC", 1, ";")
+            if start in failures:
+                failures.remove(start)
+                raise HTTPError("503 Service Unavailable")
+            return windows[start]
+
+        exporter = IssueExporter(jira, "project = A", target, window=1, delimiter=";")
+        with patch("atlassian.jira.export.count_jql", return_value=2):
+            with patch.object(jira, "csv", side_effect=export) as downloaded:
+                with pytest.raises(HTTPError):
+                    exporter.export()
+                assert os.listdir(f"{target}.parts") == ["window-000000000.csv"]
+                report = exporter.export()
+
+        assert downloaded.call_count == 3
+        assert report.resumed == 1
+        with open(target, "rb") as handle:
+            assert handle.read() == b"Issue key;Summary\r\nA-1;One\r\nA-2;Two\r\n"
+
+    def test_excel_tables_are_merged_into_a_sink(self, stand_in_server, tmp_path):
+        stand_in_server.dataset_size = 30
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        sink = io.BytesIO()
+
+        report = IssueExporter(jira, "project = BENCH", sink, format="excel", window=10, max_workers=2).export()
+
+        content = sink.getvalue().decode("utf-8")
+        assert content.count("<tbody>") == 1
+        assert content.count("<tr>") == 31
+        assert content.index("BENCH-10<") < content.index("BENCH-11<") < content.index("BENCH-30<")
+        assert content.endswith("</tbody></table></body></html>")
+        assert (report.rows, report.windows, report.bytes) == (30, 3, len(sink.getvalue()))
+
+    def test_window_above_the_server_cap_fails(self, stand_in_server, tmp_path):
+        stand_in_server.max_page_size = 80
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        target = str(tmp_path / "issues.csv")
+
+        with pytest.raises(ValueError, match="holds 80 of 100 issues"):
+            IssueExporter(jira, "project = BENCH", target, window=100).export()
+
+        # The last window holds 50 issues and is kept; the truncated ones are fetched again
+        assert os.listdir(f"{target}.parts") == ["window-000000200.csv"]
+        assert not os.path.exists(target)
@@ -0,0 +1,62 @@
+# coding: utf-8
+"""
+Tests for the batched Jira expression evaluation in atlassian/jira/expressions.py
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from atlassian import Jira
+from atlassian.jira import JiraCloud
+from atlassian.jira.expressions import ExpressionResult, evaluate_issues
+
+
+class TestEvaluateIssues:
+    def test_cloud_follows_next_page_tokens(self):
+        jira = JiraCloud("https://example.atlassian.net", username="user", password="pass")
+        pages = [
+            {"value": [["DEMO-1", 3], ["DEMO-2", 0]], "meta": {"issues": {"jql": {"nextPageToken": "t1"}}}},
+            {"value": [["DEMO-3", 7]], "meta": {"issues": {"jql": {}}}},
+        ]
+
+        with patch.object(jira, "evaluate_jsisjira_expression", side_effect=pages) as evaluate:
+            results = list(
+                evaluate_issues(jira, "project = DEMO", "issue.comments.length", batch_size=2, context={"custom": 1})
+            )
+
+        assert results == [ExpressionResult("DEMO-1", 3), ExpressionResult("DEMO-2", 0), ExpressionResult("DEMO-3", 7)]
+        first, second = (call.kwargs["data"] for call in evaluate.call_args_list)
+        assert first == {
+            "expression": "issues.map(issue => [issue.key, (issue.comments.length)])",
+            "context": {"custom": 1, "issues": {"jql": {"query": "project = DEMO", "maxResults": 2}}},
+        }
+        assert second["context"]["issues"]["jql"]["nextPageToken"] == "t1"
+
+    def test_legacy_cloud_client_evaluates_remaining_pages_concurrently(self):
+        jira = Jira(url="https://example.atlassian.net", username="user", password="pass", cloud=True)
+
+        def post(url, data):
+            start = data["context"]["issues"]["jql"]["startAt"]
+            # Jira caps the page at 40 issues whatever maxResults asks for
+            keys = [f"DEMO-{number}" for number in range(start + 1, min(start + 40, 100) + 1)]
+            meta = {"startAt": start, "maxResults": 40, "count": len(keys), "totalCount": 100}
+            return {"value": [[key, {"points": 1}] for key in keys], "meta": {"issues": {"jql": meta}}}
+
+        with patch.object(jira, "post", side_effect=post) as posted:
+            results = list(evaluate_issues(jira, "project = DEMO", "{points: 1}", max_workers=3))
+
+        assert [result.issue for result in results] == [f"DEMO-{number}" for number in range(1, 101)]
+        assert sorted(call.kwargs["data"]["context"]["issues"]["jql"]["startAt"] for call in posted.call_args_list) == [
+            0,
+            40,
+            80,
+        ]
+        assert posted.call_args.args[0].endswith("rest/api/2/expression/eval")
+        assert posted.call_args.kwargs["data"]["context"]["issues"]["jql"]["validation"] == "strict"
+
+    def test_server_is_rejected(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+
+        with pytest.raises(ValueError):
+            next(evaluate_issues(jira, "project = DEMO", "issue.key"))
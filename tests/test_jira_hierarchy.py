@@ -0,0 +1,99 @@
+# coding: utf-8
+"""
+Tests for the breadth-first issue traversal in atlassian/jira/hierarchy.py
+"""
+
+from unittest.mock import patch
+
+from atlassian import Jira
+from atlassian.jira import JiraCloud
+from atlassian.jira.hierarchy import traverse_issues
+
+BLOCKS = {"id": "1", "name": "Blocks", "inward": "is blocked by", "outward": "blocks"}
+RELATES = {"id": "2", "name": "Relates", "inward": "relates to", "outward": "relates to"}
+
+# EPIC-1 has children STORY-1 and STORY-2 (parent field), STORY-1 has sub-task SUB-1,
+# STORY-2 blocks OTHER-1, OTHER-1 relates to EPIC-1 (a cycle) and to GONE-1 which no longer exists.
+ISSUES = {
+    "EPIC-1": {"issuelinks": [{"type": RELATES, "inwardIssue": {"key": "OTHER-1"}}]},
+    "STORY-1": {"parent": {"key": "EPIC-1"}, "subtasks": [{"key": "SUB-1"}]},
+    "STORY-2": {"parent": {"key": "EPIC-1"}, "issuelinks": [{"type": BLOCKS, "outwardIssue": {"key": "OTHER-1"}}]},
+    "SUB-1": {"parent": {"key": "STORY-1"}},
+    "OTHER-1": {
+        "issuelinks": [
+            {"type": BLOCKS, "inwardIssue": {"key": "STORY-2"}},
+            {"type": RELATES, "outwardIssue": {"key": "EPIC-1"}},
+            {"type": RELATES, "outwardIssue": {"key": "GONE-1"}},
+        ]
+    },
+}
+
+
+def payload(key):
+    fields = {"issuelinks": [], "subtasks": [], "parent": None, **ISSUES[key]}
+    return {"id": key, "key": key, "fields": fields}
+
+
+def bulk_issue(keys, fields):
+    return {"issues": [payload(key) for key in keys if key in ISSUES]}, []
+
+
+def iter_jql(jql, fields, prefetch):
+    parents = jql[len("parent in (") : -1].split(", ")
+    return iter([payload(key) for key in ISSUES if (ISSUES[key].get("parent") or {}).get("key") in parents])
+
+
+class TestTraverseIssues:
+    def test_expands_one_level_per_round(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+
+        with patch.object(jira, "bulk_issue", side_effect=bulk_issue) as fetch:
+            with patch.object(jira, "iter_jql", side_effect=iter_jql) as search:
+                graph = traverse_issues(jira, ["EPIC-1"], max_workers=1)
+
+        assert graph.levels() == [["EPIC-1"], ["OTHER-1", "STORY-1", "STORY-2"], ["GONE-1", "SUB-1"]]
+        assert graph.neighbors("EPIC-1", "child") == ["STORY-1", "STORY-2"]
+        assert ("STORY-2", "OTHER-1", "Blocks", "outward") in graph.edge_list()
+        assert graph.missing == {"GONE-1"}
+        assert graph.edges["STORY-1"] == [("SUB-1", "subtask", "outward")]
+        # children returned by the search are not fetched again
+        assert [call.args[0] for call in fetch.call_args_list] == [["EPIC-1"], ["OTHER-1"], ["GONE-1"]]
+        assert search.call_count == 3
+
+    def test_link_type_direction_and_depth_filters(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+
+        with patch.object(jira, "bulk_issue", side_effect=bulk_issue):
+            with patch.object(jira, "iter_jql", side_effect=iter_jql):
+                blockers = traverse_issues(
+                    jira, ["STORY-2"], link_types=["blocks"], directions=["outward"], children=False
+                )
+                shallow = traverse_issues(jira, ["EPIC-1"], max_depth=1, link_types=[])
+
+        assert list(blockers.depth) == ["STORY-2", "OTHER-1"]
+        assert blockers.edges["OTHER-1"] == []
+        assert shallow.levels() == [["EPIC-1"], ["STORY-1", "STORY-2"]]
+        assert "STORY-1" not in shallow.edges
+
+    def test_parents_and_issue_limit(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+
+        with patch.object(jira, "bulk_issue", side_effect=bulk_issue):
+            with patch.object(jira, "iter_jql", side_effect=iter_jql):
+                upwards = traverse_issues(
+                    jira, ["SUB-1"], parents=True, children=False, link_types=[], keep_issues=True
+                )
+                limited = traverse_issues(jira, ["EPIC-1"], max_issues=3)
+
+        assert list(upwards.depth) == ["SUB-1", "STORY-1", "EPIC-1"]
+        assert upwards.issues["EPIC-1"]["key"] == "EPIC-1"
+        assert len(limited) == 3 and limited.truncated
+
+    def test_jira_cloud_uses_bulkfetch(self, stand_in_server):
+        jira = JiraCloud(stand_in_server.url, username="user", password="pass")
+
+        graph = traverse_issues(jira, ["BENCH-1", "BENCH-2", "NOPE-1"], children=False)
+
+        assert list(graph.depth) == ["BENCH-1", "BENCH-2", "NOPE-1"]
+        assert graph.missing == {"NOPE-1"}
+        assert stand_in_server.requests["POST rest/api/3/issue/bulkfetch"] == 1
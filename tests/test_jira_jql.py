@@ -0,0 +1,149 @@
+# coding: utf-8
+"""
+Tests for the client-side JQL evaluator in atlassian/jira/jql.py
+"""
+
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+from atlassian import Jira
+from atlassian.jira.jql import JqlContext, JqlSyntaxError, JqlUnsupportedError, match_issues, parse_jql
+
+UTC = datetime.timezone.utc
+CONTEXT = JqlContext(current_user="alice", now=datetime.datetime(2024, 3, 13, 15, 0, tzinfo=UTC))  # a Wednesday
+
+
+def issue(number, **fields):
+    defaults = {
+        "project": {"key": "DEMO", "name": "Demo"},
+        "status": {"name": "Open", "statusCategory": {"key": "new", "name": "To Do"}},
+        "assignee": {"accountId": "alice", "displayName": "Alice"},
+        "labels": [],
+        "updated": "2024-03-13T10:00:00.000+0000",
+        "summary": f"Issue {number}",
+    }
+    defaults.update(fields)
+    return {"id": str(10000 + number), "key": f"DEMO-{number}", "fields": defaults}
+
+
+ISSUES = [
+    issue(1, labels=["backend", "api"], priority={"name": "High"}, story=3),
+    issue(2, status={"name": "Done"}, assignee=None, updated="2024-03-01T09:00:00.000+0000", story=8),
+    issue(3, assignee={"accountId": "bob"}, summary="Login button broken", labels=["ui"]),
+    issue(10, duedate="2024-03-15", updated="2024-03-12T23:30:00.000+0000", priority={"name": "Low"}),
+]
+
+
+def keys(jql, issues=ISSUES, context=CONTEXT):
+    return [found["key"] for found in parse_jql(jql).filter(issues, context)]
+
+
+class TestJqlEvaluation:
+    @pytest.mark.parametrize(
+        "jql, expected",
+        [
+            ("project = demo AND status = Open", ["DEMO-1", "DEMO-3", "DEMO-10"]),
+            ('status != "Done"', ["DEMO-1", "DEMO-3", "DEMO-10"]),
+            ("labels = backend", ["DEMO-1"]),
+            ("labels in (ui, api)", ["DEMO-1", "DEMO-3"]),
+            ("assignee not in (bob)", ["DEMO-1", "DEMO-10"]),
+            ("assignee not in (bob, EMPTY)", ["DEMO-1", "DEMO-10"]),
+            ("assignee is EMPTY", ["DEMO-2"]),
+            ("priority is not empty and not priority = Low", ["DEMO-1"]),
+            ("assignee = currentUser() OR status = Done", ["DEMO-1", "DEMO-2", "DEMO-10"]),
+            ("statusCategory = 'To Do'", ["DEMO-1", "DEMO-3", "DEMO-10"]),
+            ("summary ~ login", ["DEMO-3"]),
+            ('summary ~ "butt*"', ["DEMO-3"]),
+            ("summary !~ login", ["DEMO-1", "DEMO-2", "DEMO-10"]),
+            ("cf[1] is EMPTY and story > 5", ["DEMO-2"]),
+            ("key >= DEMO-3", ["DEMO-3", "DEMO-10"]),
+            ("(status = Done OR labels = ui) AND assignee is not EMPTY", ["DEMO-3"]),
+        ],
+    )
+    def test_operators(self, jql, expected):
+        assert keys(jql) == expected
+
+    @pytest.mark.parametrize(
+        "jql, expected",
+        [
+            ("updated >= -1d", ["DEMO-1", "DEMO-3", "DEMO-10"]),
+            ('updated < "-1w 2d"', ["DEMO-2"]),
+            ("updated >= startOfDay()", ["DEMO-1", "DEMO-3"]),
+            ("updated >= startOfWeek() AND updated < startOfDay()", ["DEMO-10"]),
+            ("updated < startOfMonth(+0) OR updated < endOfMonth(-1)", []),
+            ("due <= endOfWeek()", ["DEMO-10"]),
+            ('updated < "2024/03/02"', ["DEMO-2"]),
+        ],
+    )
+    def test_dates(self, jql, expected):
+        assert keys(jql) == expected
+
+    def test_timezone_applies_to_date_literals(self):
+        context = JqlContext(now=CONTEXT.now, timezone=datetime.timezone(datetime.timedelta(hours=2)))
+
+        assert keys("updated >= startOfDay()", context=context) == ["DEMO-1", "DEMO-3", "DEMO-10"]
+
+    def test_order_by(self):
+        assert keys("ORDER BY priority DESC, key") == ["DEMO-10", "DEMO-1", "DEMO-2", "DEMO-3"]
+        assert keys("status = Open ORDER BY updated ASC") == ["DEMO-10", "DEMO-1", "DEMO-3"]
+        assert keys("order by key desc") == ["DEMO-10", "DEMO-3", "DEMO-2", "DEMO-1"]
+
+    def test_field_ids_from_context(self):
+        context = JqlContext(field_ids={"story points": "story"})
+
+        assert keys('"Story Points" >= 3', context=context) == ["DEMO-1", "DEMO-2"]
+
+    def test_current_user_requires_context(self):
+        with pytest.raises(JqlUnsupportedError):
+            parse_jql("assignee = currentUser()").filter(ISSUES, JqlContext())
+
+    @pytest.mark.parametrize("jql", ["status = ", "status ==", "project = A AND", "status in (A, B"])
+    def test_syntax_errors(self, jql):
+        with pytest.raises(JqlSyntaxError):
+            parse_jql(jql)
+
+    @pytest.mark.parametrize("jql", ["status was Done", "issue in linkedIssues(DEMO-1)", "assignee in membersOf(x)"])
+    def test_unsupported_constructs_are_detected(self, jql):
+        query = parse_jql(jql + " ORDER BY key")
+
+        assert not query.supported
+        with pytest.raises(JqlUnsupportedError):
+            match_issues(query, ISSUES, CONTEXT)
+
+
+class TestMatchIssuesFallback:
+    def test_local_evaluation_does_not_call_server(self):
+        jira = Jira(url="https://example.atlassian.net", username="user", password="pass", cloud=True)
+
+        with patch.object(jira, "match_jql") as match_jql:
+            matched = match_issues("labels = ui", ISSUES, CONTEXT, client=jira)
+
+        assert [found["key"] for found in matched] == ["DEMO-3"]
+        match_jql.assert_not_called()
+
+    def test_unsupported_query_is_sent_to_server(self):
+        jira = Jira(url="https://example.atlassian.net", username="user", password="pass", cloud=True)
+        reasons = []
+        response = {"matches": [{"matchedIssues": [10010, 10001], "errors": []}]}
+
+        with patch.object(jira, "match_jql", return_value=response) as match_jql:
+            matched = match_issues(
+                "status changed AFTER -1w ORDER BY key DESC", ISSUES, CONTEXT, client=jira, on_fallback=reasons.append
+            )
+
+        match_jql.assert_called_once_with([10001, 10002, 10003, 10010], ["status changed AFTER -1w ORDER BY key DESC"])
+        assert [found["key"] for found in matched] == ["DEMO-10", "DEMO-1"]
+        assert len(reasons) == 1
+
+    def test_jira_cloud_client_uses_match_issues(self, stand_in_server):
+        from atlassian.jira import JiraCloud
+
+        jira = JiraCloud(stand_in_server.url, username="user", password="pass")
+        issues = [issue(number) for number in range(1500)]
+
+        matched = match_issues("issue in watchedIssues()", issues, CONTEXT, client=jira)
+
+        assert len(matched) == stand_in_server.dataset_size
+        assert stand_in_server.requests["POST rest/api/3/jql/match"] == 2
@@ -0,0 +1,129 @@
+# coding: utf-8
+"""
+Tests for the metadata registry in atlassian/jira/metadata.py
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from atlassian import Jira
+from atlassian.jira import JiraCloud
+from atlassian.jira.metadata import MetadataRegistry
+from atlassian.models.jira import CustomField, FieldMapping, UpdateBuilder, serialize, task
+
+FIELDS = [
+    {"id": "summary", "key": "summary", "name": "Summary", "custom": False},
+    {"id": "customfield_10016", "key": "customfield_10016", "name": "Story point estimate", "custom": True},
+    {"id": "customfield_10020", "key": "customfield_10020", "name": "Team", "custom": True},
+    {"id": "customfield_10030", "key": "customfield_10030", "name": "Sprint", "custom": True},
+    {"id": "customfield_10031", "key": "customfield_10031", "name": "Sprint", "custom": True},
+]
+STATUSES = [
+    {"id": "1", "name": "To Do", "statusCategory": {"key": "new"}},
+    {"id": "3", "name": "In Review", "statusCategory": {"key": "indeterminate"}},
+]
+ISSUE_TYPES = [
+    {"id": "10005", "name": "Bug", "scope": {"type": "PROJECT", "project": {"id": "10100"}}},
+    {"id": "10001", "name": "Bug"},
+]
+
+
+class TestLookups:
+    def test_categories_are_loaded_once(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+
+        with patch.object(jira, "get_all_fields", return_value=FIELDS) as get_fields:
+            with patch.object(jira, "get_all_statuses", return_value=STATUSES) as get_statuses:
+                assert jira.metadata.field_id("team") == "customfield_10020"
+                assert jira.metadata.field_id("cf[10016]") == "customfield_10016"
+                assert jira.metadata.field_id("summary") == "summary"
+                assert jira.metadata.field_name("customfield_10020") == "Team"
+                assert jira.metadata.status_id("in review") == "3"
+                assert jira.metadata.status_category("1") == "new"
+                with pytest.raises(KeyError):
+                    jira.metadata.field_id("Nope")
+                with pytest.raises(ValueError, match="customfield_10030, customfield_10031"):
+                    jira.metadata.field_id("Sprint")
+
+        get_fields.assert_called_once_with()
+        get_statuses.assert_called_once_with()
+        assert jira.metadata is jira.metadata
+
+    def test_ttl_and_refresh(self, clock):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        registry = MetadataRegistry(jira, ttl=60, clock=clock)
+
+        with patch.object(jira, "get_all_fields", return_value=FIELDS) as get_fields:
+            registry.field_id("Team")
+            clock.now = 59
+            registry.field_id("Team")
+            assert get_fields.call_count == 1
+            clock.now = 60
+            registry.field_id("Team")
+            assert get_fields.call_count == 2
+            registry.refresh("fields")
+            registry.field_id("Team")
+            assert get_fields.call_count == 3
+
+    def test_issue_types_and_create_metadata_per_project(self):
+        jira = JiraCloud("https://example.atlassian.net", username="user", password="pass")
+        pages = {
+            None: {"issueTypes": [{"id": "10005", "name": "Bug"}], "startAt": 0, "total": 2},
+            1: {"issueTypes": [{"id": "10006", "name": "Story"}], "startAt": 1, "total": 2},
+        }
+        create_fields = {"fields": [{"fieldId": "customfield_10020", "name": "Team", "required": True}], "total": 1}
+
+        with patch.object(jira, "get_issue_all_types", return_value=ISSUE_TYPES):
+            with patch.object(
+                jira, "get_create_issue_meta_issue_types", side_effect=lambda project, start_at: pages[start_at or None]
+            ) as get_types:
+                with patch.object(
+                    jira, "get_create_issue_meta_issue_type_id", return_value=create_fields
+                ) as get_create_fields:
+                    assert jira.metadata.issue_type_id("bug") == "10001"
+                    assert jira.metadata.issue_type_id("Story", project="DEMO") == "10006"
+                    assert jira.metadata.create_fields("DEMO", "Bug")["customfield_10020"]["required"]
+                    jira.metadata.create_fields("DEMO", "10005")
+                    jira.metadata.refresh("OTHER")
+                    jira.metadata.issue_type_id("Bug", project="DEMO")
+
+        assert get_types.call_count == 2
+        get_create_fields.assert_called_once_with("DEMO", "10005", start_at=0)
+
+
+class TestModels:
+    def test_field_mapping_resolves_display_names(self):
+        jira = JiraCloud("https://example.atlassian.net", username="user", password="pass")
+        issue = task().project("DEMO").summary("Metadata").story_points(3).custom_field("Team", "42").build()
+
+        with patch.object(jira, "get_fields", return_value=FIELDS):
+            mapping = FieldMapping.from_metadata(jira.metadata)
+            fields = serialize(issue, mapping=mapping)["fields"]
+            update = UpdateBuilder("DEMO-1", metadata=jira.metadata).set_custom_field("Team", "7").build()
+
+        assert mapping.story_points_field == "customfield_10016"
+        assert mapping.epic_link_field == FieldMapping().epic_link_field
+        assert mapping == FieldMapping(story_points_field="customfield_10016")
+        assert fields["customfield_10016"] == 3
+        assert fields["customfield_10020"] == "42"
+        assert update.fields == {"customfield_10020": "7"}
+
+    def test_clients_stand_for_their_metadata(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+
+        with patch.object(jira, "get_all_fields", return_value=FIELDS) as get_all_fields:
+            mapping = FieldMapping.from_metadata(jira)
+            update = UpdateBuilder("DEMO-1", metadata=jira).set_custom_field("Team", "7").build()
+
+        assert mapping.metadata is jira.metadata
+        assert mapping.story_points_field == "customfield_10016"
+        assert update.fields == {"customfield_10020": "7"}
+        get_all_fields.assert_called_once()
+
+    def test_names_pass_through_without_metadata(self):
+        issue = task().project("DEMO").summary("Plain").build()
+        issue.fields.custom_fields.append(CustomField(field_id="customfield_1", value=1))
+
+        assert serialize(issue)["fields"]["customfield_1"] == 1
+        assert UpdateBuilder("DEMO-1").set_custom_field("Team", 1).build().fields == {"Team": 1}
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import datetime
+import pickle
 import re
+import weakref
+from dataclasses import FrozenInstanceError
 
 import pytest
 
@@ -9,6 +12,8 @@ from atlassian.models.jira import (
     ADFBuilder,
     Bug,
     Comment,
+    CompactIssue,
+    CompactIssueFields,
     Component,
     CustomField,
     Epic,
@@ -38,6 +43,7 @@ from atlassian.models.jira import (
     Visibility,
     bug,
     bulk_serialize,
+    clear_shared_entities,
     epic,
     get_issue_type_registry,
     issue_type_for,
@@ -748,3 +754,60 @@ def test_bulk_serialize_with_mapping():
     issue = task().project(key="P").summary("S").epic_link("E-99").build()
     out = bulk_serialize([issue], mapping=mapping)
     assert out[0]["fields"]["customfield_777"] == "E-99"
+
+
+def test_value_entities_keep_their_dataclass_behaviour():
+    project = Project.from_dict({"key": "DEMO", "id": "10000"})
+    assert vars(project) == {"key": "DEMO", "id": "10000"}
+    assert weakref.ref(project)() is project
+    assert Project.from_dict({"key": "DEMO", "id": "10000"}) is not project
+    assert pickle.loads(pickle.dumps(project)) == project
+    with pytest.raises(FrozenInstanceError):
+        project.key = "OTHER"  # type: ignore[misc]
+    with pytest.raises(ValueError):
+        User.from_dict({})
+
+
+def test_compact_issue_from_dict():
+    payload = {
+        "id": "10001",
+        "key": "DEMO-1",
+        "fields": {
+            "project": {"key": "DEMO"},
+            "issuetype": {"name": "Bug"},
+            "status": {"name": "In Progress"},
+            "summary": "Broken",
+            "priority": {"name": "High"},
+            "labels": ["backend"],
+            "fixVersions": [{"name": "1.0"}],
+            "assignee": {"accountId": "abc"},
+            "duedate": "2024-03-01",
+            "customfield_10028": 5,
+        },
+    }
+    first = CompactIssue.from_dict(payload)
+    second = CompactIssue.from_dict(
+        {"key": "DEMO-2", "fields": {**payload["fields"], "status": {"name": "In Progress"}}}
+    )
+
+    assert first.key == "DEMO-1" and first.fields.status == "In Progress"
+    assert first.fields.story_points == 5
+    assert first.fields.due_date == datetime.date(2024, 3, 1)
+    assert first.fields.fix_versions == (Version(name="1.0"),)
+    assert first.fields.components is CompactIssueFields().components
+    assert second.fields.priority is first.fields.priority
+    assert second.fields.status is first.fields.status
+    assert not hasattr(first, "__dict__") and not hasattr(first.fields, "__dict__")
+    assert pickle.loads(pickle.dumps(first)) == first
+
+    clear_shared_entities()
+    third = CompactIssue.from_dict(payload)
+    assert third.fields.priority == first.fields.priority
+    assert third.fields.priority is not first.fields.priority
+
+    issue = first.to_issue()
+    assert isinstance(issue, Bug)
+    assert issue.fields.labels == ["backend"]
+    issue.fields.labels.append("ui")
+    assert first.fields.labels == ("backend",)
+    assert serialize(issue)["fields"]["priority"] == {"name": "High"}
@@ -0,0 +1,137 @@
+# coding: utf-8
+"""
+Tests for the content scanner in atlassian/jira/scanning.py
+"""
+
+import re
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from atlassian import Jira
+from atlassian.concurrency import RateLimiter
+from atlassian.jira import JiraCloud
+from atlassian.jira.scanning import ContentScanner, compile_patterns, plain_text
+
+SECRETS = {"aws": r"AKIA[0-9A-Z]{16}", "email": r"[\w.]+@example\.com"}
+KEY = "AKIA" + "A" * 16
+
+
+def comment(number, body):
+    return {"id": str(number), "body": body}
+
+
+ISSUES = [
+    {
+        "key": "DEMO-1",
+        "fields": {
+            "description": None,
+            "comment": {"total": 1, "comments": [comment(1, f"leaked {KEY}")]},
+            "attachment": [
+                {"id": "7", "filename": "env.txt", "mimeType": "text/plain", "size": 30, "content": "att/7"},
+                {"id": "8", "filename": "shot.png", "mimeType": "image/png", "size": 30, "content": "att/8"},
+                {"id": "9", "filename": "huge.log", "mimeType": "text/plain", "size": 10**9, "content": "att/9"},
+            ],
+        },
+    },
+    {
+        "key": "DEMO-2",
+        "fields": {
+            "description": "Contact jane.doe@example.com or john@example.com",
+            "comment": {"total": 3, "comments": [comment(1, "first")]},
+        },
+    },
+]
+
+
+def test_matches_in_descriptions_comments_and_text_attachments():
+    jira = Jira(url="https://jira.example.com", username="user", password="pass")
+    comments = [comment(1, "first"), comment(2, "second"), comment(3, f"again {KEY}")]
+
+    def get(url, params=None):
+        assert url.endswith("issue/DEMO-2/comment")
+        start = params["startAt"]
+        return {"comments": comments[start : start + 2], "total": len(comments)}
+
+    scanner = ContentScanner(jira, SECRETS, attachments=True, processes=0)
+    with patch.object(jira, "iter_jql", return_value=iter(ISSUES)) as search:
+        with patch.object(jira, "get", side_effect=get) as comment_pages:
+            with patch.object(jira, "request", return_value=MagicMock(status_code=200)) as download:
+                download.return_value.iter_content.return_value = [b"KEY=", KEY.encode()]
+                hits = list(scanner.scan("project = DEMO"))
+
+    assert search.call_args.kwargs["fields"] == ["description", "comment", "attachment"]
+    assert comment_pages.call_count == 2
+    download.assert_called_once()
+    assert download.call_args.args == ("GET", "att/7")
+    assert download.call_args.kwargs["stream"] is True
+    assert hits == [
+        ("DEMO-1", "comment/1", "aws", KEY),
+        ("DEMO-1", "attachment/7/env.txt", "aws", KEY),
+        ("DEMO-2", "description", "email", "jane.doe@example.com"),
+        ("DEMO-2", "description", "email", "john@example.com"),
+        ("DEMO-2", "comment/3", "aws", KEY),
+    ]
+    assert scanner.report.issues == 2
+    assert scanner.report.documents == 6
+    assert scanner.report.hits == 5
+
+
+def test_worker_processes_match_like_the_calling_process():
+    jira = JiraCloud("https://example.atlassian.net", username="user", password="pass")
+    issues = [
+        {"key": f"DEMO-{number}", "fields": {"description": f"{number}@example.com {KEY}", "comment": {}}}
+        for number in range(200)
+    ]
+    expected = []
+    for number in range(200):
+        expected += [(f"DEMO-{number}", "description", "aws", KEY)]
+        expected += [(f"DEMO-{number}", "description", "email", f"{number}@example.com")]
+
+    scanner = ContentScanner(jira, SECRETS, processes=2, batch_size=500)
+    with patch.object(jira, "iter_enhanced_jql", return_value=iter(issues)) as search:
+        hits = list(scanner.scan("project = DEMO"))
+
+    assert search.call_args.kwargs["fields"] == ["description", "comment"]
+    assert hits == expected
+
+
+def test_cloud_search_is_paced_by_the_rate_limiter():
+    jira = JiraCloud("https://example.atlassian.net", username="user", password="pass")
+    limiter = RateLimiter(10)
+
+    issue = {"key": "DEMO-3", "fields": {"description": "Contact jane.doe@example.com", "comment": {}}}
+
+    scanner = ContentScanner(jira, SECRETS, rate_limiter=limiter)
+    with patch.object(jira, "iter_enhanced_jql", return_value=iter([issue])) as search:
+        hits = list(scanner.scan("project = DEMO"))
+
+    assert scanner.processes == 0
+    assert search.call_args.kwargs["rate_limiter"] is limiter
+    assert hits == [("DEMO-3", "description", "email", "jane.doe@example.com")]
+
+
+def test_patterns_and_document_text():
+    named = compile_patterns([r"\d+", re.compile("x", re.IGNORECASE)])
+    assert list(named) == [r"\d+", "x"]
+    assert compile_patterns("a", re.IGNORECASE)["a"].flags & re.IGNORECASE
+    with pytest.raises(ValueError):
+        compile_patterns({})
+
+    document = {
+        "type": "doc",
+        "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": "token "}, {"type": "text", "text": "abc"}]},
+            {"type": "codeBlock", "content": [{"type": "text", "text": "x=1"}]},
+        ],
+    }
+    assert plain_text(document) == "token abc\nx=1"
+    assert plain_text(None) == ""
+
+
+def test_scrap_regex_from_issue_reads_comments_without_description():
+    jira = Jira(url="https://jira.example.com", username="user", password="pass")
+    issue = {"fields": {"description": None, "comment": {"comments": [comment(1, f"key {KEY}")]}}}
+
+    with patch.object(jira, "get_issue", return_value=issue):
+        assert jira.scrap_regex_from_issue("DEMO-1", SECRETS["aws"]) == [KEY]
@@ -0,0 +1,169 @@
+# coding: utf-8
+"""
+Tests for the buffered Jira Software submission queue in atlassian/jira/submissions.py
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from requests import HTTPError
+
+from atlassian.jira import JiraSoftware
+from atlassian.jira.submissions import SubmissionQueue
+
+
+def build(number, sequence=1, state="successful"):
+    return {"pipelineId": "ci", "buildNumber": number, "updateSequenceNumber": sequence, "state": state}
+
+
+def test_full_batches_are_sent_in_the_background_and_the_rest_on_close():
+    software = JiraSoftware("https://example.atlassian.net")
+    sent = threading.Event()
+
+    def submit(data):
+        if len(data["builds"]) == 100:
+            sent.set()
+        return {"acceptedBuilds": data["builds"]}
+
+    with patch.object(software, "submit_builds", side_effect=submit) as submit_builds:
+        with SubmissionQueue(software, max_delay=60, provider_metadata={"product": "CI"}) as queue:
+            for number in range(150):
+                queue.add("builds", build(number))
+            assert sent.wait(5)
+            assert len(queue) == 50
+
+    assert [len(call.kwargs["data"]["builds"]) for call in submit_builds.call_args_list] == [100, 50]
+    assert submit_builds.call_args.kwargs["data"]["providerMetadata"] == {"product": "CI"}
+    assert queue.report.submitted == 150
+    assert queue.report.ok
+    with pytest.raises(RuntimeError):
+        queue.add("builds", build(1))
+
+
+def test_partial_batches_are_sent_after_max_delay():
+    software = JiraSoftware("https://example.atlassian.net")
+    sent = threading.Event()
+
+    with patch.object(software, "submit_feature_flags", side_effect=lambda data: sent.set() or {}) as submit:
+        queue = SubmissionQueue(software, max_delay=0.05)
+        queue.add("feature_flags", {"id": "flag-1", "updateSequenceId": 1})
+        assert sent.wait(5)
+        queue.close()
+
+    assert submit.call_args.kwargs["data"] == {"flags": [{"id": "flag-1", "updateSequenceId": 1}]}
+
+
+def test_newest_update_sequence_number_wins():
+    software = JiraSoftware("https://example.atlassian.net")
+    queue = SubmissionQueue(software, max_delay=60)
+    queue.add("builds", build(1, sequence=2, state="in_progress"), build(1, sequence=1, state="pending"))
+    queue.add("builds", build(2, sequence=1, state="in_progress"), build(2, sequence=3, state="failed"))
+    queue.add(
+        "devinfo",
+        {"id": "repo", "updateSequenceId": 1, "commits": [{"id": "a", "updateSequenceId": 1}]},
+        {
+            "id": "repo",
+            "updateSequenceId": 2,
+            "commits": [{"id": "b", "updateSequenceId": 1}],
+            "branches": [{"id": "main", "updateSequenceId": 1}],
+        },
+    )
+
+    with patch.object(software, "submit_builds", return_value={}) as submit_builds:
+        with patch.object(software, "store_development_information", return_value={}) as store:
+            report = queue.flush()
+    queue.close()
+
+    assert [(item["buildNumber"], item["state"]) for item in submit_builds.call_args.kwargs["data"]["builds"]] == [
+        (1, "in_progress"),
+        (2, "failed"),
+    ]
+    (repository,) = store.call_args.kwargs["data"]["repositories"]
+    assert [commit["id"] for commit in repository["commits"]] == ["a", "b"]
+    assert repository["branches"] == [{"id": "main", "updateSequenceId": 1}]
+    assert report.deduplicated == 3
+    assert report.submitted == 3
+
+
+def test_throttled_batches_are_retried_and_rejections_reported():
+    software = JiraSoftware("https://example.atlassian.net")
+    throttled = HTTPError("Too many requests", response=Mock(status_code=429, headers={"Retry-After": "0"}))
+    responses = [
+        throttled,
+        {"rejectedBuilds": [{"key": {"pipelineId": "ci", "buildNumber": 2}, "errors": [{"message": "Bad state"}]}]},
+    ]
+
+    queue = SubmissionQueue(software, max_delay=60)
+    queue.add("builds", build(1), build(2))
+    with patch.object(software, "submit_builds", side_effect=responses) as submit_builds:
+        report = queue.close()
+
+    assert submit_builds.call_count == 2
+    assert report.retries == 1
+    assert report.submitted == 1
+    assert [error.item["buildNumber"] for error in report.errors] == [2]
+
+
+def test_vulnerability_and_repository_rejections_are_reported():
+    software = JiraSoftware("https://example.atlassian.net")
+    failed_repository = {"errorMessages": [], "commits": [{"id": "a", "errorMessages": [{"message": "Bad hash"}]}]}
+
+    queue = SubmissionQueue(software, max_delay=60)
+    queue.add("vulnerabilities", {"id": "CVE-1"}, {"id": "CVE-2"})
+    queue.add("devinfo", {"id": "repo-1", "commits": [{"id": "a"}]}, {"id": "repo-2"})
+    with patch.object(
+        software,
+        "submit_vulnerabilities",
+        return_value={"acceptedVulnerabilities": ["CVE-1"], "failedVulnerabilities": {"CVE-2": [{"message": "Bad"}]}},
+    ):
+        with patch.object(
+            software,
+            "store_development_information",
+            return_value={"failedDevinfoEntities": {"repo-1": failed_repository}},
+        ):
+            report = queue.close()
+
+    assert report.submitted == 2
+    assert {error.item["id"]: error.error for error in report.errors} == {
+        "CVE-2": [{"message": "Bad"}],
+        "repo-1": failed_repository,
+    }
+
+
+def test_responses_without_a_body_count_as_submitted():
+    software = JiraSoftware("https://example.atlassian.net")
+
+    queue = SubmissionQueue(software, max_delay=60)
+    queue.add("builds", build(1))
+    with patch.object(software, "submit_builds", return_value="") as submit_builds:
+        report = queue.close()
+
+    submit_builds.assert_called_once()
+    assert (report.submitted, report.errors) == (1, [])
+
+
+def test_failures_after_the_retries_are_retriable_errors():
+    software = JiraSoftware("https://example.atlassian.net")
+    unavailable = HTTPError("Unavailable", response=Mock(status_code=503, headers={}))
+
+    queue = SubmissionQueue(software, max_delay=60, retries=2, backoff=0.001)
+    queue.add("vulnerabilities", {"id": "CVE-1"})
+    started = time.monotonic()
+    with patch.object(software, "submit_vulnerabilities", side_effect=unavailable) as submit:
+        report = queue.close()
+
+    assert submit.call_count == 3
+    assert time.monotonic() - started < 5
+    assert [(error.item["id"], error.retriable) for error in report.errors] == [("CVE-1", True)]
+
+
+def test_unknown_entity_type():
+    software = JiraSoftware("https://example.atlassian.net")
+    queue = SubmissionQueue(software)
+
+    with pytest.raises(ValueError):
+        queue.add("commits", {"id": "a"})
+    with pytest.raises(ValueError):
+        SubmissionQueue(software, max_batch=101)
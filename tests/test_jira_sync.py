@@ -0,0 +1,143 @@
+# coding: utf-8
+"""
+Tests for the incremental delta sync in atlassian/jira/sync.py
+"""
+
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+from atlassian import Jira
+from atlassian.jira.sync import DeltaSync, SyncSink, SyncStore, parse_jira_timestamp
+
+UTC = datetime.timezone.utc
+
+
+def issue(issue_id, updated, histories=None):
+    data = {"id": str(issue_id), "key": f"SYNC-{issue_id}", "fields": {"updated": updated}}
+    if histories is not None:
+        data["changelog"] = {"histories": histories}
+    return data
+
+
+class RecordingSink(SyncSink):
+    def __init__(self):
+        self.upserts = []
+        self.changelogs = {}
+        self.deleted = {}
+
+    def upsert_issues(self, project, issues, changelogs):
+        self.upserts.extend(item["key"] for item in issues)
+        self.changelogs.update(changelogs)
+
+    def delete_issues(self, project, issues):
+        self.deleted.update(issues)
+
+
+class TestDeltaSync:
+    def test_first_sync_reads_whole_project_and_stores_watermark(self, tmp_path):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        store = SyncStore(str(tmp_path / "sync.db"))
+        sink = RecordingSink()
+        issues = [
+            issue(1, "2024-03-01T10:00:00.000+0000", [{"id": "1", "created": "2024-03-01T10:00:00.000+0000"}]),
+            issue(2, "2024-03-02T11:30:00.000+0100"),
+        ]
+
+        with patch.object(jira, "iter_jql", side_effect=[iter(issues), iter(issues)]) as iter_jql:
+            report = DeltaSync(jira, store, sink, fields=["summary"]).sync("SYNC")
+
+        first = iter_jql.call_args_list[0]
+        assert first.args[0] == 'project = "SYNC" ORDER BY updated ASC'
+        assert first.kwargs == {"fields": ["summary", "updated"], "expand": "changelog"}
+        assert report.updated == sink.upserts == ["SYNC-1", "SYNC-2"]
+        assert report.changelog_entries == 1
+        assert report.reconciled and report.deleted == []
+        assert report.watermark == parse_jira_timestamp("2024-03-02T11:30:00.000+0100")
+        assert SyncStore(str(tmp_path / "sync.db")).get_state("SYNC").watermark == report.watermark
+
+    def test_next_sync_queries_from_watermark_and_filters_changelogs(self, tmp_path):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        store = SyncStore()
+        sink = RecordingSink()
+        sync = DeltaSync(jira, store, sink, reconcile_interval=None)
+        histories = [
+            {"id": "1", "created": "2024-03-01T08:00:00.000+0000"},
+            {"id": "2", "created": "2024-03-01T12:00:00.000+0000"},
+        ]
+
+        with patch.object(jira, "iter_jql", side_effect=[iter([issue(1, "2024-03-01T10:00:00.000+0000")])] * 2):
+            sync.sync("SYNC")
+        with patch.object(jira, "iter_jql", return_value=iter([issue(1, "2024-03-01T12:00:00.000+0000", histories)])):
+            report = sync.sync("SYNC")
+            jql = jira.iter_jql.call_args.args[0]
+
+        assert jql == 'project = "SYNC" AND updated >= "2024/03/01 09:59" ORDER BY updated ASC'
+        assert [entry["id"] for entry in sink.changelogs["1"]] == ["2"]
+        assert not report.reconciled
+        assert report.previous_watermark == parse_jira_timestamp("2024-03-01T10:00:00.000+0000")
+
+    def test_jql_dates_use_the_configured_timezone(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        sync = DeltaSync(
+            jira, SyncStore(), overlap=datetime.timedelta(0), timezone=datetime.timezone(datetime.timedelta(hours=2))
+        )
+
+        jql = sync.delta_jql("SYNC", datetime.datetime(2024, 3, 1, 22, 15, tzinfo=UTC))
+
+        assert 'updated >= "2024/03/02 00:15"' in jql
+
+    def test_cloud_changelogs_are_fetched_in_bulk_with_pagination(self):
+        jira = Jira(url="https://example.atlassian.net", username="user", password="pass", cloud=True)
+        sink = RecordingSink()
+        pages = [
+            {
+                "issueChangeLogs": [
+                    {"issueId": "1", "changeHistories": [{"id": "10", "created": "2024-03-01T10:00:00.000+0000"}]}
+                ],
+                "nextPageToken": "next",
+            },
+            {
+                "issueChangeLogs": [
+                    {"issueId": "1", "changeHistories": [{"id": "11", "created": "2024-03-01T10:05:00.000+0000"}]}
+                ]
+            },
+        ]
+
+        search = iter([issue(1, "2024-03-01T10:05:00.000+0000")])
+        with patch.object(jira, "iter_jql", return_value=search) as iter_jql:
+            with patch.object(jira, "get_changelogs_bulk", side_effect=pages) as bulk:
+                report = DeltaSync(jira, SyncStore(), sink, reconcile_interval=None).sync("SYNC", reconcile=False)
+
+        assert iter_jql.call_args.kwargs["expand"] is None
+        assert bulk.call_args_list[1].kwargs == {"next_page_token": "next"}
+        assert [entry["id"] for entry in sink.changelogs["1"]] == ["10", "11"]
+        assert report.changelog_entries == 2
+
+    def test_reconcile_removes_issues_missing_from_project(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        store = SyncStore()
+        sink = RecordingSink()
+        store.upsert_issues("SYNC", [("1", "SYNC-1", None), ("2", "SYNC-2", None), ("3", "SYNC-3", None)])
+
+        with patch.object(jira, "iter_jql", side_effect=[iter([]), iter([{"id": "1"}, {"id": "3"}])]):
+            report = DeltaSync(jira, store, sink).sync("SYNC", reconcile=True)
+
+        assert report.deleted == ["SYNC-2"]
+        assert sink.deleted == {"2": "SYNC-2"}
+        assert store.known_issues("SYNC") == {"1": "SYNC-1", "3": "SYNC-3"}
+
+    def test_failed_sync_keeps_previous_watermark(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        store = SyncStore()
+
+        class FailingSink(SyncSink):
+            def upsert_issues(self, project, issues, changelogs):
+                raise RuntimeError("sink unavailable")
+
+        with patch.object(jira, "iter_jql", return_value=iter([issue(1, "2024-03-01T10:00:00.000+0000")])):
+            with pytest.raises(RuntimeError):
+                DeltaSync(jira, store, FailingSink()).sync("SYNC")
+
+        assert store.get_state("SYNC").watermark is None
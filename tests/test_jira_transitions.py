@@ -0,0 +1,224 @@
+# coding: utf-8
+"""
+Tests for the bulk transition engine in atlassian/jira/transitions.py
+"""
+
+from unittest.mock import patch
+
+from requests import HTTPError
+
+from atlassian import Jira
+from atlassian.jira import JiraCloud
+from atlassian.jira.cache import IssueCache
+from atlassian.jira.transitions import bulk_transition
+
+TRANSITIONS = {"transitions": [{"id": "31", "name": "Close", "to": {"name": "Done"}}]}
+
+
+def issue(number, status="To Do", issuetype="Task", project="DEMO"):
+    return {
+        "id": str(10000 + number),
+        "key": f"{project}-{number}",
+        "fields": {"project": {"key": project}, "issuetype": {"name": issuetype}, "status": {"name": status}},
+    }
+
+
+class TestServerFallback:
+    def test_transition_is_resolved_once_per_group(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        issues = [issue(1), issue(2), issue(3, issuetype="Bug"), issue(4, status="Done"), issue(5, status="Blocked")]
+        transitions = {
+            "DEMO-1": [{"id": 11, "name": "Start", "to": "In Progress"}, {"id": 31, "name": "Close", "to": "Done"}],
+            "DEMO-3": [{"id": 41, "name": "Resolve", "to": "Done"}],
+            "DEMO-5": [{"id": 51, "name": "Unblock", "to": "To Do"}],
+        }
+
+        def post(key, transition_id):
+            if key == "DEMO-2":
+                raise HTTPError("Field 'resolution' is required")
+            return None
+
+        found = ({"issues": [issue(6, status="Done")]}, ["DEMO-404"])
+        with patch.object(jira, "get_issue_transitions", side_effect=transitions.get) as get_transitions:
+            with patch.object(jira, "set_issue_status_by_transition_id", side_effect=post) as set_status:
+                with patch.object(jira, "bulk_issue", return_value=found):
+                    report = bulk_transition(jira, issues + ["DEMO-6", "DEMO-404"], "done", max_workers=2)
+
+        assert sorted(call.args[0] for call in get_transitions.call_args_list) == ["DEMO-1", "DEMO-3", "DEMO-5"]
+        assert sorted(call.args for call in set_status.call_args_list) == [
+            ("DEMO-1", "31"),
+            ("DEMO-2", "31"),
+            ("DEMO-3", "41"),
+        ]
+        assert sorted(report.transitioned) == ["DEMO-1", "DEMO-3"]
+        assert report.unchanged == ["DEMO-4", "DEMO-6"]
+        assert sorted(error.item for error in report.errors) == ["DEMO-2", "DEMO-404", "DEMO-5"]
+        assert not report.ok
+
+
+class TestCloudBulkOperations:
+    def test_chunks_are_submitted_and_polled(self):
+        jira = JiraCloud("https://example.atlassian.net", username="user", password="pass")
+        issues = [issue(number) for number in range(1500)]
+        progress = {
+            "1": [{"status": "RUNNING", "progressPercent": 40}, None],
+            "2": [None],
+        }
+        submitted = []
+
+        def submit(data):
+            submitted.append(data)
+            return {"taskId": str(len(submitted))}
+
+        def poll(task_id):
+            state = progress[task_id].pop(0)
+            if state is not None:
+                return state
+            keys = [
+                key
+                for entry in submitted[int(task_id) - 1]["bulkTransitionInputs"]
+                for key in entry["selectedIssueIdsOrKeys"]
+            ]
+            ids = [str(10000 + int(key.split("-")[1])) for key in keys]
+            return {
+                "status": "COMPLETE",
+                "processedAccessibleIssues": [int(issue_id) for issue_id in ids[1:]],
+                "failedAccessibleIssues": {ids[0]: ["Issue is locked"]},
+            }
+
+        keys = [issue["key"] for issue in issues[:100]]
+        with patch.object(jira, "bulk_fetch_issues", return_value={"issues": issues[:100]}) as fetch:
+            with patch.object(jira, "get_transitions", return_value=TRANSITIONS) as get_transitions:
+                with patch.object(jira, "submit_bulk_transition", side_effect=submit):
+                    with patch.object(jira, "get_bulk_operation_progress", side_effect=poll):
+                        report = bulk_transition(jira, issues[100:] + keys, "Done", poll_interval=0, max_workers=1)
+
+        fetch.assert_called_once()
+        get_transitions.assert_called_once()
+        assert [len(data["bulkTransitionInputs"][0]["selectedIssueIdsOrKeys"]) for data in submitted] == [1000, 500]
+        assert submitted[0]["bulkTransitionInputs"][0]["transitionId"] == "31"
+        assert report.task_ids == ["1", "2"]
+        assert len(report.transitioned) == 1498
+        assert [(error.item, error.error) for error in report.errors] == [
+            ("DEMO-100", "Issue is locked"),
+            ("DEMO-1100", "Issue is locked"),
+        ]
+
+    def test_unfinished_operations_are_retriable(self):
+        jira = JiraCloud("https://example.atlassian.net", username="user", password="pass")
+
+        with patch.object(jira, "get_transitions", return_value=TRANSITIONS):
+            with patch.object(jira, "submit_bulk_transition", return_value={"taskId": "7"}):
+                with patch.object(jira, "get_bulk_operation_progress", return_value={"status": "RUNNING"}) as poll:
+                    report = bulk_transition(jira, [issue(1), issue(2)], "Done", poll_interval=5, timeout=1)
+
+        poll.assert_called_once_with("7")
+        assert [error.item for error in report.errors if error.retriable] == ["DEMO-1", "DEMO-2"]
+
+
+def expanded(number, status="To Do"):
+    transitions = {
+        "To Do": [{"id": "11", "name": "Start", "to": {"name": "In Progress"}}],
+        "In Progress": [{"id": "31", "name": "Close", "to": {"name": "Done"}}],
+    }
+    return dict(issue(number, status), transitions=transitions[status])
+
+
+class TestTransitionCache:
+    def test_transitions_are_resolved_once_per_workflow_step(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        statuses = {"DEMO-2": "In Progress"}
+
+        def get_issue(key, **kwargs):
+            return expanded(int(key[5:]), statuses.get(key, "To Do"))
+
+        with patch.object(jira, "get_issue", side_effect=get_issue) as get_issue:
+            with patch.object(jira, "post") as post:
+                jira.set_issue_status("DEMO-2", "Done")
+                jira.set_issue_status("DEMO-1", "in progress", fields={"assignee": None})
+                jira.set_issue_status("DEMO-1", "Done")
+                jira.set_issue_status_by_transition_name("DEMO-3", "start")
+
+        # Transitions by name are posted as they are
+        assert [call.args[0] for call in get_issue.call_args_list] == ["DEMO-2", "DEMO-1"]
+        assert get_issue.call_args.kwargs == {
+            "fields": ["project", "issuetype", "status"],
+            "expand": "transitions",
+            "update_history": False,
+        }
+        assert [call.kwargs["data"] for call in post.call_args_list] == [
+            {"transition": {"id": "31"}},
+            {"transition": {"id": "11"}, "fields": {"assignee": None}},
+            {"transition": {"id": "31"}},
+            {"transition": {"name": "start"}},
+        ]
+        assert len(jira.transition_cache) == 2
+
+    def test_known_issues_supply_the_workflow_step(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        found = [issue(number) for number in range(1, 4)]
+
+        with patch.object(jira, "get_issue", return_value=expanded(1)) as get_issue:
+            with patch.object(jira, "post") as post:
+                for item in found:
+                    jira.set_issue_status(item["key"], "In Progress", issue=item)
+
+        get_issue.assert_called_once()
+        assert [call.args[0] for call in post.call_args_list] == [
+            f"rest/api/2/issue/DEMO-{number}/transitions" for number in range(1, 4)
+        ]
+        assert {call.kwargs["data"]["transition"]["id"] for call in post.call_args_list} == {"11"}
+
+    def test_transition_by_name_forgets_the_step_of_the_issue(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        responses = {"DEMO-1": [expanded(1), expanded(1)], "DEMO-2": [expanded(2, "In Progress")]}
+
+        with patch.object(jira, "get_issue", side_effect=lambda key, **kwargs: responses[key].pop(0)) as get_issue:
+            with patch.object(jira, "post") as post:
+                jira.set_issue_status("DEMO-1", "In Progress")
+                jira.set_issue_status("DEMO-2", "Done")
+                jira.set_issue_status_by_transition_name("DEMO-1", "Reopen")
+                jira.set_issue_status("DEMO-1", "Done")
+
+        # DEMO-1 is read again rather than taking "Close" from the step it was moved to before
+        assert [call.args[0] for call in get_issue.call_args_list] == ["DEMO-1", "DEMO-2", "DEMO-1"]
+        assert [call.kwargs["data"]["transition"] for call in post.call_args_list] == [
+            {"id": "11"},
+            {"id": "31"},
+            {"name": "Reopen"},
+            {"id": None},
+        ]
+
+    def test_issue_cache_supplies_the_workflow_step(self, tmp_path):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        jira.issue_cache = IssueCache(str(tmp_path / "cache.db"))
+        jira.issue_cache.put_many([issue(1), issue(2)])
+
+        with patch.object(jira, "get_issue", return_value=expanded(1)) as get_issue:
+            with patch.object(jira, "post") as post:
+                jira.set_issue_status("DEMO-1", "In Progress")
+                jira.set_issue_status("DEMO-2", "In Progress")
+
+        get_issue.assert_called_once()
+        assert post.call_count == 2
+
+    def test_failed_cached_transition_is_resolved_again(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        responses = {"DEMO-1": [expanded(1), expanded(1, status="In Progress")], "DEMO-2": [expanded(2, "In Progress")]}
+        failures = [("DEMO-1", "31")]
+
+        def post(url, data):
+            attempt = (url.split("/")[-2], data["transition"]["id"])
+            if attempt in failures:
+                failures.remove(attempt)
+                raise HTTPError("It is not possible to transition this issue")
+
+        with patch.object(jira, "get_issue", side_effect=lambda key, **kwargs: responses[key].pop(0)) as get_issue:
+            with patch.object(jira, "post", side_effect=post) as posted:
+                jira.set_issue_status("DEMO-1", "In Progress")
+                jira.set_issue_status("DEMO-2", "Done")
+                jira.set_issue_status("DEMO-1", "Done")
+
+        assert [call.args[0] for call in get_issue.call_args_list] == ["DEMO-1", "DEMO-2", "DEMO-1"]
+        assert [call.kwargs["data"]["transition"]["id"] for call in posted.call_args_list] == ["11", "31", "31", "31"]
+        assert not failures
@@ -0,0 +1,146 @@
+# coding: utf-8
+"""
+Tests for the batched issue upsert in atlassian/jira/upsert.py
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from requests import HTTPError
+
+from atlassian import Jira
+from atlassian.jira import JiraCloud
+from atlassian.jira.upsert import changed_fields, field_matches, upsert_issues
+
+
+@pytest.mark.parametrize(
+    "desired, current, expected",
+    [
+        ("Summary", "Summary", True),
+        ({"name": "High"}, {"name": "High", "id": "2", "iconUrl": "..."}, True),
+        ({"name": "High"}, {"name": "Low"}, False),
+        ({"name": "High"}, None, False),
+        (["b", "a"], ["a", "b"], True),
+        (["a"], ["a", "b"], False),
+        ([], None, True),
+        (None, None, True),
+        ("", None, True),
+        (None, {"accountId": "x"}, False),
+        (3, 3.0, True),
+        ([{"value": "A"}], [{"value": "A", "id": "1"}], True),
+    ],
+)
+def test_field_matches(desired, current, expected):
+    assert field_matches(desired, current) is expected
+
+
+def test_changed_fields():
+    current = {"summary": "Same", "labels": ["x"], "priority": {"name": "High", "id": "2"}}
+
+    assert changed_fields({"summary": "Same", "labels": ["y"], "priority": {"name": "High"}}, current) == {
+        "labels": ["y"]
+    }
+
+
+class TestUpsertIssues:
+    def test_server_batch_is_resolved_with_one_search(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        records = [
+            {"issuekey": "BENCH-1", "summary": "Synthetic issue 1", "labels": ["team-0", "label-0"]},
+            {"issuekey": "BENCH-2", "summary": "Renamed", "project": {"key": "OTHER"}},
+            {"issuekey": "BENCH-9999", "summary": "Deleted", "project": {"key": "BENCH"}},
+            {"summary": "New", "project": {"key": "BENCH"}, "issuetype": {"name": "Task"}},
+        ]
+
+        with patch.object(jira, "update_issue_field") as update:
+            with patch.object(jira, "bulk_issue", wraps=jira.bulk_issue) as bulk_issue:
+                report = upsert_issues(jira, records)
+
+        # BENCH-9999 does not exist: a strictly validated search would fail with 400 for the whole batch
+        bulk_issue.assert_called_once_with(
+            ["BENCH-1", "BENCH-2", "BENCH-9999"], fields=["labels", "summary"], validate_query="warn"
+        )
+        update.assert_called_once_with("BENCH-2", {"summary": "Renamed"}, notify_users=True)
+        assert report.updated == {"BENCH-2": {"summary": "Renamed"}}
+        assert report.unchanged == ["BENCH-1"]
+        assert [(fields["summary"], issue["key"]) for fields, issue in report.created] == [("New", "BULK-1")]
+        assert [error.item["summary"] for error in report.errors] == ["Deleted"]
+        assert "BENCH-9999 does not exist" in str(report.errors[0].error)
+        assert stand_in_server.requests["POST rest/api/2/issue/bulk"] == 1
+        assert stand_in_server.requests["GET rest/api/2/search"] == 1
+        assert records[0]["issuekey"] == "BENCH-1"
+
+    def test_keys_are_matched_regardless_of_case_and_moves(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        records = [
+            {"issuekey": "bench-3", "summary": "Lower case"},
+            {"issuekey": "OLD-4", "summary": "Moved"},
+            {"issuekey": "BENCH 5", "summary": "Malformed"},
+        ]
+
+        with patch.object(jira, "update_issue_field") as update:
+            report = upsert_issues(jira, records)
+
+        assert [call.args[:2] for call in update.call_args_list] == [
+            ("BENCH-3", {"summary": "Lower case"}),
+            ("BENCH-4", {"summary": "Moved"}),
+        ]
+        assert [error.item["issuekey"] for error in report.errors] == ["BENCH 5"]
+        assert "not a valid issue key" in str(report.errors[0].error)
+        assert not report.created
+        assert stand_in_server.requests["GET rest/api/2/issue/OLD-4"] == 1
+        assert stand_in_server.requests["GET rest/api/2/issue/bench-3"] == 0
+
+    def test_legacy_cloud_search_drops_rejected_keys(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass", cloud=True)
+        records = [
+            {"issuekey": "BENCH-1", "summary": "Changed"},
+            {"issuekey": "BENCH-9999", "summary": "Deleted"},
+        ]
+
+        with patch.object(jira, "update_issue_field") as update:
+            report = upsert_issues(jira, records)
+
+        update.assert_called_once_with("BENCH-1", {"summary": "Changed"}, notify_users=True)
+        assert [error.item["issuekey"] for error in report.errors] == ["BENCH-9999"]
+        assert not report.created
+        assert stand_in_server.requests["GET rest/api/3/search/jql"] == 2
+
+    def test_cloud_updates_run_concurrently_and_report_failures(self, stand_in_server):
+        jira = JiraCloud(stand_in_server.url, username="user", password="pass")
+        records = [{"issuekey": f"BENCH-{number}", "summary": f"Changed {number}"} for number in range(1, 251)]
+
+        def edit(key, notify_users, data):
+            if key == "BENCH-7":
+                raise HTTPError("Field 'summary' cannot be set")
+
+        with patch.object(jira, "edit_issue", side_effect=edit) as edit_issue:
+            report = upsert_issues(jira, records, batch_size=100, notify_users=False, max_workers=3)
+
+        assert stand_in_server.requests["POST rest/api/3/issue/bulkfetch"] == 3
+        assert edit_issue.call_count == 250
+        assert edit_issue.call_args.kwargs["notify_users"] is False
+        assert len(report.updated) == 249
+        assert [error.item for error in report.errors] == [{"issuekey": "BENCH-7", "summary": "Changed 7"}]
+        assert not report.created
+
+    def test_cloud_bulkfetch_resolves_moved_keys(self, stand_in_server):
+        jira = JiraCloud(stand_in_server.url, username="user", password="pass")
+        records = [{"issuekey": "old-5", "summary": "Moved"}, {"issuekey": "BENCH-9999", "summary": "Deleted"}]
+
+        with patch.object(jira, "edit_issue") as edit_issue:
+            report = upsert_issues(jira, records)
+
+        edit_issue.assert_called_once_with("BENCH-5", notify_users=True, data={"fields": {"summary": "Moved"}})
+        assert [error.item["issuekey"] for error in report.errors] == ["BENCH-9999"]
+        assert not report.created
+
+
+def test_issue_exists_does_not_touch_client_state():
+    jira = Jira(url="https://jira.example.com", username="user", password="pass")
+
+    with patch.object(jira, "get", return_value=Mock(status_code=404)) as get:
+        assert jira.issue_exists("DEMO-1") is False
+
+    assert get.call_args.kwargs["advanced_mode"] is True
+    assert not jira.advanced_mode
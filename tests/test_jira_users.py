@@ -0,0 +1,86 @@
+# coding: utf-8
+"""
+Tests for the user directory in atlassian/jira/users.py
+"""
+
+from unittest.mock import Mock, patch
+
+from requests import HTTPError
+
+from atlassian import Jira
+from atlassian.jira import JiraCloud
+from atlassian.jira.users import UserDirectory
+
+
+def cloud_user(number):
+    return {"accountId": f"acc-{number}", "displayName": f"User {number}", "active": True}
+
+
+class TestCloud:
+    def test_directory_is_paged_once_and_misses_are_fetched_in_bulk(self):
+        jira = JiraCloud("https://example.atlassian.net", username="user", password="pass")
+        # Cloud pages can be short before the last one, so paging stops at an empty page
+        pages = {0: [cloud_user(number) for number in range(990)], 990: [cloud_user(990)], 991: []}
+        missing = [f"new-{number}" for number in range(100)]
+
+        def bulk(start_at, max_results, account_id):
+            known = [{"accountId": account_id} for account_id in account_id if account_id != "new-99"]
+            return {"values": known[start_at : start_at + 50], "isLast": start_at + 50 >= len(known)}
+
+        directory = UserDirectory(jira, max_workers=2)
+        with patch.object(jira, "get_all_users", side_effect=lambda start_at, max_results: pages[start_at]) as paged:
+            with patch.object(jira, "bulk_get_users", side_effect=bulk) as bulk_get:
+                users = directory.resolve_many(["acc-1", None, "acc-990", "acc-1"] + missing)
+                again = directory.resolve_many(["acc-2", "new-5", "new-99"])
+
+        assert paged.call_count == 3
+        assert list(users) == ["acc-1", "acc-990"] + missing
+        assert users["acc-990"]["displayName"] == "User 990"
+        assert users["new-98"] == {"accountId": "new-98"}
+        assert users["new-99"] is None
+        # Chunks of 90 and 10 account IDs, the first one in two pages of 50
+        assert sorted(len(call.kwargs["account_id"]) for call in bulk_get.call_args_list) == [10, 90, 90]
+        assert again == {"acc-2": cloud_user(2), "new-5": {"accountId": "new-5"}, "new-99": None}
+        assert len(directory) == 1090
+
+    def test_entries_expire_after_ttl(self, clock):
+        jira = JiraCloud("https://example.atlassian.net", username="user", password="pass")
+        directory = UserDirectory(jira, ttl=60, preload=False, clock=clock)
+        response = {"values": [cloud_user(1)], "isLast": True}
+
+        with patch.object(jira, "bulk_get_users", return_value=response) as bulk_get:
+            directory.get("acc-1")
+            clock.now = 59
+            directory.get("acc-1")
+            clock.now = 60
+            assert directory.get("acc-1") == cloud_user(1)
+
+        assert bulk_get.call_count == 2
+
+
+class TestServer:
+    def test_search_with_dot_and_single_lookups(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        users = [{"name": f"user{number}", "key": f"JIRAUSER{number}"} for number in range(1000)]
+        pages = {0: users, 1000: [{"name": "last", "key": "JIRAUSER1000"}]}
+        not_found = HTTPError("The user named 'ghost' does not exist", response=Mock(status_code=404))
+
+        def user(username=None, key=None):
+            if key == "JIRAUSER2000":
+                return {"name": "renamed", "key": key}
+            raise not_found
+
+        directory = UserDirectory(jira)
+        with patch.object(jira, "user_find_by_user_string", side_effect=lambda **kw: pages[kw["start"]]) as search:
+            with patch.object(jira, "user", side_effect=user) as single:
+                resolved = directory.resolve_many(["user5", "JIRAUSER7", "last", "JIRAUSER2000", "ghost"])
+
+        assert [call.kwargs["username"] for call in search.call_args_list] == [".", "."]
+        assert search.call_args.kwargs["include_inactive_users"] is True
+        assert resolved["user5"]["key"] == "JIRAUSER5"
+        assert resolved["JIRAUSER7"]["name"] == "user7"
+        assert resolved["last"]["key"] == "JIRAUSER1000"
+        assert resolved["JIRAUSER2000"]["name"] == "renamed"
+        assert resolved["ghost"] is None
+        assert single.call_count == 4
+        assert directory.get("renamed")["key"] == "JIRAUSER2000"
@@ -0,0 +1,65 @@
+# coding: utf-8
+"""
+Tests for the worklog change feed in atlassian/jira/worklogs.py
+"""
+
+import datetime
+from unittest.mock import patch
+
+from atlassian import Jira
+from atlassian.jira.worklogs import WorklogFeed, to_milliseconds
+
+from .stand_in_server import WORKLOG_EPOCH
+
+
+class TestWorklogFeed:
+    def test_pages_are_followed_and_loaded(self, stand_in_server):
+        stand_in_server.max_page_size = 50
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+
+        feed = WorklogFeed(jira, since=0, max_workers=3)
+        changes = feed.collect()
+
+        size = stand_in_server.dataset_size
+        assert sorted(int(worklog["id"]) for worklog in changes.upserted) == [i for i in range(size) if i % 10]
+        assert changes.deleted == list(range(0, size, 10))
+        assert not changes.errors
+        assert changes.watermark == feed.watermark == WORKLOG_EPOCH + 240_000  # last deletion
+        assert stand_in_server.requests["GET rest/api/2/worklog/updated"] == 5
+        assert stand_in_server.requests["POST rest/api/2/worklog/list"] == 5
+        assert stand_in_server.requests["GET rest/api/2/worklog/deleted"] == 1
+
+    def test_resume_from_watermark_and_until(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        since = datetime.datetime.fromtimestamp((WORKLOG_EPOCH + 100_000) / 1000, tz=datetime.timezone.utc)
+
+        changes = WorklogFeed(jira, since=since, until=WORKLOG_EPOCH + 120_000).collect()
+
+        assert to_milliseconds(since) == WORKLOG_EPOCH + 100_000
+        assert sorted(int(worklog["id"]) for worklog in changes.upserted) == [i for i in range(101, 121) if i % 10]
+        assert changes.deleted == [110, 120]
+        assert changes.watermark == WORKLOG_EPOCH + 120_000
+
+    def test_vanished_worklogs_are_reported(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        feed = {"values": [{"worklogId": 1, "updatedTime": 5}, {"worklogId": 2, "updatedTime": 6}], "until": 6}
+
+        with (
+            patch.object(jira, "get", side_effect=[feed, {"values": [], "until": 4}]),
+            patch.object(jira, "get_worklogs", return_value=[{"id": "1"}]) as get_worklogs,
+        ):
+            pages = list(WorklogFeed(jira, since=1, expand="properties"))
+
+        get_worklogs.assert_called_once_with([1, 2], expand="properties")
+        assert [page.upserted for page in pages] == [[{"id": "1"}], []]
+        assert [error.item for error in pages[0].errors] == [2]
+
+    def test_watermark_is_the_older_feed_end(self):
+        jira = Jira(url="https://jira.example.com", username="user", password="pass")
+        responses = [{"values": [], "until": 900}, {"values": [], "until": 700}]
+
+        with patch.object(jira, "get", side_effect=responses):
+            feed = WorklogFeed(jira, since=500)
+            list(feed)
+
+        assert feed.watermark == 700
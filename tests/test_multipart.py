@@ -0,0 +1,127 @@
+# coding: utf-8
+"""
+Unit tests for atlassian.multipart module
+"""
+
+import io
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from requests.models import RequestEncodingMixin
+
+from atlassian.multipart import MultipartEncoder
+from atlassian.rest_client import AtlassianRestAPI
+
+
+class ConsumingSession:
+    """Session stub that drains streamed request bodies like a real adapter."""
+
+    def __init__(self, block_size=1 << 20):
+        self.verify = True
+        self.block_size = block_size
+        self.calls = []
+
+    def request(self, **kwargs):
+        body = kwargs["data"]
+        sent = 0
+        while True:
+            chunk = body.read(self.block_size)
+            if not chunk:
+                break
+            sent += len(chunk)
+        self.calls.append({"headers": dict(kwargs["headers"]), "sent": sent, "length": body.len})
+        return SimpleNamespace(status_code=200, headers={}, reason="OK", text="")
+
+
+class TestMultipartEncoder:
+    """Test cases for MultipartEncoder"""
+
+    def test_body_matches_requests_encoding(self):
+        files = {
+            "file": ("report.csv", io.BytesIO(b"a,b\n1,2\n"), "text/csv"),
+            "raw": b"raw bytes",
+        }
+        data = {"comment": "uploaded", "minorEdit": "true", "tags": ["x", "y"]}
+        with patch("urllib3.filepost.choose_boundary", return_value="b0undary"):
+            expected, content_type = RequestEncodingMixin._encode_files(files, data)
+        files["file"][1].seek(0)
+
+        encoder = MultipartEncoder(files, data=data, boundary="b0undary")
+
+        assert encoder.content_type == content_type
+        assert encoder.len == len(expected)
+        assert encoder.read() == expected
+
+    def test_small_reads_and_rewind(self):
+        encoder = MultipartEncoder({"file": ("a.txt", io.BytesIO(b"0123456789" * 100))})
+        first = b"".join(iter(lambda: encoder.read(7), b""))
+        assert encoder.tell() == encoder.len == len(first)
+
+        encoder.rewind()
+        assert b"".join(encoder) == first
+
+        encoder.seek(encoder.len - 20)
+        assert encoder.read() == first[-20:]
+
+    def test_progress_callback(self):
+        progress = []
+        encoder = MultipartEncoder(
+            {"file": ("a.bin", io.BytesIO(b"x" * 1000))},
+            callback=lambda sent, total: progress.append((sent, total)),
+        )
+        while encoder.read(256):
+            pass
+        assert progress[-1] == (encoder.len, encoder.len)
+        assert [sent for sent, _ in progress] == sorted(sent for sent, _ in progress)
+
+    def test_unsized_stream_uses_unknown_length(self):
+        class Unsized:
+            def __init__(self):
+                self.chunks = [b"abc", b"def"]
+
+            def read(self, _size=-1):
+                return self.chunks.pop(0) if self.chunks else b""
+
+        encoder = MultipartEncoder({"file": ("a.bin", Unsized())})
+        assert encoder.len is None
+        assert b"\r\n\r\nabcdef\r\n" in encoder.read()
+        with pytest.raises(io.UnsupportedOperation):
+            encoder.seek(0, 2)
+
+    def test_request_sends_multipart_content_type(self):
+        session = ConsumingSession()
+        api = AtlassianRestAPI(url="https://example.test", session=session, advanced_mode=True)
+        progress = []
+
+        api.request(
+            "POST",
+            "attachment",
+            files={"file": ("report.csv", io.BytesIO(b"small report"))},
+            progress_callback=lambda sent, total: progress.append(sent),
+        )
+
+        headers = session.calls[0]["headers"]
+        assert headers["Content-Type"].startswith("multipart/form-data; boundary=")
+        assert session.calls[0]["sent"] == session.calls[0]["length"]
+        assert progress[-1] == session.calls[0]["length"]
+
+    def test_multi_gigabyte_sparse_upload_keeps_memory_flat(self):
+        size = 3 * 1024**3
+        session = ConsumingSession()
+        api = AtlassianRestAPI(url="https://example.test", session=session, advanced_mode=True)
+
+        with tempfile.TemporaryFile() as sparse:
+            sparse.truncate(size)
+            tracemalloc.start()
+            try:
+                api.request("POST", "attachment", files={"file": ("huge.bin", sparse)})
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        assert session.calls[0]["sent"] > size
+        assert session.calls[0]["sent"] == session.calls[0]["length"]
+        assert peak < 16 * 1024**2
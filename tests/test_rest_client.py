@@ -286,7 +286,7 @@ class TestAtlassianRestAPI:
                 ]
 
             def request(self, **kwargs):
-                self.payloads.append(kwargs["files"]["file"][1].read())
+                self.payloads.append(kwargs["data"].read())
                 return self.responses.pop(0)
 
         session = RetryingSession()
@@ -304,7 +304,9 @@ class TestAtlassianRestAPI:
 
         api.request("POST", "attachment", files={"file": ("report.csv", io.BytesIO(b"small report"))})
 
-        assert session.payloads == [b"small report", b"small report"]
+        assert len(session.payloads) == 2
+        for payload in session.payloads:
+            assert b"\r\n\r\nsmall report\r\n" in payload
 
     def test_kerberos_configuration(self):
         """Test kerberos configuration"""
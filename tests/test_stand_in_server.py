@@ -0,0 +1,125 @@
+# coding: utf-8
+"""
+Tests for the local stand-in HTTP server in tests/stand_in_server.py
+"""
+
+import time
+
+import pytest
+from requests import HTTPError
+
+from atlassian import Bitbucket, Jira
+from atlassian.confluence import ConfluenceServer
+
+
+class TestStandInServer:
+    def test_jira_server_search_pages_by_start_at(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+
+        issues = []
+        start = 0
+        while True:
+            page = jira.jql("project = BENCH", start=start, limit=100)
+            issues.extend(page["issues"])
+            start += len(page["issues"])
+            if start >= page["total"]:
+                break
+
+        assert len(issues) == stand_in_server.dataset_size
+        assert issues[-1]["key"] == f"BENCH-{stand_in_server.dataset_size}"
+        assert stand_in_server.requests["GET rest/api/2/search"] == 3
+
+    def test_jira_server_key_search_validates_keys(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+
+        with pytest.raises(HTTPError):
+            jira.jql("key in (BENCH-1, BENCH-9999)")
+        page = jira.jql("key in (BENCH-1, BENCH-9999)", validate_query="warn")
+
+        assert [issue["key"] for issue in page["issues"]] == ["BENCH-1"]
+        assert page["warningMessages"] == ["An issue with key 'BENCH-9999' does not exist for field 'key'."]
+
+    def test_jira_cloud_enhanced_search_follows_tokens(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass", cloud=True)
+
+        keys = []
+        token = None
+        while True:
+            page = jira.enhanced_jql("project = BENCH", nextPageToken=token, limit=100)
+            keys.extend(issue["key"] for issue in page["issues"])
+            token = page.get("nextPageToken")
+            if page["isLast"]:
+                break
+
+        assert len(keys) == len(set(keys)) == stand_in_server.dataset_size
+
+    def test_jira_cloud_get_paged_follows_next_page(self, stand_in_server):
+        stand_in_server.max_page_size = 40
+        jira = Jira(url=stand_in_server.url, username="user", password="pass", cloud=True)
+
+        projects = jira.projects()
+
+        assert len(projects) == stand_in_server.dataset_size
+        assert stand_in_server.requests["GET rest/api/2/project/search"] == 7
+
+    def test_confluence_get_paged_follows_next_links(self, stand_in_server):
+        confluence = ConfluenceServer(url=stand_in_server.url, username="user", password="pass")
+
+        pages = list(confluence.get_all_pages_from_space("BENCH", limit=100))
+
+        assert len(pages) == stand_in_server.dataset_size
+        assert len({page["id"] for page in pages}) == stand_in_server.dataset_size
+
+    def test_bitbucket_server_get_paged_follows_next_page_start(self, stand_in_server):
+        bitbucket = Bitbucket(url=stand_in_server.url, username="user", password="pass")
+
+        projects = list(bitbucket.project_list(limit=100))
+
+        assert len(projects) == stand_in_server.dataset_size
+        assert stand_in_server.requests["GET rest/api/1.0/projects"] == 3
+
+    def test_bulk_create_against_stand_in(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+
+        report = jira.bulk_create_issues(({"fields": {"summary": str(i)}} for i in range(120)), max_workers=4)
+
+        assert report.ok
+        assert report.chunks == 3
+        assert len(report.results) == 120
+
+    def test_fixtures_are_served_for_unknown_paths(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+
+        with pytest.raises(HTTPError):
+            jira.get_issue("FOO-123")
+
+        assert stand_in_server.requests["GET rest/api/2/issue/FOO-123"] == 1
+
+    def test_retry_after_is_honoured(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass", retry_with_header=True)
+        stand_in_server.throttle(retry_after=0)
+
+        page = jira.jql("project = BENCH", limit=10)
+
+        assert len(page["issues"]) == 10
+        assert stand_in_server.requests["GET rest/api/2/search"] == 2
+
+    def test_injected_errors_and_latency(self, stand_in_server):
+        jira = Jira(url=stand_in_server.url, username="user", password="pass")
+        stand_in_server.inject(503)
+        with pytest.raises(HTTPError) as error:
+            jira.jql("project = BENCH", limit=1)
+        assert error.value.response.status_code == 503
+
+        stand_in_server.latency = 0.05
+        started = time.monotonic()
+        jira.jql("project = BENCH", limit=1)
+        assert time.monotonic() - started >= 0.05
+
+    def test_reset_restores_configuration(self, stand_in_server):
+        stand_in_server.latency = 1.0
+        stand_in_server.dataset_size = 1
+        stand_in_server.reset()
+
+        assert stand_in_server.latency == 0.0
+        assert stand_in_server.dataset_size == 250
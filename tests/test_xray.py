@@ -53,4 +53,5 @@ def test_v2_import_execution_multipart_forwards_files():
         "rest/raven/2.0/api/import/execution/multipart",
         data=None,
         files=files,
+        progress_callback=None,
     )